@@ -3,16 +3,24 @@ Match Analysis Agent (Stage 4)
 ------------------------------
 Performs a comparative analysis between the Candidate Profile and Vacancy Profile.
 Calculates a fit score and identifies strong matches vs potential gaps.
+
+With GENERATION_MODE=combined, generate_application already writes the analysis report
+in its combined call. If that report is newer than both profiles, this stage keeps it
+and returns without an LLM call; otherwise it analyzes as usual.
 """
 import os
 import sys
 import logging
+from typing import List, Optional
 # Add project root to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from execution.utils import get_llm, ensure_directory, invoke_with_retry
+from execution.prescore import prescore_gate, render_prescore_report
+from execution.profiling import run_entry_point
+from execution.utils import (get_llm, ensure_directory, invoke_with_retry, ainvoke_with_retry, stream_with_retry,
+                             streaming_enabled, combined_mode_enabled)
 
 # Force flush of stdout
 sys.stdout.reconfigure(line_buffering=True)
@@ -20,11 +28,7 @@ print(">>> Match Analysis Script Early Heartbeat", flush=True)
 
 logging.info("Starting match analysis process...")
 
-def analyze_match(candidate_text: str, vacancy_text: str) -> str:
-    llm = get_llm(temperature=0.1)
-    
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", """You are an Expert Career Coach and ATS Specialist.
+ANALYSIS_INSTRUCTIONS = """You are an Expert Career Coach and ATS Specialist.
 Task: Analyze how well the candidate's profile matches the job vacancy.
 
 Output Format (Markdown):
@@ -38,15 +42,46 @@ Output Format (Markdown):
 
 ## 🎯 Hiring Manager Summary
 ... (A 2-sentence pitch for this candidate)
-"""),
+"""
+
+def build_analysis_chain():
+    llm = get_llm(temperature=0.1)
+    
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", ANALYSIS_INSTRUCTIONS),
         ("human", "Candidate Profile:\n{candidate}\n\nJob Vacancy:\n{vacancy}")
     ])
     
-    chain = prompt | llm | StrOutputParser()
+    return prompt | llm | StrOutputParser()
+
+def analyze_match(candidate_text: str, vacancy_text: str) -> str:
+    chain = build_analysis_chain()
     logging.info("Analyzing match and calculating score...")
     return invoke_with_retry(chain, {"candidate": candidate_text, "vacancy": vacancy_text})
 
-def main():
+def analyze_match_stream(candidate_text: str, vacancy_text: str, output_path: str) -> str:
+    """Streaming variant of analyze_match: tokens reach stdout and output_path as they arrive."""
+    chain = build_analysis_chain()
+    logging.info("Analyzing match and calculating score (streaming)...")
+    report = stream_with_retry(chain, {"candidate": candidate_text, "vacancy": vacancy_text}, output_path)
+    print("", flush=True)  # Terminate the streamed block so following logs start on a new line
+    return report
+
+def report_is_current(report_path: str, *profile_paths: str) -> bool:
+    """True when report_path exists and was written after every profile was last changed."""
+    if not os.path.exists(report_path):
+        return False
+    written = os.path.getmtime(report_path)
+    return all(os.path.getmtime(path) <= written for path in profile_paths)
+
+async def aanalyze_match(candidate_text: str, vacancy_text: str) -> str:
+    """Async twin of analyze_match."""
+    chain = build_analysis_chain()
+    logging.info("Analyzing match and calculating score...")
+    return await ainvoke_with_retry(chain, {"candidate": candidate_text, "vacancy": vacancy_text})
+
+def main(argv: Optional[List[str]] = None):
+    # No options; argv is accepted so the worker and pipeline can call every stage's main() alike
     # Use current working directory (important for packaged Electron app)
     BASE_DIR = os.getcwd()
     CANDIDATE_PATH = os.path.join(BASE_DIR, "data", "processed", "candidate_profile.md")
@@ -57,18 +92,35 @@ def main():
         logging.error("Missing candidate or vacancy profiles. Run ingestion first.")
         sys.exit(1)
 
+    if combined_mode_enabled() and report_is_current(OUTPUT_PATH, CANDIDATE_PATH, VACANCY_PATH):
+        logging.info(f"Analysis already written by combined generation; keeping {OUTPUT_PATH}")
+        return
+
     with open(CANDIDATE_PATH, "r") as f:
         cand_text = f.read()
     with open(VACANCY_PATH, "r") as f:
         vac_text = f.read()
 
-    report = analyze_match(cand_text, vac_text)
-    
     ensure_directory(os.path.dirname(OUTPUT_PATH))
-    with open(OUTPUT_PATH, "w") as f:
-        f.write(report)
+
+    prescore, passed = prescore_gate(cand_text, vac_text)
+    if prescore is not None:
+        logging.info(f"Local pre-score: {prescore.score:.0f}/100 (core coverage {prescore.core_coverage:.0%})")
+    if not passed:
+        logging.warning(f"Pre-score below PRESCORE_MIN ({os.getenv('PRESCORE_MIN')}); skipping LLM analysis.")
+        with open(OUTPUT_PATH, "w") as f:
+            f.write(render_prescore_report(prescore))
+        logging.info(f"Analysis complete. Report saved to {OUTPUT_PATH}")
+        return
+
+    if streaming_enabled():
+        analyze_match_stream(cand_text, vac_text, OUTPUT_PATH)
+    else:
+        report = analyze_match(cand_text, vac_text)
+        with open(OUTPUT_PATH, "w") as f:
+            f.write(report)
     
     logging.info(f"Analysis complete. Report saved to {OUTPUT_PATH}")
 
 if __name__ == "__main__":
-    main()
+    run_entry_point(main)
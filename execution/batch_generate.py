@@ -0,0 +1,252 @@
+"""
+Batch Application Generation
+----------------------------
+Generates tailored Resume and Cover Letter documents for many vacancies against
+one candidate profile. Each vacancy is distilled (unless it already is a
+`# Vacancy:` profile), then both documents are generated concurrently, with a
+bounded number of vacancies in flight.
+
+Prompt caching: every generation prompt is ordered static system instructions ->
+candidate profile -> vacancy, so the (large) shared prefix is byte-identical
+across vacancies and provider-side prompt caching can reuse it. The first vacancy
+runs alone to warm that cache before the rest fan out. With FACT_TOKEN_BUDGET set,
+each vacancy gets its own selection of candidate facts (see fact_retrieval.py), so
+only the system instructions are shared and the warm-up is skipped.
+
+Usage:
+    python execution/batch_generate.py --vacancies path/to/postings/
+    python execution/batch_generate.py --manifest vacancies.json --concurrency 8
+
+A manifest is a JSON list of paths or {"id": ..., "path": ...} objects.
+Outputs go to output/batch/<vacancy_id>/ plus a summary output/batch/manifest.json.
+"""
+import os
+import sys
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import time
+import asyncio
+import logging
+import argparse
+from typing import Dict, List, Tuple
+from langchain_core.callbacks import get_usage_metadata_callback
+from execution.utils import ensure_directory, gather_with_limit
+from execution.ingest_vacancy import VACANCY_EXTENSIONS, adistill_vacancy, read_vacancy_file, slugify
+from execution.generate_application import (
+    agenerate_application_bundle, agenerate_cover_letter_content, agenerate_resume_content, as_model,
+    combined_mode_enabled, load_file
+)
+from execution.docx_render import COVER_LETTER, RESUME, render_job
+from execution.gen_models import ResumeContent, CoverLetterContent
+from execution.fact_retrieval import focusing_enabled
+from execution.prescore import prescore_gate
+from execution.profiling import record_span, run_entry_point
+
+# Configure logging to stdout
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+_render_pool = None
+
+def get_render_pool():
+    """
+    Process pool for DOCX rendering when DOCX_RENDER_WORKERS > 1, so rendering for many
+    vacancies is not serialized on the GIL. None renders on the default thread pool.
+    """
+    global _render_pool
+    workers = int(os.getenv("DOCX_RENDER_WORKERS", "1"))
+    if _render_pool is None and workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        _render_pool = ProcessPoolExecutor(max_workers=workers)
+    return _render_pool
+
+class SkipVacancy(Exception):
+    """Raised when a vacancy is filtered out before generation (e.g. by the pre-score gate)."""
+
+def collect_vacancies(vacancy_dir: str = None, manifest_path: str = None) -> List[Tuple[str, str]]:
+    """Returns (vacancy_id, path) pairs from a directory or a manifest file, with unique ids."""
+    entries = []
+    if manifest_path:
+        base_dir = os.path.dirname(os.path.abspath(manifest_path))
+        with open(manifest_path, "r") as f:
+            for item in json.load(f):
+                if isinstance(item, str):
+                    item = {"path": item}
+                path = item["path"] if os.path.isabs(item["path"]) else os.path.join(base_dir, item["path"])
+                entries.append((item.get("id") or os.path.splitext(os.path.basename(path))[0], path))
+    else:
+        for name in sorted(os.listdir(vacancy_dir)):
+            if name.endswith(VACANCY_EXTENSIONS):
+                entries.append((os.path.splitext(name)[0], os.path.join(vacancy_dir, name)))
+
+    seen = {}
+    unique = []
+    for vacancy_id, path in entries:
+        slug = slugify(vacancy_id)
+        seen[slug] = seen.get(slug, 0) + 1
+        if seen[slug] > 1:
+            slug = f"{slug}_{seen[slug]}"
+        unique.append((slug, path))
+    return unique
+
+def summarize_usage(usage_metadata: Dict[str, dict]) -> Dict[str, int]:
+    """Sums provider-reported token usage across models for one vacancy."""
+    totals = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0, "cached_input_tokens": 0}
+    for usage in usage_metadata.values():
+        totals["input_tokens"] += usage.get("input_tokens", 0)
+        totals["output_tokens"] += usage.get("output_tokens", 0)
+        totals["total_tokens"] += usage.get("total_tokens", 0)
+        totals["cached_input_tokens"] += (usage.get("input_token_details") or {}).get("cache_read", 0)
+    return totals
+
+async def process_vacancy_application(vacancy_id: str, path: str, candidate_md: str, output_root: str) -> dict:
+    """Distills one vacancy and writes its tailored documents. Never raises; failures are recorded."""
+    out_dir = os.path.join(output_root, vacancy_id)
+    ensure_directory(out_dir)
+    record = {"id": vacancy_id, "source": path, "output_dir": out_dir, "status": "success", "latency_s": {}}
+    start = time.perf_counter()
+
+    with get_usage_metadata_callback() as usage:
+        try:
+            raw_text = await asyncio.to_thread(read_vacancy_file, path)
+            if not raw_text.strip():
+                raise ValueError("vacancy file is empty")
+
+            step = time.perf_counter()
+            if raw_text.lstrip().startswith("# Vacancy:"):
+                vacancy_md = raw_text  # Already distilled
+            else:
+                vacancy_md = await adistill_vacancy(raw_text)
+            record["latency_s"]["distill"] = round(time.perf_counter() - step, 3)
+            with open(os.path.join(out_dir, "vacancy_profile.md"), "w") as f:
+                f.write(vacancy_md)
+
+            prescore, passed = prescore_gate(candidate_md, vacancy_md)
+            record["prescore"] = prescore.score if prescore is not None else None
+            if not passed:
+                record["status"] = "skipped"
+                raise SkipVacancy(f"pre-score {prescore.score:.0f}/100 below PRESCORE_MIN")
+
+            step = time.perf_counter()
+            if combined_mode_enabled():
+                resume_content, cl_content, analysis = await agenerate_application_bundle(candidate_md, vacancy_md)
+                with open(os.path.join(out_dir, "analysis_report.md"), "w") as f:
+                    f.write(analysis)
+            else:
+                resume_content, cl_content = await asyncio.gather(
+                    agenerate_resume_content(candidate_md, vacancy_md),
+                    agenerate_cover_letter_content(candidate_md, vacancy_md),
+                )
+            record["latency_s"]["generate"] = round(time.perf_counter() - step, 3)
+
+            step = time.perf_counter()
+            resume_content = as_model(resume_content, ResumeContent)
+            cl_content = as_model(cl_content, CoverLetterContent)
+            loop = asyncio.get_running_loop()
+            pool = get_render_pool()
+            await asyncio.gather(
+                loop.run_in_executor(pool, render_job, (RESUME, resume_content, os.path.join(out_dir, "Tailored_Resume.docx"))),
+                loop.run_in_executor(pool, render_job, (COVER_LETTER, cl_content, os.path.join(out_dir, "Tailored_CoverLetter.docx"))),
+            )
+            record["latency_s"]["render"] = round(time.perf_counter() - step, 3)
+            if pool is not None:
+                record_span("render", record["latency_s"]["render"])  # Spans inside pool processes are not seen
+        except SkipVacancy as e:
+            logging.info(f"⏭ {vacancy_id}: {e}")
+            record["reason"] = str(e)
+        except Exception as e:
+            logging.error(f"❌ {vacancy_id}: {e}")
+            record["status"] = "error"
+            record["error"] = str(e)
+
+        record["tokens"] = summarize_usage(usage.usage_metadata)
+
+    record["latency_s"]["total"] = round(time.perf_counter() - start, 3)
+    marks = {"success": "✓", "skipped": "⏭"}
+    logging.info(f"{marks.get(record['status'], '✗')} {vacancy_id} in {record['latency_s']['total']:.1f}s "
+                 f"({record['tokens']['total_tokens']} tokens)")
+    return record
+
+async def run_batch(vacancies: List[Tuple[str, str]], candidate_md: str, output_root: str,
+                    concurrency: int, warm_prefix: bool = True) -> List[dict]:
+    records = []
+    remaining = list(vacancies)
+    if warm_prefix and focusing_enabled():
+        logging.info("FACT_TOKEN_BUDGET selects facts per vacancy, so there is no shared profile prefix to warm")
+        warm_prefix = False
+    if warm_prefix and len(remaining) > 1:
+        # Let the first request populate the provider's prompt cache for the shared prefix
+        vacancy_id, path = remaining.pop(0)
+        records.append(await process_vacancy_application(vacancy_id, path, candidate_md, output_root))
+
+    records.extend(await gather_with_limit(
+        (process_vacancy_application(vacancy_id, path, candidate_md, output_root) for vacancy_id, path in remaining),
+        max_concurrency=concurrency
+    ))
+    return records
+
+def write_summary(records: List[dict], output_root: str, candidate_path: str, wall_s: float) -> str:
+    totals = {key: sum(r["tokens"][key] for r in records) for key in records[0]["tokens"]} if records else {}
+    latencies = sorted(r["latency_s"]["total"] for r in records)
+    summary = {
+        "candidate_profile": candidate_path,
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "wall_time_s": round(wall_s, 3),
+        "succeeded": sum(r["status"] == "success" for r in records),
+        "skipped": sum(r["status"] == "skipped" for r in records),
+        "failed": sum(r["status"] == "error" for r in records),
+        "median_latency_s": latencies[len(latencies) // 2] if latencies else None,
+        "tokens": totals,
+        "vacancies": records,
+    }
+    manifest_path = os.path.join(output_root, "manifest.json")
+    with open(manifest_path, "w") as f:
+        json.dump(summary, f, indent=2)
+    return manifest_path
+
+def main():
+    BASE_DIR = os.getcwd()
+    parser = argparse.ArgumentParser(description="Generate applications for many vacancies")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--vacancies", default=os.path.join(BASE_DIR, "sources", "vacancy"),
+                        help="Directory of vacancy files (.txt, .md, .pdf)")
+    source.add_argument("--manifest", help="JSON list of vacancy paths or {id, path} objects")
+    parser.add_argument("--candidate", default=os.path.join(BASE_DIR, "data", "processed", "candidate_profile.md"))
+    parser.add_argument("--output", default=os.path.join(BASE_DIR, "output", "batch"))
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("BATCH_CONCURRENCY", "4")),
+                        help="Vacancies processed at the same time")
+    parser.add_argument("--no-warm-prefix", action="store_true",
+                        help="Start all vacancies at once instead of warming the prompt cache with the first")
+    args = parser.parse_args()
+
+    candidate_md = load_file(args.candidate)
+    if not candidate_md:
+        logging.error("Missing candidate profile. Run ingest_candidate.py first.")
+        sys.exit(1)
+
+    vacancies = collect_vacancies(args.vacancies, args.manifest)
+    if not vacancies:
+        logging.error("No vacancy files found.")
+        sys.exit(1)
+
+    ensure_directory(args.output)
+    logging.info(f"Generating applications for {len(vacancies)} vacancies (concurrency={args.concurrency})...")
+    start = time.perf_counter()
+    records = asyncio.run(run_batch(vacancies, candidate_md, args.output, max(1, args.concurrency),
+                                    warm_prefix=not args.no_warm_prefix))
+    manifest_path = write_summary(records, args.output, args.candidate, time.perf_counter() - start)
+
+    failed = sum(r["status"] == "error" for r in records)
+    skipped = sum(r["status"] == "skipped" for r in records)
+    logging.info(f"✅ Batch finished: {len(records) - failed - skipped} succeeded, {skipped} skipped, "
+                 f"{failed} failed. Summary: {manifest_path}")
+    if failed == len(records):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    run_entry_point(main)
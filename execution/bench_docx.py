@@ -0,0 +1,231 @@
+"""
+DOCX Rendering Benchmark
+------------------------
+Renders N resume + cover letter pairs (default 1,000) with the previous renderer (a
+blank `Document()` restyled per call, source tags stripped twice per item) and with
+the templated renderer in `docx_render.py`, serially and through `render_batch`'s
+process pool. Before timing, one document of each kind is rendered both ways and
+their document.xml compared, so the speedup is not bought with different output.
+
+Usage:
+    python execution/bench_docx.py
+    python execution/bench_docx.py --documents 200 --workers 4
+"""
+import os
+import sys
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import re
+import time
+import shutil
+import zipfile
+import argparse
+import tempfile
+
+from execution.gen_models import CoverLetterContent, ResumeContent, ResumeSection
+from execution.docx_render import COVER_LETTER, RESUME, render_batch, render_cover_letter, render_resume
+from execution.profiling import run_entry_point
+
+
+def sample_resume(i: int) -> ResumeContent:
+    tag = f" <!-- source_id: src{i % 7} -->"
+    return ResumeContent(
+        name=f"Candidate {i}",
+        role_title="Senior Software Engineer",
+        contact_info=["+1 555 0100", f"candidate{i}@example.com", "linkedin.com/in/example", "Lisbon, Portugal"],
+        summary="Backend engineer with ten years of experience building distributed systems in Python and Go." + tag,
+        skills_section=[skill + tag for skill in ("Python", "Go", "PostgreSQL", "Kafka", "AWS", "Kubernetes",
+                                                  "Terraform", "React", "TypeScript", "Redis")],
+        experience_sections=[
+            ResumeSection(
+                title=f"Senior Engineer | Company {j} | 20{10 + j} - 20{12 + j}",
+                content=[f"Delivered project {k} that cut latency by {10 + k}% for {j + 1}M users." + tag
+                         for k in range(6)],
+            )
+            for j in range(5)
+        ],
+        education_section=["BSc Computer Science, University of Porto" + tag],
+        projects_section=[f"Open-source project {k}: streaming ETL toolkit." + tag for k in range(3)],
+        certifications_section=["AWS Certified Solutions Architect" + tag, "CKA" + tag],
+    )
+
+
+def sample_cover_letter(i: int) -> CoverLetterContent:
+    tag = " <!-- source_id: src1 -->"
+    return CoverLetterContent(
+        opening=f"Dear Hiring Team at Company {i}, I am excited to apply for the Senior Engineer role.",
+        body_paragraphs=["In my current role I led the migration of a monolith to event-driven services." + tag,
+                         "I have mentored engineers and introduced CI/CD quality gates across teams." + tag],
+        closing="I would welcome the chance to discuss how I can contribute to your team.",
+        signature_name=f"Sincerely,\n\nCandidate {i}",
+    )
+
+
+# --- Previous renderer (baseline) ---------------------------------------------------
+
+def legacy_strip_tags(text: str) -> str:
+    if not text:
+        return ""
+    return re.sub(r"<!-- source_id:.*?-->", "", text).strip()
+
+
+def legacy_resume(content: ResumeContent, output_path: str):
+    from docx import Document
+    from docx.shared import Pt
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+    strip_tags = legacy_strip_tags
+    doc = Document()
+    style = doc.styles['Normal']
+    style.font.name = 'Arial'
+    style.font.size = Pt(10.5)
+
+    name_p = doc.add_paragraph()
+    name_p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    run = name_p.add_run(strip_tags(content.name).upper())
+    run.bold = True
+    run.font.size = Pt(16)
+
+    role_p = doc.add_paragraph()
+    role_p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    run = role_p.add_run(strip_tags(content.role_title).upper())
+    run.bold = True
+    run.font.size = Pt(12)
+
+    contact_p = doc.add_paragraph()
+    contact_p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    contact_p.add_run(" | ".join([strip_tags(c) for c in content.contact_info if c]))
+
+    def add_section_header(title):
+        header = doc.add_paragraph()
+        header.paragraph_format.space_before = Pt(12)
+        header.paragraph_format.space_after = Pt(6)
+        run = header.add_run(title.upper())
+        run.bold = True
+        run.font.size = Pt(11)
+
+    if content.summary and strip_tags(content.summary):
+        add_section_header("SUMMARY / PROFILE")
+        doc.add_paragraph(strip_tags(content.summary))
+
+    valid_skills = [strip_tags(s) for s in content.skills_section if strip_tags(s)]
+    if valid_skills:
+        add_section_header("TECHNICAL SKILLS")
+        doc.add_paragraph(", ".join(valid_skills))
+
+    if content.experience_sections:
+        add_section_header("PROFESSIONAL EXPERIENCE")
+        for section in content.experience_sections:
+            title_p = doc.add_paragraph()
+            title_p.paragraph_format.space_before = Pt(6)
+            run = title_p.add_run(strip_tags(section.title))
+            run.bold = True
+            for bullet in section.content:
+                stripped = strip_tags(bullet)
+                if stripped:
+                    p = doc.add_paragraph(stripped, style='List Bullet')
+                    p.paragraph_format.space_after = Pt(2)
+
+    for header, items in (("EDUCATION", content.education_section),
+                          ("CERTIFICATIONS", content.certifications_section),
+                          ("PROJECT HIGHLIGHTS", content.projects_section)):
+        valid = [strip_tags(item) for item in items if strip_tags(item)]
+        if valid:
+            add_section_header(header)
+            for item in valid:
+                doc.add_paragraph(item, style='List Bullet')
+
+    doc.save(output_path)
+
+
+def legacy_cover_letter(content: CoverLetterContent, output_path: str):
+    from docx import Document
+    from docx.shared import Pt
+
+    strip_tags = legacy_strip_tags
+    doc = Document()
+    style = doc.styles['Normal']
+    style.font.name = 'Arial'
+    style.font.size = Pt(11)
+
+    doc.add_paragraph(strip_tags(content.opening)).paragraph_format.space_after = Pt(12)
+    for para in content.body_paragraphs:
+        stripped = strip_tags(para)
+        if stripped:
+            doc.add_paragraph(stripped).paragraph_format.space_after = Pt(12)
+    doc.add_paragraph(strip_tags(content.closing)).paragraph_format.space_after = Pt(12)
+    sig = strip_tags(content.signature_name)
+    if sig:
+        doc.add_paragraph(sig)
+    doc.save(output_path)
+
+
+# --- Benchmark ------------------------------------------------------------------------
+
+def document_xml(path: str) -> bytes:
+    with zipfile.ZipFile(path) as archive:
+        return archive.read("word/document.xml")
+
+
+def check_equivalence(work_dir: str) -> bool:
+    pairs = [(legacy_resume, render_resume, sample_resume(0)),
+             (legacy_cover_letter, render_cover_letter, sample_cover_letter(0))]
+    for legacy, templated, content in pairs:
+        legacy_path = os.path.join(work_dir, "legacy.docx")
+        templated_path = os.path.join(work_dir, "templated.docx")
+        legacy(content, legacy_path)
+        templated(content, templated_path)
+        if document_xml(legacy_path) != document_xml(templated_path):
+            return False
+    return True
+
+
+def run_serial(render_resume_fn, render_cover_letter_fn, documents, out_dir: str) -> float:
+    start = time.perf_counter()
+    for i, (resume, letter) in enumerate(documents):
+        render_resume_fn(resume, os.path.join(out_dir, f"resume_{i}.docx"))
+        render_cover_letter_fn(letter, os.path.join(out_dir, f"letter_{i}.docx"))
+    return time.perf_counter() - start
+
+
+def run_pool(documents, out_dir: str, workers: int) -> float:
+    jobs = []
+    for i, (resume, letter) in enumerate(documents):
+        jobs.append((RESUME, resume, os.path.join(out_dir, f"resume_{i}.docx")))
+        jobs.append((COVER_LETTER, letter, os.path.join(out_dir, f"letter_{i}.docx")))
+    start = time.perf_counter()
+    render_batch(jobs, workers=workers)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DOCX rendering")
+    parser.add_argument("--documents", type=int, default=1000, help="Resume + cover letter pairs to render")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Process pool size")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_docx_")
+    try:
+        identical = check_equivalence(work_dir)
+        print(f"Templated output identical to previous renderer: {'yes' if identical else 'NO'}")
+
+        documents = [(sample_resume(i), sample_cover_letter(i)) for i in range(args.documents)]
+        results = [
+            ("legacy", run_serial(legacy_resume, legacy_cover_letter, documents, work_dir)),
+            ("templated", run_serial(render_resume, render_cover_letter, documents, work_dir)),
+            (f"templated x{args.workers} processes", run_pool(documents, work_dir, args.workers)),
+        ]
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    files = args.documents * 2
+    baseline = results[0][1]
+    print(f"\n{files} documents ({args.documents} resumes + {args.documents} cover letters)")
+    print(f"{'mode':<28}{'total s':>10}{'ms/doc':>10}{'speedup':>10}")
+    for mode, elapsed in results:
+        print(f"{mode:<28}{elapsed:>10.2f}{elapsed / files * 1000:>10.1f}{baseline / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    run_entry_point(main)
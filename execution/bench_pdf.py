@@ -0,0 +1,155 @@
+"""
+PDF Extraction Benchmark
+------------------------
+Compares the previous extraction loop (string concatenation over `pdf.pages`, page
+caches kept until the file closes) with the shared page-streaming extractor in
+`pdf_text.py`, serially and with page ranges spread over a process pool.
+
+Synthetic resume-like PDFs are written by a minimal built-in generator, so no PDF
+authoring library is needed. Each measurement runs in a fresh interpreter so peak
+RSS is not polluted by earlier runs.
+
+Usage:
+    python execution/bench_pdf.py                    # 1, 20 and 200 pages
+    python execution/bench_pdf.py --pages 1 20 200 500 --runs 3
+"""
+import os
+import sys
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import time
+import argparse
+import subprocess
+import tempfile
+from typing import Dict, List, Optional
+
+from execution.profiling import run_entry_point
+
+MODES = ["legacy", "streaming", "parallel"]
+
+LINES = [
+    "Senior Software Engineer - Example Corp (2019 - Present)",
+    "Designed event-driven services in Python and Go handling 40k requests per second.",
+    "Led migration of a monolith to Kubernetes with Terraform and ArgoCD.",
+    "Mentored six engineers; introduced code review guidelines and CI/CD quality gates.",
+    "Skills: Python, Django, FastAPI, PostgreSQL, Redis, Kafka, AWS, Docker, React.",
+    "Project: Portfolio analytics dashboard with TypeScript, GraphQL and D3 charts.",
+]
+
+
+def write_synthetic_pdf(path: str, pages: int, lines_per_page: int = 45, lines: Optional[List[str]] = None):
+    """
+    Writes a text-only PDF with `pages` pages of resume-like lines (Helvetica, 10pt).
+    `lines` (no parentheses or backslashes) replaces the built-in LINES.
+    """
+    lines = lines or LINES
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_refs = []
+    for page in range(pages):
+        rows = [f"({lines[(page + row) % len(lines)]} [p{page + 1}]) Tj T*" for row in range(lines_per_page)]
+        stream = ("BT /F1 10 Tf 12 TL 50 790 Td\n" + "\n".join(rows) + "\nET").encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_ref = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref)
+        page_refs.append(len(objects))
+    kids = " ".join(f"{ref} 0 R" for ref in page_refs).encode()
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def legacy_extract(path: str) -> str:
+    """The extraction loop used before pdf_text.py, kept here as the comparison baseline."""
+    import pdfplumber
+
+    text = ""
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text += page_text + "\n"
+    return text
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak RSS of this process and its children, or None where `resource` is missing (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) * scale
+    return peak / 2 ** 20
+
+
+def measure(mode: str, path: str) -> Dict[str, Optional[float]]:
+    """Runs one extraction in this interpreter and reports wall time and peak RSS."""
+    from execution.pdf_text import PAGE_BREAK, extract_pdf_text
+
+    start = time.perf_counter()
+    if mode == "legacy":
+        text = legacy_extract(path)
+    else:
+        text = extract_pdf_text(path, workers=1 if mode == "streaming" else None)
+    elapsed = time.perf_counter() - start
+    return {"seconds": elapsed, "peak_rss_mb": peak_rss_mb(), "chars": len(text.replace(PAGE_BREAK, ""))}
+
+
+def run_isolated(mode: str, path: str) -> Dict[str, Optional[float]]:
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--measure", mode, path],
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{mode} extraction of {path} failed:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF text extraction")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 20, 200])
+    parser.add_argument("--runs", type=int, default=3, help="Runs per mode (the fastest is reported)")
+    parser.add_argument("--measure", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(*args.measure)))
+        return
+
+    print(f"{'pages':>6}  {'mode':<10}{'best':>10}{'peak rss':>11}{'speedup':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            path = os.path.join(tmp, f"synthetic_{pages}.pdf")
+            write_synthetic_pdf(path, pages)
+            results: Dict[str, List[Dict[str, Optional[float]]]] = {}
+            for mode in MODES:
+                results[mode] = [run_isolated(mode, path) for _ in range(args.runs)]
+
+            lengths = {result["chars"] for runs in results.values() for result in runs}
+            if len(lengths) != 1:
+                print(f"❌ Extracted text differs between modes for {pages} pages: {sorted(lengths)}")
+                sys.exit(1)
+
+            legacy_best = min(r["seconds"] for r in results["legacy"])
+            for mode in MODES:
+                best = min(r["seconds"] for r in results[mode])
+                peaks = [r["peak_rss_mb"] for r in results[mode] if r["peak_rss_mb"] is not None]
+                peak = f"{max(peaks):>9.0f}MB" if peaks else f"{'n/a':>11}"
+                print(f"{pages:>6}  {mode:<10}{best * 1000:>8.0f}ms{peak}{legacy_best / best:>8.2f}x")
+
+
+if __name__ == "__main__":
+    run_entry_point(main)
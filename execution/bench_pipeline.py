@@ -0,0 +1,316 @@
+"""
+Offline Pipeline Benchmark
+--------------------------
+Times every stage and the full pipeline against the deterministic fake chat model
+(execution/fake_llm.py), so throughput regressions show up without network access
+or API keys. Inputs are synthetic: resume PDFs from bench_pdf's generator and
+generated job descriptions, at several scales (1/10/100 resumes, 1/50 vacancies).
+
+Every scenario runs in a fresh temporary workspace with the response cache and the
+client-side rate limiter off. Each LLM call sleeps FAKE_LLM_LATENCY (--latency).
+LLM call, retry and token counts come from that workspace's telemetry log. The
+"retries" scenario injects 429s (--error-rate) into a full pipeline run to time
+backoff handling.
+
+Timings depend on the machine, so the baseline (pipeline_baseline.json) is not
+committed: run once with --update on the machine you compare on. Stage modules and
+their heavy dependencies are imported before timing, so a scenario's time doesn't
+depend on which scenarios ran before it.
+
+Usage:
+    python execution/bench_pipeline.py                        # all scenarios, compare with baseline
+    python execution/bench_pipeline.py --scenarios ingest_candidate pipeline --resumes 1 10
+    python execution/bench_pipeline.py --update               # record this machine's pipeline_baseline.json
+    python execution/bench_pipeline.py --json results.json
+"""
+import os
+import sys
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Configure the environment before any stage module loads its settings
+os.environ.update({"DEFAULT_MODEL": "fake", "LLM_CACHE": "off", "LLM_RATE_LIMIT": "off",
+                   "URL_CACHE": "off"})
+
+import json
+import time
+import random
+import shutil
+import asyncio
+import logging
+import argparse
+import tempfile
+from contextlib import contextmanager, redirect_stdout
+from typing import Callable, Dict, List
+
+from execution.bench_pdf import write_synthetic_pdf
+from execution.fake_llm import reset_call_counter
+from execution.profiling import run_entry_point
+from execution.telemetry import load_records
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pipeline_baseline.json")
+
+SKILLS = ["Python", "Go", "TypeScript", "React", "Django", "FastAPI", "PostgreSQL", "Redis", "Kafka", "AWS",
+          "GCP", "Docker", "Kubernetes", "Terraform", "GraphQL", "Spark", "Airflow", "Java", "Rust", "Node.js"]
+ROLES = ["Backend Engineer", "Platform Engineer", "Data Engineer", "Fullstack Developer", "Site Reliability Engineer"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+
+
+# --- Synthetic inputs -------------------------------------------------------------------
+
+def resume_lines(rng: random.Random, index: int) -> List[str]:
+    lines = [f"Candidate {index} - {rng.choice(ROLES)}", f"candidate{index}@example.com - Lisbon, Portugal"]
+    for job in range(4):
+        start = 2010 + job * 3 + rng.randint(0, 1)
+        lines.append(f"{rng.choice(ROLES)} - {rng.choice(COMPANIES)} {start} - {start + 3}")
+        for _ in range(4):
+            skills = ", ".join(rng.sample(SKILLS, 3))
+            lines.append(f"Delivered {rng.randint(2, 9)} services with {skills}, cutting latency {rng.randint(10, 60)}%.")
+    lines.append("Skills: " + ", ".join(rng.sample(SKILLS, 10)))
+    lines.append(f"Education: BSc Computer Science, University {rng.randint(1, 20)}")
+    return lines
+
+
+def write_resumes(directory: str, count: int, pages: int = 2, seed: int = 0):
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    for index in range(count):
+        write_synthetic_pdf(os.path.join(directory, f"resume_{index:03d}.pdf"), pages, lines_per_page=30,
+                            lines=resume_lines(rng, index))
+
+
+def vacancy_text(rng: random.Random, index: int) -> str:
+    role, company = rng.choice(ROLES), rng.choice(COMPANIES)
+    core, preferred = rng.sample(SKILLS, 5), rng.sample(SKILLS, 3)
+    lines = [f"{role} at {company} (posting {index})", "",
+             f"{company} is hiring a {role} to build and run our data platform.", "", "Requirements:"]
+    lines += [f"- {rng.randint(2, 8)}+ years of experience with {skill}" for skill in core]
+    lines += ["", "Nice to have:"] + [f"- Exposure to {skill}" for skill in preferred]
+    lines += ["", "Responsibilities:", "- Own services end to end", "- Mentor engineers", "- Improve reliability"]
+    return "\n".join(lines) + "\n"
+
+
+def write_vacancies(directory: str, count: int, seed: int = 0):
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    for index in range(count):
+        with open(os.path.join(directory, f"vacancy_{index:03d}.txt"), "w") as f:
+            f.write(vacancy_text(rng, index))
+
+
+# --- Scenarios ------------------------------------------------------------------------------
+
+def run_main(module_name: str):
+    """Runs a stage's main() in-process, like the worker does (non-zero sys.exit is a failure)."""
+    import importlib
+
+    try:
+        importlib.import_module(f"execution.{module_name}").main([])
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            raise RuntimeError(f"{module_name} exited with status {e.code}")
+
+
+def prepare_profiles(resumes: int = 1):
+    """Untimed setup for stages that need the candidate and vacancy profiles."""
+    write_resumes(os.path.join("sources", "candidate"), resumes)
+    write_vacancies(os.path.join("sources", "vacancy"), 1)
+    run_main("ingest_candidate")
+    run_main("ingest_vacancy")
+
+
+def scenario_ingest_candidate(scale: int) -> Callable:
+    write_resumes(os.path.join("sources", "candidate"), scale)
+    return lambda: run_main("ingest_candidate")
+
+
+def scenario_ingest_vacancy(scale: int) -> Callable:
+    write_vacancies(os.path.join("sources", "vacancy"), scale)
+    if scale == 1:
+        return lambda: run_main("ingest_vacancy")
+
+    from execution.ingest_vacancy import process_vacancies_bulk
+    return lambda: process_vacancies_bulk(os.path.join("sources", "vacancy"), os.path.join("data", "processed", "vacancies"),
+                                          4, os.path.join("data", "vacancy_index"))
+
+
+def scenario_analyze_match(scale: int) -> Callable:
+    prepare_profiles()
+    return lambda: run_main("analyze_match")
+
+
+def scenario_generate_application(scale: int) -> Callable:
+    prepare_profiles()
+    return lambda: run_main("generate_application")
+
+
+def scenario_pipeline(scale: int) -> Callable:
+    from execution.pipeline import run_pipeline
+
+    write_resumes(os.path.join("sources", "candidate"), scale)
+    write_vacancies(os.path.join("sources", "vacancy"), 1)
+
+    def run():
+        records = run_pipeline(os.getcwd(), force=True)
+        failed = [name for name, record in records.items() if record["status"] in ("failed", "blocked")]
+        if failed:
+            raise RuntimeError(f"pipeline stages failed: {', '.join(failed)}")
+    return run
+
+
+def scenario_batch_generate(scale: int) -> Callable:
+    from execution.batch_generate import collect_vacancies, run_batch
+
+    prepare_profiles()
+    vacancy_dir = os.path.join("sources", "batch")
+    write_vacancies(vacancy_dir, scale, seed=1)
+    with open(os.path.join("data", "processed", "candidate_profile.md")) as f:
+        candidate_md = f.read()
+
+    def run():
+        records = asyncio.run(run_batch(collect_vacancies(vacancy_dir), candidate_md, os.path.join("output", "batch"), 4))
+        if any(record["status"] == "error" for record in records):
+            raise RuntimeError("batch generation reported errors")
+    return run
+
+
+WARM_MODULES = ["execution.ingest_candidate", "execution.ingest_vacancy", "execution.analyze_match",
+                "execution.generate_application", "execution.batch_generate", "execution.pipeline",
+                "execution.fake_llm", "pdfplumber", "docx"]
+
+
+def warm_up():
+    """Imports everything the scenarios load lazily, so no scenario pays first-import costs."""
+    import importlib
+
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):  # Import heartbeats
+        for module_name in WARM_MODULES:
+            importlib.import_module(module_name)
+
+
+# name: (setup(scale) -> timed callable, scale option, extra environment)
+SCENARIOS: Dict[str, tuple] = {
+    "ingest_candidate": (scenario_ingest_candidate, "resumes", {}),
+    "ingest_vacancy": (scenario_ingest_vacancy, "vacancies", {}),
+    "analyze_match": (scenario_analyze_match, None, {}),
+    "generate_application": (scenario_generate_application, None, {}),
+    "pipeline": (scenario_pipeline, "resumes", {}),
+    "batch_generate": (scenario_batch_generate, "vacancies", {}),
+    "retries": (scenario_pipeline, None, {"FAKE_LLM_ERROR_RATE": "error_rate"}),
+}
+
+
+@contextmanager
+def workspace(env: Dict[str, str]):
+    """Fresh cwd plus temporary environment overrides for one scenario."""
+    previous_cwd, previous_env = os.getcwd(), {key: os.environ.get(key) for key in env}
+    directory = tempfile.mkdtemp(prefix="bench_pipeline_")
+    os.chdir(directory)
+    os.environ.update(env)
+    try:
+        yield directory
+    finally:
+        os.chdir(previous_cwd)
+        for key, value in previous_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def run_scenario(name: str, scale: int, args) -> dict:
+    setup, _, extra_env = SCENARIOS[name]
+    env = {"FAKE_LLM_LATENCY": str(args.latency)}
+    env.update({key: str(getattr(args, option)) for key, option in extra_env.items()})
+    with workspace(env) as directory:
+        run = setup(scale)
+        telemetry_file = os.path.join(directory, "data", "telemetry", "llm_calls.jsonl")
+        if os.path.exists(telemetry_file):
+            os.remove(telemetry_file)  # Drop setup calls; count only the timed run
+        reset_call_counter()
+        start = time.perf_counter()
+        run()
+        wall = time.perf_counter() - start
+        calls = load_records(telemetry_file) if os.path.exists(telemetry_file) else []
+    return {
+        "wall_s": round(wall, 3),
+        "llm_calls": len(calls),
+        "retries": sum(record["retries"] for record in calls),
+        "tokens": sum(record["prompt_tokens"] + record["completion_tokens"] for record in calls),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmark with a fake LLM")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--resumes", type=int, nargs="+", default=[1, 10, 100], help="Resume scales")
+    parser.add_argument("--vacancies", type=int, nargs="+", default=[1, 50], help="Vacancy scales")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated seconds per LLM call")
+    parser.add_argument("--error-rate", type=float, default=0.2, help="429 probability in the retries scenario")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed regression over baseline (0.5 = +50%%)")
+    parser.add_argument("--update", action="store_true", help="Write the measured times as the new baseline")
+    parser.add_argument("--json", help="Also write the results to this file")
+    parser.add_argument("--verbose", action="store_true", help="Show stage logs")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+
+    runs = []
+    for name in args.scenarios:
+        scale_option = SCENARIOS[name][1]
+        for scale in (getattr(args, scale_option) if scale_option else [1]):
+            runs.append((f"{name}@{scale}", name, scale))
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, "r") as f:
+            baseline = json.load(f)
+    elif not args.update:
+        print(f"No baseline at {BASELINE_PATH}; run with --update on this machine to record one.\n")
+
+    warm_up()
+
+    results, regressions = {}, []
+    print(f"{'scenario':<28}{'wall s':>9}{'calls':>7}{'retries':>9}{'tokens':>10}{'baseline':>10}")
+    for key, name, scale in runs:
+        devnull = open(os.devnull, "w")
+        stdout = sys.stdout
+        if not args.verbose:
+            sys.stdout = devnull  # Stage heartbeats and client notices
+        try:
+            result = run_scenario(name, scale, args)
+        except Exception as e:
+            result = {"error": str(e)}
+        finally:
+            sys.stdout = stdout
+            devnull.close()
+        results[key] = result
+        if "error" in result:
+            print(f"{key:<28}{'FAILED':>9}  {result['error']}")
+            regressions.append(key)
+            continue
+        base = baseline.get(key)
+        flag = ""
+        if base is not None and result["wall_s"] > base * (1 + args.tolerance):
+            flag = "  REGRESSION"
+            regressions.append(key)
+        print(f"{key:<28}{result['wall_s']:>9.2f}{result['llm_calls']:>7}{result['retries']:>9}{result['tokens']:>10}"
+              f"{(f'{base:.2f}' if base is not None else '-'):>10}{flag}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"latency_s": args.latency, "results": results}, f, indent=2)
+    if args.update:
+        baseline.update({key: result["wall_s"] for key, result in results.items() if "error" not in result})
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {BASELINE_PATH}")
+    elif regressions:
+        print(f"\n{len(regressions)} scenario(s) failed or regressed past +{args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run_entry_point(main)
@@ -0,0 +1,137 @@
+"""
+Startup Benchmark
+-----------------
+Measures cold-start import time of every stage script with `python -X importtime`
+and fails if any stage regresses past its recorded baseline. Every button press in
+the desktop app (without the persistent worker) pays this cost.
+
+Import times depend on the machine, so the baseline stores each stage relative to a
+calibration import (pydantic plus the LangChain core every stage needs), measured
+the same way in the same run. A faster or slower machine moves both alike, and only
+extra import work in the stages themselves shows up as a regression.
+
+Usage:
+    python execution/bench_startup.py                # compare against startup_baseline.json
+    python execution/bench_startup.py --update       # record new baselines (fastest of --runs)
+    python execution/bench_startup.py --top 15       # show the heaviest imports per stage
+"""
+import os
+import sys
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import argparse
+import statistics
+import subprocess
+import tempfile
+from typing import Dict, List, Tuple
+
+from execution.profiling import run_entry_point
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_baseline.json")
+
+STAGES = ["ingest_candidate", "ingest_vacancy", "analyze_match", "generate_application"]
+CALIBRATION = "calibration"
+CALIBRATION_IMPORTS = ["pydantic", "langchain_core.prompts", "langchain_core.runnables", "langchain_core.language_models"]
+
+
+def import_statement(stage: str) -> str:
+    if stage == CALIBRATION:
+        return "import " + ", ".join(CALIBRATION_IMPORTS)
+    return f"import execution.{stage}"
+
+
+def measure_import(stage: str) -> Tuple[float, List[Tuple[float, str]]]:
+    """
+    Imports `execution.<stage>` (or the calibration modules) in a fresh interpreter.
+
+    Returns:
+        (total_ms, imports): total self-time of all imports and (cumulative_ms, name) per import.
+    """
+    # Run from an empty directory so a local .env or data/ folder doesn't skew results
+    with tempfile.TemporaryDirectory() as cwd:
+        env = dict(os.environ, PYTHONPATH=PROJECT_ROOT, PYTHONDONTWRITEBYTECODE="1")
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", import_statement(stage)],
+            cwd=cwd, env=env, capture_output=True, text=True
+        )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{import_statement(stage)} failed:\n{proc.stderr[-2000:]}")
+
+    total_us = 0
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        total_us += int(self_us)
+        imports.append((int(cumulative_us) / 1000, name.strip()))
+    return total_us / 1000, imports
+
+
+def benchmark(stages: List[str], runs: int) -> Dict[str, dict]:
+    results = {}
+    for stage in stages:
+        samples = []
+        imports = []
+        for _ in range(runs):
+            total_ms, imports = measure_import(stage)
+            samples.append(total_ms)
+        # The fastest run is the least disturbed by scheduler/disk noise
+        results[stage] = {"best_ms": min(samples), "median_ms": statistics.median(samples), "imports": imports}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import benchmark for stage scripts")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per stage (the fastest run is compared)")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed regression over baseline (0.5 = +50%%)")
+    parser.add_argument("--update", action="store_true", help="Write the fastest measured runs as the new baseline")
+    parser.add_argument("--top", type=int, default=0, help="Show the N heaviest imports per stage")
+    parser.add_argument("stages", nargs="*", default=STAGES)
+    args = parser.parse_args()
+
+    calibration_ms = benchmark([CALIBRATION], args.runs)[CALIBRATION]["best_ms"]
+    results = benchmark(args.stages, args.runs)
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, "r") as f:
+            baseline = json.load(f)
+
+    # Baselines are multiples of the calibration import, converted to this machine's milliseconds
+    failed = False
+    print(f"Calibration import ({', '.join(CALIBRATION_IMPORTS)}): {calibration_ms:.0f}ms\n")
+    print(f"{'stage':<24}{'best':>10}{'median':>10}{'ratio':>8}{'baseline':>10}{'limit':>10}")
+    for stage, result in results.items():
+        best_ms = result["best_ms"]
+        ratio = best_ms / calibration_ms
+        base_ratio = baseline.get(stage)
+        base_ms = base_ratio * calibration_ms if base_ratio else None
+        limit_ms = base_ms * (1 + args.tolerance) if base_ms else None
+        status = ""
+        if limit_ms is not None and best_ms > limit_ms and not args.update:
+            status = "  REGRESSION"
+            failed = True
+        print(f"{stage:<24}{best_ms:>8.0f}ms{result['median_ms']:>8.0f}ms{ratio:>7.2f}x"
+              f"{(f'{base_ms:.0f}ms' if base_ms else '-'):>10}"
+              f"{(f'{limit_ms:.0f}ms' if limit_ms else '-'):>10}{status}")
+        if args.top:
+            for cumulative_ms, name in sorted(result["imports"], reverse=True)[:args.top]:
+                print(f"    {cumulative_ms:>8.1f}ms  {name}")
+
+    if args.update:
+        baseline.update({stage: round(r["best_ms"] / calibration_ms, 3) for stage, r in results.items()})
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+    elif failed:
+        print(f"❌ Cold-start import time regressed by more than {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run_entry_point(main)
@@ -0,0 +1,268 @@
+"""
+DOCX Rendering Engine
+---------------------
+Renders ResumeContent / CoverLetterContent into .docx files.
+
+Each process (and thread) keeps one pre-styled document per document kind, loaded
+once. Every paragraph type (name, section header, bullet, ...) is built once with
+python-docx into a prototype paragraph; rendering deep-copies the prototypes, sets
+their text, appends them to the body in one pass, saves, and clears the body again.
+That skips re-loading and re-styling a blank Document and python-docx's per-paragraph
+style lookups on every call. Source tags are stripped once per item with a
+precompiled pattern.
+
+`render_batch` fans rendering out across a process pool for batch runs.
+
+Configuration (.env):
+- DOCX_RESUME_TEMPLATE / DOCX_COVER_LETTER_TEMPLATE: optional .docx files whose styles,
+  page setup and headers/footers are used instead of the python-docx default template
+  (body content is discarded; the resume template must define "List Bullet").
+"""
+import os
+import re
+import copy
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from execution.gen_models import CoverLetterContent, ResumeContent
+from execution.profiling import span
+
+SOURCE_TAG_PATTERN = re.compile(r"<!-- source_id:.*?-->")
+
+RESUME = "resume"
+COVER_LETTER = "cover_letter"
+
+
+def strip_tags(text: str) -> str:
+    """Removes <!-- source_id: ... --> tags from text."""
+    if not text:
+        return ""
+    return SOURCE_TAG_PATTERN.sub("", text).strip()
+
+
+def clean_items(items: List[str]) -> List[str]:
+    """Stripped, non-empty items (each item is stripped exactly once)."""
+    return [text for text in map(strip_tags, items or []) if text]
+
+
+# --- Paragraph prototypes ---------------------------------------------------------
+# Each builder adds one paragraph with python-docx and returns it; its XML becomes the
+# prototype that is cloned for every paragraph of that type.
+
+def _centered(size: Optional[float] = None, bold: bool = False):
+    def build(doc):
+        from docx.shared import Pt
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+        p = doc.add_paragraph()
+        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        run = p.add_run("x")
+        if bold:
+            run.bold = True
+        if size:
+            run.font.size = Pt(size)
+        return p
+    return build
+
+
+def _section_header(doc):
+    from docx.shared import Pt
+
+    p = doc.add_paragraph()
+    p.paragraph_format.space_before = Pt(12)
+    p.paragraph_format.space_after = Pt(6)
+    run = p.add_run("x")
+    run.bold = True
+    run.font.size = Pt(11)
+    return p
+
+
+def _entry_title(doc):
+    from docx.shared import Pt
+
+    p = doc.add_paragraph()
+    p.paragraph_format.space_before = Pt(6)
+    p.add_run("x").bold = True
+    return p
+
+
+def _spaced(style: Optional[str] = None, space_after: Optional[float] = None):
+    def build(doc):
+        from docx.shared import Pt
+
+        p = doc.add_paragraph("x", style=style)
+        if space_after is not None:
+            p.paragraph_format.space_after = Pt(space_after)
+        return p
+    return build
+
+
+RESUME_PROTOTYPES: Dict[str, Callable] = {
+    "name": _centered(size=16, bold=True),
+    "role": _centered(size=12, bold=True),
+    "contact": _centered(),
+    "section": _section_header,
+    "entry": _entry_title,
+    "text": _spaced(),
+    "bullet": _spaced("List Bullet"),
+    "tight_bullet": _spaced("List Bullet", space_after=2),
+}
+
+COVER_LETTER_PROTOTYPES: Dict[str, Callable] = {
+    "paragraph": _spaced(space_after=12),
+    "text": _spaced(),
+}
+
+DOCUMENT_KINDS = {
+    # kind: (Normal font size, prototypes, template env var)
+    RESUME: (10.5, RESUME_PROTOTYPES, "DOCX_RESUME_TEMPLATE"),
+    COVER_LETTER: (11, COVER_LETTER_PROTOTYPES, "DOCX_COVER_LETTER_TEMPLATE"),
+}
+
+
+class DocxRenderer:
+    """A reusable, pre-styled document plus cached paragraph prototypes. Not thread-safe."""
+
+    def __init__(self, font_size: float, prototypes: Dict[str, Callable], template_path: Optional[str] = None):
+        from docx import Document
+        from docx.shared import Pt
+        from docx.oxml.ns import qn
+
+        self.doc = Document(template_path)
+        style = self.doc.styles['Normal']
+        style.font.name = 'Arial'
+        style.font.size = Pt(font_size)
+
+        self.body = self.doc.element.body
+        self.sect_pr = self.body.find(qn("w:sectPr"))
+        for child in list(self.body):
+            if child is not self.sect_pr:
+                self.body.remove(child)
+
+        self.prototypes = {}
+        for kind, build in prototypes.items():
+            element = build(self.doc)._p
+            self.body.remove(element)
+            self.prototypes[kind] = element
+        self._run_tag = qn("w:r")
+
+    def render(self, paragraphs: List[Tuple[str, str]], output_path):
+        """Writes (prototype, text) paragraphs in order to output_path (a path or file object)."""
+        if self.sect_pr is not None:
+            self.body.remove(self.sect_pr)
+        try:
+            for kind, text in paragraphs:
+                element = copy.deepcopy(self.prototypes[kind])
+                # CT_R.text keeps the run formatting and maps \n / \t to breaks and tabs
+                element.find(self._run_tag).text = text
+                self.body.append(element)
+            if self.sect_pr is not None:
+                self.body.append(self.sect_pr)
+            self.doc.save(output_path)
+        finally:
+            for child in list(self.body):
+                if child is not self.sect_pr:
+                    self.body.remove(child)
+            if self.sect_pr is not None and self.sect_pr.getparent() is None:
+                self.body.append(self.sect_pr)
+
+
+_local = threading.local()
+
+
+def get_renderer(kind: str) -> DocxRenderer:
+    """Per-thread renderer for `kind`, built on first use."""
+    renderers = getattr(_local, "renderers", None)
+    if renderers is None:
+        renderers = _local.renderers = {}
+    if kind not in renderers:
+        font_size, prototypes, template_env = DOCUMENT_KINDS[kind]
+        renderers[kind] = DocxRenderer(font_size, prototypes, os.getenv(template_env) or None)
+    return renderers[kind]
+
+
+def reset_renderers():
+    """Drops every thread's renderers so the template settings are read again."""
+    global _local
+    _local = threading.local()
+
+
+def resume_paragraphs(content: ResumeContent) -> List[Tuple[str, str]]:
+    paragraphs = [
+        ("name", strip_tags(content.name).upper()),
+        ("role", strip_tags(content.role_title).upper()),
+        ("contact", " | ".join(strip_tags(c) for c in content.contact_info if c)),
+    ]
+
+    summary = strip_tags(content.summary)
+    if summary:
+        paragraphs += [("section", "SUMMARY / PROFILE"), ("text", summary)]
+
+    skills = clean_items(content.skills_section)
+    if skills:
+        paragraphs += [("section", "TECHNICAL SKILLS"), ("text", ", ".join(skills))]
+
+    if content.experience_sections:
+        paragraphs.append(("section", "PROFESSIONAL EXPERIENCE"))
+        for section in content.experience_sections:
+            paragraphs.append(("entry", strip_tags(section.title)))
+            paragraphs += [("tight_bullet", bullet) for bullet in clean_items(section.content)]
+
+    for header, items in (("EDUCATION", content.education_section),
+                          ("CERTIFICATIONS", getattr(content, 'certifications_section', [])),
+                          ("PROJECT HIGHLIGHTS", content.projects_section)):
+        items = clean_items(items)
+        if items:
+            paragraphs.append(("section", header))
+            paragraphs += [("bullet", item) for item in items]
+    return paragraphs
+
+
+def cover_letter_paragraphs(content: CoverLetterContent) -> List[Tuple[str, str]]:
+    paragraphs = [("paragraph", strip_tags(content.opening))]
+    paragraphs += [("paragraph", para) for para in clean_items(content.body_paragraphs)]
+    paragraphs.append(("paragraph", strip_tags(content.closing)))
+    signature = strip_tags(content.signature_name)
+    if signature:
+        paragraphs.append(("text", signature))
+    return paragraphs
+
+
+def render_resume(content: ResumeContent, output_path):
+    with span("render"):
+        get_renderer(RESUME).render(resume_paragraphs(content), output_path)
+
+
+def render_cover_letter(content: CoverLetterContent, output_path):
+    with span("render"):
+        get_renderer(COVER_LETTER).render(cover_letter_paragraphs(content), output_path)
+
+
+RenderJob = Tuple[str, Union[ResumeContent, CoverLetterContent, dict], str]
+
+
+def render_job(job: RenderJob) -> str:
+    """Process-pool worker: renders one (kind, content, output_path) job."""
+    kind, content, output_path = job
+    if kind == RESUME:
+        render_resume(content if isinstance(content, ResumeContent) else ResumeContent(**content), output_path)
+    else:
+        render_cover_letter(content if isinstance(content, CoverLetterContent) else CoverLetterContent(**content),
+                            output_path)
+    return output_path
+
+
+def render_batch(jobs: List[RenderJob], workers: Optional[int] = None) -> List[str]:
+    """
+    Renders many documents across a process pool (each worker keeps its own renderers).
+    Returns the output paths in job order.
+    """
+    if not jobs:
+        return []
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        return [render_job(job) for job in jobs]
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(render_job, jobs, chunksize=chunksize))
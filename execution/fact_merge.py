@@ -0,0 +1,153 @@
+"""
+Fact Deduplication
+------------------
+Merges the CandidateFacts of several resume sources into one, dropping repeated
+facts. Every fact gets a normalized key (case, whitespace and punctuation folded,
+skill aliases resolved, experiences keyed on company + role + dates) that is hashed
+into a dict, so merging is a single O(n) pass. The kept fact lists every
+contributing source in `metadata.source_file_ids`, so traceability survives.
+"""
+import re
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+from execution.models import CandidateFacts, FactMetadata
+
+# Spellings folded onto one canonical skill name (keys and values are normalized)
+SKILL_ALIASES = {
+    "js": "javascript", "ecmascript": "javascript",
+    "ts": "typescript",
+    "py": "python", "python3": "python",
+    "golang": "go",
+    "node": "node.js", "nodejs": "node.js", "node js": "node.js",
+    "reactjs": "react", "react.js": "react",
+    "vuejs": "vue", "vue.js": "vue",
+    "postgres": "postgresql", "psql": "postgresql",
+    "mongo": "mongodb",
+    "k8s": "kubernetes",
+    "amazon web services": "aws",
+    "gcp": "google cloud", "google cloud platform": "google cloud",
+    "ms azure": "azure", "microsoft azure": "azure",
+    "c sharp": "c#", "csharp": "c#",
+    "cpp": "c++",
+    "ci cd": "ci/cd", "cicd": "ci/cd",
+    "ml": "machine learning",
+    "nlp": "natural language processing",
+}
+COMPANY_SUFFIX_PATTERN = re.compile(r"[,\s]+(inc|llc|ltd|limited|gmbh|corp|corporation|co|plc|s\.?a)\.?$")
+PRESENT_DATES = {"", "present", "current", "now", "today", "ongoing"}
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lowercases, collapses whitespace and strips surrounding punctuation."""
+    return " ".join((text or "").split()).lower().strip(" .,;:-")
+
+
+def skill_key(name: Optional[str]) -> str:
+    skill = normalize(name)
+    return SKILL_ALIASES.get(skill, skill)
+
+
+def company_key(name: Optional[str]) -> str:
+    return COMPANY_SUFFIX_PATTERN.sub("", normalize(name))
+
+
+def end_date_key(date: Optional[str]) -> str:
+    date = normalize(date)
+    return "present" if date in PRESENT_DATES else date
+
+
+def fact_hash(*parts: str) -> str:
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def experience_hash(exp) -> str:
+    return fact_hash("experience", company_key(exp.company), normalize(exp.role),
+                     normalize(exp.start_date), end_date_key(exp.end_date))
+
+
+def skill_hash(skill) -> str:
+    return fact_hash("skill", skill_key(skill.skill_name))
+
+
+def education_hash(edu) -> str:
+    return fact_hash("education", normalize(edu.institution), normalize(edu.degree))
+
+
+def project_hash(proj) -> str:
+    return fact_hash("project", normalize(proj.name))
+
+
+def with_sources(metadata: FactMetadata, source_ids: List[str]) -> FactMetadata:
+    return metadata.model_copy(update={"source_file_id": source_ids[0], "source_file_ids": source_ids})
+
+
+def dedupe(facts, key_fn, prefer=None) -> Tuple[list, int]:
+    """
+    Keeps one fact per key in first-seen order, accumulating source ids.
+    `prefer(current, candidate)` may return the better of two duplicates (e.g. the richer description).
+    """
+    kept: Dict[str, object] = {}
+    sources: Dict[str, List[str]] = {}
+    for fact in facts:
+        key = key_fn(fact)
+        fact_sources = fact.metadata.source_file_ids or [fact.metadata.source_file_id]
+        if key not in kept:
+            kept[key] = fact
+            sources[key] = list(fact_sources)
+            continue
+        if prefer is not None:
+            kept[key] = prefer(kept[key], fact)
+        sources[key].extend(s for s in fact_sources if s not in sources[key])
+
+    merged = [fact.model_copy(update={"metadata": with_sources(fact.metadata, sources[key])})
+              for key, fact in kept.items()]
+    return merged, len(facts) - len(merged)
+
+
+def longer_description(current, candidate):
+    return candidate if len(candidate.description or "") > len(current.description or "") else current
+
+
+def merge_sources(facts_list: List[CandidateFacts]) -> Tuple[CandidateFacts, Dict[str, int]]:
+    """
+    Merges facts from several sources into one CandidateFacts without duplicates.
+
+    Returns:
+        (merged, removed): the merged facts and the number of duplicates dropped per fact type.
+    """
+    main_facts = next((f for f in facts_list if f.full_name), facts_list[0] if facts_list else CandidateFacts())
+
+    experiences, removed_experiences = dedupe([e for f in facts_list for e in f.experiences], experience_hash,
+                                              longer_description)
+    skills, removed_skills = dedupe([s for f in facts_list for s in f.skills], skill_hash,
+                                    lambda current, candidate: candidate if candidate.category and not current.category else current)
+    education, removed_education = dedupe([e for f in facts_list for e in f.education], education_hash)
+    projects, removed_projects = dedupe([p for f in facts_list for p in f.projects], project_hash,
+                                        longer_description)
+
+    certifications = {}
+    for cert in (c for f in facts_list for c in f.certifications):
+        certifications.setdefault(normalize(cert), cert)
+
+    merged = CandidateFacts(
+        full_name=main_facts.full_name,
+        email=main_facts.email,
+        phone=main_facts.phone,
+        linkedin=main_facts.linkedin,
+        location=main_facts.location,
+        professional_summary=main_facts.professional_summary,
+        experiences=experiences,
+        skills=skills,
+        education=education,
+        projects=projects,
+        certifications=list(certifications.values()),
+    )
+    removed = {
+        "experiences": removed_experiences,
+        "skills": removed_skills,
+        "education": removed_education,
+        "projects": removed_projects,
+        "certifications": sum(len(f.certifications) for f in facts_list) - len(certifications),
+    }
+    return merged, removed
@@ -0,0 +1,165 @@
+"""
+Relevance-Ranked Fact Selection
+-------------------------------
+Local retrieval layer over `candidate_profile.md`. Each bullet (experience,
+skill, education, certification, project) is treated as a fact, scored with
+BM25 against the vacancy's Core Requirements and Responsibilities, and the
+top-ranked facts are kept within a token budget. Personal Details are always
+kept. The result is a smaller profile in the same Markdown layout (source_id
+tags intact), so generation prompts stay traceable but cost fewer tokens.
+
+Configuration (.env):
+- FACT_TOKEN_BUDGET: max estimated tokens for the selected profile (unset = send the full profile).
+- FACT_TOP_K: optional cap on the number of selected facts.
+"""
+import os
+import re
+import logging
+from collections import Counter
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from execution.rate_limit import estimate_tokens
+
+if TYPE_CHECKING:
+    import numpy as np  # Imported when ranking, so stage startup doesn't load NumPy
+
+logger = logging.getLogger(__name__)
+
+PINNED_SECTIONS = ("Personal Details",)
+QUERY_SECTIONS = ("Core Requirements", "Responsibilities")
+
+SOURCE_TAG_PATTERN = re.compile(r"<!--.*?-->")
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[.\-/][a-z0-9+#]+)*")
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or our that the their this to
+was we were will with you your - present none listed
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased terms with source tags removed; keeps tech tokens like c++, c#, node.js, ci/cd."""
+    text = SOURCE_TAG_PATTERN.sub(" ", text).lower()
+    return [t for t in TOKEN_PATTERN.findall(text) if t not in STOPWORDS]
+
+
+def parse_markdown_sections(markdown: str) -> List[Tuple[str, List[str]]]:
+    """
+    Splits a profile into (heading, entries). The text before the first `##` heading
+    is returned under the heading "". An entry is a top-level `- ` bullet together with
+    its indented continuation lines; plain paragraphs are single entries.
+    """
+    sections = [("", [])]
+    for line in markdown.splitlines():
+        if line.startswith("## "):
+            sections.append((line[3:].strip(), []))
+            continue
+        entries = sections[-1][1]
+        if not line.strip():
+            continue
+        if line.startswith("- ") or not entries or not line.startswith((" ", "\t")):
+            entries.append(line)
+        else:
+            entries[-1] += "\n" + line
+    return sections
+
+
+def section_text(markdown: str, headings: Tuple[str, ...]) -> str:
+    """Concatenates the entries of the sections whose heading starts with any of `headings`."""
+    return "\n".join(
+        "\n".join(entries)
+        for heading, entries in parse_markdown_sections(markdown)
+        if heading.startswith(headings)
+    )
+
+
+def bm25_scores(documents: List[List[str]], query: List[str], k1: float = 1.5, b: float = 0.75) -> "np.ndarray":
+    """Okapi BM25 score of every tokenized document against the query, computed in one NumPy pass."""
+    import numpy as np
+
+    if not documents:
+        return np.zeros(0)
+    terms = sorted(set(query))
+    if not terms:
+        return np.zeros(len(documents))
+    index = {term: i for i, term in enumerate(terms)}
+
+    tf = np.zeros((len(documents), len(terms)), dtype=np.float64)
+    for row, tokens in enumerate(documents):
+        for term, count in Counter(tokens).items():
+            column = index.get(term)
+            if column is not None:
+                tf[row, column] = count
+
+    lengths = np.array([len(tokens) for tokens in documents], dtype=np.float64)
+    avg_length = lengths.mean() or 1.0
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((len(documents) - df + 0.5) / (df + 0.5))
+    query_weights = np.array([Counter(query)[term] for term in terms], dtype=np.float64)
+
+    norm = k1 * (1 - b + b * lengths / avg_length)
+    weighted_tf = tf * (k1 + 1) / (tf + norm[:, None])
+    return weighted_tf @ (idf * query_weights)
+
+
+def select_relevant_facts(candidate_md: str, vacancy_md: str, token_budget: int,
+                          top_k: Optional[int] = None) -> str:
+    """
+    Returns a reduced candidate profile containing Personal Details plus the facts most
+    relevant to the vacancy, within `token_budget` estimated tokens. Facts keep their
+    original section and order so chronology and source tags are preserved.
+    """
+    sections = parse_markdown_sections(candidate_md)
+    query = tokenize(section_text(vacancy_md, QUERY_SECTIONS) or vacancy_md)
+
+    pinned_tokens = 0
+    candidates = []  # (section_index, entry_index, text)
+    for s_idx, (heading, entries) in enumerate(sections):
+        if not heading or heading.startswith(PINNED_SECTIONS):
+            pinned_tokens += estimate_tokens([heading] + entries)
+            continue
+        for e_idx, entry in enumerate(entries):
+            candidates.append((s_idx, e_idx, entry))
+
+    scores = bm25_scores([tokenize(text) for _, _, text in candidates], query)
+    # Highest score first; ties keep profile order so the selection is deterministic
+    ranking = sorted(range(len(candidates)), key=lambda i: (-scores[i], i))
+
+    selected = set()
+    used_tokens = pinned_tokens
+    for i in ranking:
+        if top_k is not None and len(selected) >= top_k:
+            break
+        cost = estimate_tokens([candidates[i][2]])
+        if used_tokens + cost > token_budget:
+            continue
+        selected.add((candidates[i][0], candidates[i][1]))
+        used_tokens += cost
+
+    lines = []
+    for s_idx, (heading, entries) in enumerate(sections):
+        pinned = not heading or heading.startswith(PINNED_SECTIONS)
+        kept = [entry for e_idx, entry in enumerate(entries) if pinned or (s_idx, e_idx) in selected]
+        if not kept:
+            continue
+        if heading:
+            lines.append(f"## {heading}")
+        lines.extend(kept)
+        lines.append("")
+
+    logger.info(f"Fact selection: kept {len(selected)}/{len(candidates)} facts, "
+                f"~{estimate_tokens([candidate_md])} -> ~{used_tokens} tokens")
+    return "\n".join(lines)
+
+
+def focusing_enabled() -> bool:
+    """True when FACT_TOKEN_BUDGET is set, i.e. prompts get a per-vacancy selection of facts."""
+    return bool(os.getenv("FACT_TOKEN_BUDGET"))
+
+
+def focus_candidate_profile(candidate_md: str, vacancy_md: str) -> str:
+    """Applies select_relevant_facts when FACT_TOKEN_BUDGET is configured, else returns the profile unchanged."""
+    if not focusing_enabled():
+        return candidate_md
+    budget = os.getenv("FACT_TOKEN_BUDGET")
+    top_k = os.getenv("FACT_TOP_K")
+    return select_relevant_facts(candidate_md, vacancy_md, int(budget), int(top_k) if top_k else None)
@@ -0,0 +1,261 @@
+"""
+Candidate Fact Store
+--------------------
+SQLite store for extracted candidate facts (data/processed/facts.db), with one
+table per fact type and indexes on source_id, skill name and company.
+
+Stage 1 writes each source's facts in a single transaction, replacing only the
+sources that changed, and renders candidate_profile.md from the store. Other stages
+can query subsets directly (e.g. all skills matching a list, or the experiences at one
+company) instead of re-parsing the Markdown profile. Rows are keyed by candidate_id,
+so one store can hold several candidates.
+"""
+import json
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from execution.models import CandidateFacts, EducationFact, ExperienceFact, FactMetadata, ProjectFact, SkillFact
+
+DEFAULT_CANDIDATE = "default"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    candidate_id TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    filename TEXT,
+    full_name TEXT,
+    email TEXT,
+    phone TEXT,
+    linkedin TEXT,
+    location TEXT,
+    professional_summary TEXT,
+    raw_text TEXT,
+    ingested_at REAL,
+    PRIMARY KEY (candidate_id, source_id)
+);
+CREATE TABLE IF NOT EXISTS experiences (
+    id INTEGER PRIMARY KEY,
+    candidate_id TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    position INTEGER,
+    company TEXT,
+    role TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    description TEXT,
+    page_number INTEGER,
+    original_text TEXT
+);
+CREATE TABLE IF NOT EXISTS skills (
+    id INTEGER PRIMARY KEY,
+    candidate_id TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    position INTEGER,
+    skill_name TEXT,
+    category TEXT,
+    page_number INTEGER,
+    original_text TEXT
+);
+CREATE TABLE IF NOT EXISTS education (
+    id INTEGER PRIMARY KEY,
+    candidate_id TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    position INTEGER,
+    institution TEXT,
+    degree TEXT,
+    graduation_date TEXT,
+    page_number INTEGER,
+    original_text TEXT
+);
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    candidate_id TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    position INTEGER,
+    name TEXT,
+    description TEXT,
+    technologies TEXT,
+    page_number INTEGER,
+    original_text TEXT
+);
+CREATE TABLE IF NOT EXISTS certifications (
+    id INTEGER PRIMARY KEY,
+    candidate_id TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    position INTEGER,
+    name TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_experiences_source ON experiences (candidate_id, source_id);
+CREATE INDEX IF NOT EXISTS idx_experiences_company ON experiences (candidate_id, company COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_skills_source ON skills (candidate_id, source_id);
+CREATE INDEX IF NOT EXISTS idx_skills_name ON skills (candidate_id, skill_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_education_source ON education (candidate_id, source_id);
+CREATE INDEX IF NOT EXISTS idx_projects_source ON projects (candidate_id, source_id);
+CREATE INDEX IF NOT EXISTS idx_certifications_source ON certifications (candidate_id, source_id);
+"""
+
+FACT_TABLES = ("experiences", "skills", "education", "projects", "certifications")
+PERSONAL_FIELDS = ("full_name", "email", "phone", "linkedin", "location", "professional_summary")
+
+
+def metadata_from_row(row: sqlite3.Row) -> FactMetadata:
+    return FactMetadata(source_file_id=row["source_id"], page_number=row["page_number"],
+                        original_text=row["original_text"])
+
+
+def experience_from_row(row: sqlite3.Row) -> ExperienceFact:
+    return ExperienceFact(company=row["company"], role=row["role"], start_date=row["start_date"],
+                          end_date=row["end_date"], description=row["description"], metadata=metadata_from_row(row))
+
+
+def skill_from_row(row: sqlite3.Row) -> SkillFact:
+    return SkillFact(skill_name=row["skill_name"], category=row["category"], metadata=metadata_from_row(row))
+
+
+def education_from_row(row: sqlite3.Row) -> EducationFact:
+    return EducationFact(institution=row["institution"], degree=row["degree"],
+                         graduation_date=row["graduation_date"], metadata=metadata_from_row(row))
+
+
+def project_from_row(row: sqlite3.Row) -> ProjectFact:
+    return ProjectFact(name=row["name"], description=row["description"],
+                       technologies=json.loads(row["technologies"] or "[]"), metadata=metadata_from_row(row))
+
+
+class FactStore:
+    def __init__(self, path: str, candidate_id: str = DEFAULT_CANDIDATE):
+        self.path = path
+        self.candidate_id = candidate_id
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Writes -----------------------------------------------------------------
+
+    def _delete_sources(self, source_ids: Iterable[str]):
+        params = [(self.candidate_id, source_id) for source_id in source_ids]
+        for table in FACT_TABLES + ("sources",):
+            self.conn.executemany(f"DELETE FROM {table} WHERE candidate_id = ? AND source_id = ?", params)
+
+    def _insert_source(self, source_id: str, filename: str, facts: CandidateFacts):
+        c, s = self.candidate_id, source_id
+        self.conn.execute(
+            "INSERT INTO sources VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (c, s, filename, *(getattr(facts, field) for field in PERSONAL_FIELDS), facts.raw_text, time.time())
+        )
+        self.conn.executemany(
+            "INSERT INTO experiences (candidate_id, source_id, position, company, role, start_date, end_date, "
+            "description, page_number, original_text) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(c, s, i, e.company, e.role, e.start_date, e.end_date, e.description,
+              e.metadata.page_number, e.metadata.original_text) for i, e in enumerate(facts.experiences)]
+        )
+        self.conn.executemany(
+            "INSERT INTO skills (candidate_id, source_id, position, skill_name, category, page_number, original_text) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(c, s, i, k.skill_name, k.category, k.metadata.page_number, k.metadata.original_text)
+             for i, k in enumerate(facts.skills)]
+        )
+        self.conn.executemany(
+            "INSERT INTO education (candidate_id, source_id, position, institution, degree, graduation_date, "
+            "page_number, original_text) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(c, s, i, e.institution, e.degree, e.graduation_date, e.metadata.page_number, e.metadata.original_text)
+             for i, e in enumerate(facts.education)]
+        )
+        self.conn.executemany(
+            "INSERT INTO projects (candidate_id, source_id, position, name, description, technologies, page_number, "
+            "original_text) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(c, s, i, p.name, p.description, json.dumps(p.technologies), p.metadata.page_number,
+              p.metadata.original_text) for i, p in enumerate(facts.projects)]
+        )
+        self.conn.executemany(
+            "INSERT INTO certifications (candidate_id, source_id, position, name) VALUES (?, ?, ?, ?)",
+            [(c, s, i, name) for i, name in enumerate(facts.certifications)]
+        )
+
+    def sync_sources(self, updated: Dict[str, Tuple[str, CandidateFacts]], filenames: Dict[str, str]):
+        """
+        Applies one ingestion run in a single transaction: replaces the facts of every
+        source in `updated` ({source_id: (filename, facts)}), records the current filename
+        of every active source, and deletes sources that are no longer in `filenames`
+        ({source_id: filename}). Unchanged sources are not rewritten.
+        """
+        with self.conn:
+            stale = self.source_ids() - set(filenames)
+            self._delete_sources(stale | set(updated))
+            for source_id, (filename, facts) in updated.items():
+                self._insert_source(source_id, filename, facts)
+            self.conn.executemany(
+                "UPDATE sources SET filename = ? WHERE candidate_id = ? AND source_id = ?",
+                [(filename, self.candidate_id, source_id) for source_id, filename in filenames.items()]
+            )
+
+    # --- Reads ------------------------------------------------------------------
+
+    def source_ids(self) -> Set[str]:
+        rows = self.conn.execute("SELECT source_id FROM sources WHERE candidate_id = ?", (self.candidate_id,))
+        return {row["source_id"] for row in rows}
+
+    def fact_count(self, source_id: str) -> int:
+        return sum(
+            self.conn.execute(f"SELECT COUNT(*) FROM {table} WHERE candidate_id = ? AND source_id = ?",
+                              (self.candidate_id, source_id)).fetchone()[0]
+            for table in ("experiences", "skills", "education", "projects")
+        )
+
+    def _rows(self, table: str, source_ids: Optional[List[str]] = None, where: str = "", params: tuple = ()):
+        query = f"SELECT * FROM {table} WHERE candidate_id = ?"
+        args = [self.candidate_id]
+        if source_ids is not None:
+            query += f" AND source_id IN ({', '.join('?' * len(source_ids))})"
+            args.extend(source_ids)
+        if where:
+            query += f" AND {where}"
+            args.extend(params)
+        return self.conn.execute(query + " ORDER BY source_id, position", args).fetchall()
+
+    def load_facts(self, source_ids: Optional[List[str]] = None) -> List[CandidateFacts]:
+        """One CandidateFacts per source, in filename order (the order profiles are merged in)."""
+        query = "SELECT * FROM sources WHERE candidate_id = ?"
+        args = [self.candidate_id]
+        if source_ids is not None:
+            query += f" AND source_id IN ({', '.join('?' * len(source_ids))})"
+            args.extend(source_ids)
+        by_source = {row["source_id"]: CandidateFacts(**{field: row[field] for field in PERSONAL_FIELDS},
+                                                      raw_text=row["raw_text"])
+                     for row in self.conn.execute(query + " ORDER BY filename, source_id", args)}
+        ids = list(by_source)
+        for row in self._rows("experiences", ids):
+            by_source[row["source_id"]].experiences.append(experience_from_row(row))
+        for row in self._rows("skills", ids):
+            by_source[row["source_id"]].skills.append(skill_from_row(row))
+        for row in self._rows("education", ids):
+            by_source[row["source_id"]].education.append(education_from_row(row))
+        for row in self._rows("projects", ids):
+            by_source[row["source_id"]].projects.append(project_from_row(row))
+        for row in self._rows("certifications", ids):
+            by_source[row["source_id"]].certifications.append(row["name"])
+        return list(by_source.values())
+
+    def find_skills(self, names: Iterable[str]) -> List[SkillFact]:
+        """Skills whose name matches any of `names` (case-insensitive, uses the skill index)."""
+        names = list(names)
+        if not names:
+            return []
+        where = f"skill_name COLLATE NOCASE IN ({', '.join('?' * len(names))})"
+        return [skill_from_row(row) for row in self._rows("skills", where=where, params=tuple(names))]
+
+    def find_experiences(self, company: str) -> List[ExperienceFact]:
+        """Experiences at `company` (case-insensitive, uses the company index)."""
+        return [experience_from_row(row)
+                for row in self._rows("experiences", where="company = ? COLLATE NOCASE", params=(company,))]
@@ -0,0 +1,189 @@
+"""
+Fake Chat Model
+---------------
+Deterministic, offline stand-in for the LLM providers, selected with
+DEFAULT_MODEL=fake (or any model name starting with "fake:"). Used by the benchmark
+suite (bench_pipeline.py) and for running the pipeline without API keys.
+
+Responses are derived from the prompt:
+- Prompts carrying JsonOutputParser format instructions get a JSON object generated
+  from the embedded JSON schema (every required field filled, $refs resolved), so
+  CandidateFacts, ResumeContent, CoverLetterContent and ApplicationBundle all validate.
+- The vacancy distillation and match analysis prompts get Markdown in their
+  documented formats, built from the input text.
+Responses carry usage metadata (~4 characters per token) like a real provider.
+
+Configuration (.env), read on every call:
+- FAKE_LLM_LATENCY: simulated seconds per call (default 0).
+- FAKE_LLM_JITTER: extra uniform random latency, as a fraction of FAKE_LLM_LATENCY (default 0).
+- FAKE_LLM_ERROR_RATE: probability that a call fails with a 429 (default 0).
+- FAKE_LLM_RETRY_AFTER: "retry in Ns" hint carried by injected 429s (default 0).
+- FAKE_LLM_SEED: seed for jitter and 429 injection (default 0).
+"""
+import os
+import re
+import json
+import time
+import random
+import asyncio
+import hashlib
+import threading
+from typing import Any, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+_call_lock = threading.Lock()
+_call_count = 0
+
+SCHEMA_PATTERN = re.compile(r"```(?:json)?\s*(\{.*\})\s*```", re.DOTALL)
+LIST_ITEMS = 3
+
+
+def reset_call_counter():
+    """Restarts the seeded latency/429 sequence (benchmarks call this before each scenario)."""
+    global _call_count
+    with _call_lock:
+        _call_count = 0
+
+
+class FakeRateLimitError(Exception):
+    """Injected rate-limit failure; its message matches what invoke_with_retry treats as a 429."""
+
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def input_words(text: str, limit: int = 400) -> List[str]:
+    return re.findall(r"[A-Za-z][A-Za-z+#.\-]{2,}", text)[:limit] or ["example"]
+
+
+def instance_from_schema(schema: dict, definitions: dict, words: List[str], path: str = "") -> Any:
+    """Builds a value that validates against `schema`, using `words` from the input for text."""
+    if "$ref" in schema:
+        return instance_from_schema(definitions[schema["$ref"].split("/")[-1]], definitions, words, path)
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            options = [option for option in schema[key] if option.get("type") != "null"] or schema[key]
+            return instance_from_schema(options[0], definitions, words, path)
+    if "enum" in schema:
+        return schema["enum"][0]
+
+    kind = schema.get("type", "object" if "properties" in schema else "string")
+    if kind == "object":
+        return {name: instance_from_schema(prop, definitions, words, f"{path}.{name}")
+                for name, prop in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [instance_from_schema(schema.get("items", {}), definitions, words, f"{path}[{i}]")
+                for i in range(LIST_ITEMS)]
+    if kind == "integer":
+        return 1
+    if kind == "number":
+        return 1.0
+    if kind == "boolean":
+        return False
+    # Strings: a few input words picked deterministically from the field path
+    seed = int(hashlib.md5(path.encode("utf-8")).hexdigest()[:8], 16)
+    return " ".join(words[(seed + i * 7) % len(words)] for i in range(6))
+
+
+def json_response(system: str, human: str) -> Optional[str]:
+    match = SCHEMA_PATTERN.search(system)
+    if not match:
+        return None
+    try:
+        schema = json.loads(match.group(1))
+    except ValueError:
+        return None
+    definitions = schema.get("$defs") or schema.get("definitions") or {}
+    return json.dumps(instance_from_schema(schema, definitions, input_words(human)))
+
+
+def vacancy_response(human: str) -> str:
+    words = input_words(human)
+    bullets = [line.strip("-• ").strip() for line in human.splitlines() if line.strip().startswith(("-", "•"))]
+    bullets = bullets or [" ".join(words[i:i + 6]) for i in range(0, 30, 6)]
+    core, preferred = bullets[:max(1, len(bullets) // 2)], bullets[len(bullets) // 2:]
+    lines = [f"# Vacancy: {' '.join(words[:3]).title()} - Example Company", "", "## Core Requirements"]
+    lines += [f"- **{item.split()[0]}**: {item}" for item in core]
+    lines += ["", "## Preferred Qualifications (Nice to Have)"] + [f"- {item}" for item in preferred or core[:1]]
+    lines += ["", "## Responsibilities", f"- {' '.join(words[:10])}",
+              "", "## Cultural/Soft Skills", "- Collaboration and ownership",
+              "", "## Hidden Expectations (Inferred)", "- Comfortable with ambiguity"]
+    return "\n".join(lines) + "\n"
+
+
+def analysis_response(human: str) -> str:
+    score = 50 + int(hashlib.md5(human.encode("utf-8")).hexdigest()[:4], 16) % 50
+    words = input_words(human, 60)
+    return (f"# Match Analysis: {score}/100\n\n## 💎 Strong Matches\n- {' '.join(words[:8])}\n"
+            f"- {' '.join(words[8:16])}\n\n## ⚠️ Potential Gaps / Weaknesses\n- {' '.join(words[16:24])}\n\n"
+            f"## 🎯 Hiring Manager Summary\nA solid candidate for this role. {' '.join(words[24:34])}.\n")
+
+
+def respond(messages: List[BaseMessage]) -> str:
+    system = "\n".join(str(m.content) for m in messages if m.type == "system")
+    human = "\n".join(str(m.content) for m in messages if m.type != "system")
+    structured = json_response(system, human)
+    if structured is not None:
+        return structured
+    if "# Vacancy:" in system:
+        return vacancy_response(human)
+    if "Match Analysis" in system:
+        return analysis_response(human)
+    return " ".join(input_words(human, 50))
+
+
+class FakeChatModel(BaseChatModel):
+    """Offline chat model with simulated latency and injectable 429s (see module docstring)."""
+
+    model_name: str = "fake"
+    temperature: float = 0.1
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _next_call(self):
+        """(latency, fail) for the next call, drawn from a seeded stream shared by all instances."""
+        global _call_count
+        with _call_lock:
+            _call_count += 1
+            call = _call_count
+        rng = random.Random(f"{os.getenv('FAKE_LLM_SEED', '0')}:{call}")
+        latency = _float_env("FAKE_LLM_LATENCY", 0.0)
+        latency += latency * _float_env("FAKE_LLM_JITTER", 0.0) * rng.random()
+        return latency, rng.random() < _float_env("FAKE_LLM_ERROR_RATE", 0.0)
+
+    def _result(self, messages: List[BaseMessage], fail: bool) -> ChatResult:
+        if fail:
+            retry_after = _float_env("FAKE_LLM_RETRY_AFTER", 0.0)
+            raise FakeRateLimitError(f"Error code: 429 - RESOURCE_EXHAUSTED (fake). Please retry in {retry_after}s.")
+        text = respond(messages)
+        prompt_tokens = sum(len(str(m.content)) for m in messages) // 4
+        message = AIMessage(
+            content=text,
+            response_metadata={"model_name": self.model_name},
+            usage_metadata={"input_tokens": prompt_tokens, "output_tokens": len(text) // 4,
+                            "total_tokens": prompt_tokens + len(text) // 4},
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs) -> ChatResult:
+        latency, fail = self._next_call()
+        if latency:
+            time.sleep(latency)
+        return self._result(messages, fail)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager=None, **kwargs) -> ChatResult:
+        latency, fail = self._next_call()
+        if latency:
+            await asyncio.sleep(latency)
+        return self._result(messages, fail)
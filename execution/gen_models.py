@@ -21,3 +21,9 @@ class CoverLetterContent(BaseModel):
     body_paragraphs: List[str] = Field(description="1-2 concise paragraphs connecting candidate experience to job needs.")
     closing: str = Field(description="Short professional closing and call to action (WITHOUT the sign-off).")
     signature_name: str = Field(description="The professional sign-off and candidate's full name (e.g. 'Sincerely,\n\nJohn Doe').")
+
+class ApplicationBundle(BaseModel):
+    """Combined generation mode: resume, cover letter and match analysis from one LLM call."""
+    resume: ResumeContent = Field(description="The tailored resume.")
+    cover_letter: CoverLetterContent = Field(description="The tailored cover letter.")
+    analysis: str = Field(description="The match analysis report as a Markdown string, in the ANALYSIS format.")
@@ -9,17 +9,19 @@ import sys
 # Add project root to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import asyncio
 import logging
 import concurrent.futures
-from docx import Document
-from docx.shared import Pt
-import re
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.shared import RGBColor
+from typing import List, Optional, Tuple
+from pydantic import ValidationError
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
-from execution.utils import get_llm, ensure_directory, invoke_with_retry
-from execution.gen_models import ResumeContent, CoverLetterContent
+from execution.utils import get_llm, ensure_directory, invoke_with_retry, ainvoke_with_retry, combined_mode_enabled
+from execution.gen_models import ApplicationBundle, ResumeContent, CoverLetterContent
+from execution.fact_retrieval import focus_candidate_profile
+from execution.prescore import prescore_gate
+from execution.docx_render import render_resume, render_cover_letter
+from execution.profiling import run_entry_point, span
 
 # Configure logging to stdout
 logging.basicConfig(
@@ -34,18 +36,7 @@ def load_file(path: str) -> str:
     with open(path, "r") as f:
         return f.read()
 
-def strip_tags(text: str) -> str:
-    """Removes <!-- source_id: ... --> tags from text."""
-    if not text:
-        return ""
-    return re.sub(r"<!-- source_id:.*?-->", "", text).strip()
-
-def generate_resume_content(candidate_md: str, vacancy_md: str) -> ResumeContent:
-    llm = get_llm(temperature=0.1)
-    parser = JsonOutputParser(pydantic_object=ResumeContent)
-    
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", """You are a Professional Resume Strategist.
+RESUME_INSTRUCTIONS = """You are a Professional Resume Strategist.
 
 Context:
 1. Candidate Profile (Strict Fact Database)
@@ -64,14 +55,22 @@ CRITICAL CONSTRAINTS:
   * Preserve exact dates, percentages, and numerical achievements
 - If a section (like Projects or Certifications) has NO data in the profile, return an empty list for that section.
 - **Presentation ONLY**: You may restructure how facts are presented, combine related bullets, or adjust emphasis - but NEVER change the facts themselves.
+"""
 
-Output: serialized JSON matching the schema.
-{format_instructions}
-"""),
+def build_resume_chain():
+    llm = get_llm(temperature=0.1)
+    parser = JsonOutputParser(pydantic_object=ResumeContent)
+    
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", RESUME_INSTRUCTIONS + "\nOutput: serialized JSON matching the schema.\n{format_instructions}\n"),
         ("human", "CANDIDATE PROFILE:\n{candidate}\n\nVACANCY:\n{vacancy}")
     ])
     
-    chain = prompt | llm | parser
+    return prompt | llm | parser, parser
+
+def generate_resume_content(candidate_md: str, vacancy_md: str) -> ResumeContent:
+    chain, parser = build_resume_chain()
+    candidate_md = focus_candidate_profile(candidate_md, vacancy_md)
     logging.info("Generating tailored resume content...")
     return invoke_with_retry(chain, {
         "candidate": candidate_md,
@@ -79,12 +78,18 @@ Output: serialized JSON matching the schema.
         "format_instructions": parser.get_format_instructions()
     }, max_retries=5)
 
-def generate_cover_letter_content(candidate_md: str, vacancy_md: str) -> CoverLetterContent:
-    llm = get_llm(temperature=0.2)
-    parser = JsonOutputParser(pydantic_object=CoverLetterContent)
-    
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", """You are an expert career coach writing a modern, high-impact Cover Letter.
+async def agenerate_resume_content(candidate_md: str, vacancy_md: str) -> ResumeContent:
+    """Async twin of generate_resume_content."""
+    chain, parser = build_resume_chain()
+    candidate_md = focus_candidate_profile(candidate_md, vacancy_md)
+    logging.info("Generating tailored resume content...")
+    return await ainvoke_with_retry(chain, {
+        "candidate": candidate_md,
+        "vacancy": vacancy_md,
+        "format_instructions": parser.get_format_instructions()
+    }, max_retries=5)
+
+COVER_LETTER_INSTRUCTIONS = """You are an expert career coach writing a modern, high-impact Cover Letter.
 
 Task: Write a concise, punchy cover letter that connects the candidate's actual experience to the vacancy's needs.
 
@@ -100,12 +105,22 @@ Rules:
   * Example: "~40k users" stays "~40k users", NOT "40,000 users" or "approximately 40k users"
 - **Greeting**: Always start with a professional greeting (e.g., "Dear Hiring Team at [Company Name],").
 - **Signature**: Provide a professional sign-off (e.g. "Sincerely," or "Best regards,") followed by the candidate's full name in the `signature_name` field.
-{format_instructions}
-"""),
+"""
+
+def build_cover_letter_chain():
+    llm = get_llm(temperature=0.2)
+    parser = JsonOutputParser(pydantic_object=CoverLetterContent)
+    
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", COVER_LETTER_INSTRUCTIONS + "{format_instructions}\n"),
         ("human", "CANDIDATE PROFILE:\n{candidate}\n\nVACANCY:\n{vacancy}")
     ])
     
-    chain = prompt | llm | parser
+    return prompt | llm | parser, parser
+
+def generate_cover_letter_content(candidate_md: str, vacancy_md: str) -> CoverLetterContent:
+    chain, parser = build_cover_letter_chain()
+    candidate_md = focus_candidate_profile(candidate_md, vacancy_md)
     logging.info("Generating tailored cover letter...")
     return invoke_with_retry(chain, {
         "candidate": candidate_md,
@@ -113,123 +128,125 @@ Rules:
         "format_instructions": parser.get_format_instructions()
     }, max_retries=5)
 
+async def agenerate_cover_letter_content(candidate_md: str, vacancy_md: str) -> CoverLetterContent:
+    """Async twin of generate_cover_letter_content."""
+    chain, parser = build_cover_letter_chain()
+    candidate_md = focus_candidate_profile(candidate_md, vacancy_md)
+    logging.info("Generating tailored cover letter...")
+    return await ainvoke_with_retry(chain, {
+        "candidate": candidate_md,
+        "vacancy": vacancy_md,
+        "format_instructions": parser.get_format_instructions()
+    }, max_retries=5)
+
+def build_combined_chain():
+    # analyze_match is a stage script; import its prompt only when combined mode is used
+    from execution.analyze_match import ANALYSIS_INSTRUCTIONS
+
+    llm = get_llm(temperature=0.1)
+    parser = JsonOutputParser(pydantic_object=ApplicationBundle)
+
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", "Produce three outputs for one job application in a single JSON object: the tailored "
+                   "`resume`, the `cover_letter` and the match `analysis`. Each follows its own brief below.\n\n"
+                   "=== RESUME ===\n" + RESUME_INSTRUCTIONS +
+                   "\n=== COVER LETTER ===\n" + COVER_LETTER_INSTRUCTIONS +
+                   "\n=== ANALYSIS (Markdown string in the `analysis` field) ===\n" + ANALYSIS_INSTRUCTIONS +
+                   "\nOutput: serialized JSON matching the schema.\n{format_instructions}\n"),
+        ("human", "CANDIDATE PROFILE:\n{candidate}\n\nVACANCY:\n{vacancy}")
+    ])
+
+    return prompt | llm | parser, parser
+
+def split_bundle(result) -> Tuple[Optional[ResumeContent], Optional[CoverLetterContent], Optional[str]]:
+    """Validates each section of a combined response on its own; missing or invalid sections are None."""
+    if not isinstance(result, dict):
+        return None, None, None
+    sections = []
+    for key, model in (("resume", ResumeContent), ("cover_letter", CoverLetterContent)):
+        try:
+            with span("parse"):
+                sections.append(model.model_validate(result.get(key)))
+        except ValidationError as e:
+            logging.warning(f"Combined response has an invalid {key}: {e.error_count()} validation error(s)")
+            sections.append(None)
+    analysis = result.get("analysis")
+    sections.append(analysis.strip() if isinstance(analysis, str) and analysis.strip() else None)
+    return tuple(sections)
+
+def as_model(content, model):
+    if isinstance(content, model):
+        return content
+    with span("parse"):
+        return model(**content)
+
+def combined_inputs(candidate_md: str, vacancy_md: str, parser) -> dict:
+    return {
+        "candidate": focus_candidate_profile(candidate_md, vacancy_md),
+        "vacancy": vacancy_md,
+        "format_instructions": parser.get_format_instructions()
+    }
+
+def generate_application_bundle(candidate_md: str, vacancy_md: str) -> Tuple[ResumeContent, CoverLetterContent, str]:
+    """
+    Combined mode: one structured call returns the resume, cover letter and match analysis,
+    so the candidate profile and vacancy are sent once instead of three times. Sections
+    missing from the response or failing validation are generated with their own chain.
+    """
+    chain, parser = build_combined_chain()
+    logging.info("Generating resume, cover letter and match analysis in one call...")
+    try:
+        result = invoke_with_retry(chain, combined_inputs(candidate_md, vacancy_md, parser), max_retries=5)
+    except Exception as e:
+        logging.warning(f"Combined generation failed ({e}); generating each section separately")
+        result = None
+    resume, cover_letter, analysis = split_bundle(result)
+
+    from execution.analyze_match import analyze_match
+
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        resume_task = executor.submit(generate_resume_content, candidate_md, vacancy_md) if resume is None else None
+        cl_task = executor.submit(generate_cover_letter_content, candidate_md, vacancy_md) if cover_letter is None else None
+        analysis_task = executor.submit(analyze_match, candidate_md, vacancy_md) if analysis is None else None
+        resume = as_model(resume_task.result(), ResumeContent) if resume_task else resume
+        cover_letter = as_model(cl_task.result(), CoverLetterContent) if cl_task else cover_letter
+        analysis = analysis_task.result() if analysis_task else analysis
+    return resume, cover_letter, analysis
+
+async def agenerate_application_bundle(candidate_md: str, vacancy_md: str) -> Tuple[ResumeContent, CoverLetterContent, str]:
+    """Async twin of generate_application_bundle."""
+    chain, parser = build_combined_chain()
+    logging.info("Generating resume, cover letter and match analysis in one call...")
+    try:
+        result = await ainvoke_with_retry(chain, combined_inputs(candidate_md, vacancy_md, parser), max_retries=5)
+    except Exception as e:
+        logging.warning(f"Combined generation failed ({e}); generating each section separately")
+        result = None
+    resume, cover_letter, analysis = split_bundle(result)
+
+    from execution.analyze_match import aanalyze_match
+
+    async def keep(value):
+        return value
+
+    resume, cover_letter, analysis = await asyncio.gather(
+        keep(resume) if resume is not None else agenerate_resume_content(candidate_md, vacancy_md),
+        keep(cover_letter) if cover_letter is not None else agenerate_cover_letter_content(candidate_md, vacancy_md),
+        keep(analysis) if analysis is not None else aanalyze_match(candidate_md, vacancy_md),
+    )
+    return as_model(resume, ResumeContent), as_model(cover_letter, CoverLetterContent), analysis
+
 def create_docx(content: ResumeContent, output_path: str):
-    doc = Document()
-    
-    # Global Style Adjustments
-    style = doc.styles['Normal']
-    style.font.name = 'Arial'
-    style.font.size = Pt(10.5)
-    
-    # Header
-    name_p = doc.add_paragraph()
-    name_p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run = name_p.add_run(strip_tags(content.name).upper())
-    run.bold = True
-    run.font.size = Pt(16)
-
-    role_p = doc.add_paragraph()
-    role_p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run = role_p.add_run(strip_tags(content.role_title).upper())
-    run.bold = True
-    run.font.size = Pt(12)
-
-    contact_p = doc.add_paragraph()
-    contact_p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    contact_str = " | ".join([strip_tags(c) for c in content.contact_info if c])
-    contact_p.add_run(contact_str)
-
-    def add_section_header(title):
-        header = doc.add_paragraph()
-        header.paragraph_format.space_before = Pt(12)
-        header.paragraph_format.space_after = Pt(6)
-        run = header.add_run(title.upper())
-        run.bold = True
-        run.font.size = Pt(11)
-
-    # Summary
-    if content.summary and strip_tags(content.summary):
-        add_section_header("SUMMARY / PROFILE")
-        doc.add_paragraph(strip_tags(content.summary))
-
-    # Skills
-    valid_skills = [strip_tags(s) for s in content.skills_section if strip_tags(s)]
-    if valid_skills:
-        add_section_header("TECHNICAL SKILLS")
-        # For technical skills, comma separated looks better sometimes, but let's stick to a clean block
-        # Grouped skills like in the example is harder with current schema, but we can try to join them
-        doc.add_paragraph(", ".join(valid_skills))
-
-    # Experience
-    if content.experience_sections:
-        add_section_header("PROFESSIONAL EXPERIENCE")
-        for section in content.experience_sections:
-            title_p = doc.add_paragraph()
-            title_p.paragraph_format.space_before = Pt(6)
-            run = title_p.add_run(strip_tags(section.title))
-            run.bold = True
-            for bullet in section.content:
-                stripped = strip_tags(bullet)
-                if stripped:
-                    p = doc.add_paragraph(stripped, style='List Bullet')
-                    p.paragraph_format.space_after = Pt(2)
-
-    # Education
-    valid_edu = [strip_tags(e) for e in content.education_section if strip_tags(e)]
-    if valid_edu:
-        add_section_header("EDUCATION")
-        for edu in valid_edu:
-            doc.add_paragraph(edu, style='List Bullet')
-
-    # Certifications
-    # Note: Check if certifications_section exists in content (Pydantic might not have it yet if not updated)
-    certs = getattr(content, 'certifications_section', [])
-    valid_certs = [strip_tags(c) for c in certs if strip_tags(c)]
-    if valid_certs:
-        add_section_header("CERTIFICATIONS")
-        for cert in valid_certs:
-            doc.add_paragraph(cert, style='List Bullet')
-
-    # Projects
-    valid_projs = [strip_tags(p) for p in content.projects_section if strip_tags(p)]
-    if valid_projs:
-        add_section_header("PROJECT HIGHLIGHTS")
-        for proj in valid_projs:
-            doc.add_paragraph(proj, style='List Bullet')
-
-    doc.save(output_path)
+    # python-docx is imported on first render so the LLM calls can start sooner
+    render_resume(content, output_path)
     logging.info(f"Saved resume DOCX to {output_path}")
 
 def create_cl_docx(content: CoverLetterContent, output_path: str):
-    doc = Document()
-    style = doc.styles['Normal']
-    style.font.name = 'Arial'
-    style.font.size = Pt(11)
-    
-    # Opening (greeting)
-    opening_p = doc.add_paragraph(strip_tags(content.opening))
-    opening_p.paragraph_format.space_after = Pt(12)  # Use spacing property instead of blank paragraph
-    
-    # Body paragraphs
-    for para in content.body_paragraphs:
-        stripped = strip_tags(para)
-        if stripped:
-            p = doc.add_paragraph(stripped)
-            p.paragraph_format.space_after = Pt(12)  # Consistent spacing between paragraphs
-    
-    # Closing
-    closing_p = doc.add_paragraph(strip_tags(content.closing))
-    closing_p.paragraph_format.space_after = Pt(12)
-    
-    # Signature
-    sig = strip_tags(content.signature_name)
-    if sig:
-        doc.add_paragraph(sig)
-    
-    doc.save(output_path)
+    render_cover_letter(content, output_path)
     logging.info(f"Saved cover letter DOCX to {output_path}")
 
-def main():
+def main(argv: Optional[List[str]] = None):
+    # No options; argv is accepted so the worker and pipeline can call every stage's main() alike
     # Use current working directory (important for packaged Electron app)
     BASE_DIR = os.getcwd()
     DATA_DIR = os.path.join(BASE_DIR, "data", "processed")
@@ -245,7 +262,27 @@ def main():
 
     candidate_md = load_file(candidate_path)
     vacancy_md = load_file(vacancy_path)
+
+    prescore, passed = prescore_gate(candidate_md, vacancy_md)
+    if not passed:
+        logging.error(f"Local pre-score {prescore.score:.0f}/100 is below PRESCORE_MIN ({os.getenv('PRESCORE_MIN')}); "
+                      "skipping generation.")
+        sys.exit(1)
     
+    if combined_mode_enabled():
+        try:
+            resume_content, cl_content, analysis = generate_application_bundle(candidate_md, vacancy_md)
+            analysis_path = os.path.join(DATA_DIR, "analysis_report.md")
+            with open(analysis_path, "w") as f:
+                f.write(analysis)
+            logging.info(f"Analysis report saved to {analysis_path}")
+            create_docx(resume_content, os.path.join(OUTPUT_DIR, "Tailored_Resume.docx"))
+            create_cl_docx(cl_content, os.path.join(OUTPUT_DIR, "Tailored_CoverLetter.docx"))
+        except Exception as e:
+            logging.error(f"Generation failed: {e}")
+            sys.exit(1)
+        return
+
     # Run Generation in Parallel to save time
     logging.info("Starting parallel generation of Resume and Cover Letter...")
     with concurrent.futures.ThreadPoolExecutor() as executor:
@@ -254,15 +291,11 @@ def main():
         
         try:
             # 1. Process Resume
-            resume_content = resume_task.result()
-            if isinstance(resume_content, dict):
-                resume_content = ResumeContent(**resume_content)
+            resume_content = as_model(resume_task.result(), ResumeContent)
             create_docx(resume_content, os.path.join(OUTPUT_DIR, "Tailored_Resume.docx"))
             
             # 2. Process Cover Letter
-            cl_content = cl_task.result()
-            if isinstance(cl_content, dict):
-                 cl_content = CoverLetterContent(**cl_content)
+            cl_content = as_model(cl_task.result(), CoverLetterContent)
             create_cl_docx(cl_content, os.path.join(OUTPUT_DIR, "Tailored_CoverLetter.docx"))
             
         except Exception as e:
@@ -270,4 +303,4 @@ def main():
             sys.exit(1)
 
 if __name__ == "__main__":
-    main()
+    run_entry_point(main)
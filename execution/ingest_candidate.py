@@ -10,15 +10,25 @@ import sys
 # Add project root to sys.path to allow imports from 'execution' package
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import json
+import io
+import re
 import logging
 import hashlib
-from typing import List, Dict
-import pdfplumber
+import time
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from typing import List, Dict, Optional, Tuple
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
-from execution.utils import get_llm, ensure_directory, invoke_with_retry
+from langchain_core.output_parsers import JsonOutputParser
+from execution.utils import (
+    get_llm, ensure_directory, invoke_with_retry, ainvoke_with_retry, gather_with_limit
+)
 from execution.models import CandidateFacts, ExperienceFact, SkillFact, EducationFact, ProjectFact, FactMetadata
+from execution.pdf_text import PAGE_BREAK, extract_pdf_text, extract_page_range, page_ranges, pages_per_task, split_pages
+from execution.rate_limit import estimate_tokens
+from execution.fact_merge import merge_sources
+from execution.fact_store import FactStore
+from execution.profiling import record_span, run_entry_point, span
 
 # Configure logging to stdout so Electron can capture it
 logging.basicConfig(
@@ -43,30 +53,13 @@ def calculate_file_hash(filepath: str) -> str:
 
 def extract_text_from_pdf(filepath: str) -> str:
     """Extracts text from a PDF file."""
-    text = ""
     try:
-        with pdfplumber.open(filepath) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
+        return extract_pdf_text(filepath)
     except Exception as e:
         logging.error(f"Error reading PDF {filepath}: {e}")
         return ""
-    return text
 
-def extract_facts_from_text(text: str, source_id: str, filename: str) -> CandidateFacts:
-    """
-    Uses an LLM and JsonOutputParser to extract structured data from resume text.
-    
-    Args:
-        text: The raw text extracted from the PDF.
-        source_id: A unique hash identifier for the source file.
-        filename: The original filename for logging purposes.
-        
-    Returns:
-        candidate_facts: A Pydantic model containing atomized experiences, skills, etc.
-    """
+def build_extraction_chain():
     llm = get_llm(temperature=0.1)
     parser = JsonOutputParser(pydantic_object=CandidateFacts)
     
@@ -81,56 +74,230 @@ def extract_facts_from_text(text: str, source_id: str, filename: str) -> Candida
         ("human", "{text}")
     ])
     
-    chain = prompt | llm | parser
+    return prompt | llm | parser, parser
+
+# Lines that start a new resume section: Markdown headings or short ALL-CAPS titles ("EXPERIENCE", "SKILLS:")
+SECTION_HEADING_PATTERN = re.compile(r"^(?:#{1,6}\s+\S.*|[A-Z][A-Z&/\- ]{2,40}:?)$")
+
+# A chunk is a list of (page_number, text) pieces; page_number is None when the text has no page breaks
+TextChunk = List[Tuple[Optional[int], str]]
+
+# Chunks below this size (e.g. a name/contact header) are merged with the next piece, even over budget
+MIN_CHUNK_TOKENS = 200
+
+def chunk_token_budget() -> int:
+    return int(os.getenv("FACT_CHUNK_TOKENS", "3000"))
+
+def split_sections(page_text: str) -> List[str]:
+    """Splits a page before every heading-like line."""
+    sections, current = [], []
+    for line in page_text.splitlines(keepends=True):
+        if current and SECTION_HEADING_PATTERN.match(line.strip()):
+            sections.append("".join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append("".join(current))
+    return sections
+
+def split_lines(text: str, token_budget: int) -> List[str]:
+    """Last resort for a single oversized section: packs whole lines up to the budget."""
+    parts, current, used = [], [], 0
+    for line in text.splitlines(keepends=True):
+        cost = estimate_tokens([line])
+        if current and used + cost > token_budget:
+            parts.append("".join(current))
+            current, used = [], 0
+        current.append(line)
+        used += cost
+    if current:
+        parts.append("".join(current))
+    return parts
+
+def chunk_resume_text(text: str, token_budget: int) -> List[TextChunk]:
+    """
+    Splits resume text into chunks of roughly `token_budget` tokens. Consecutive pages are
+    packed together; a page over budget is split at section headings, and a section over
+    budget at line boundaries. Text shorter than the budget is a single chunk.
+
+    A chunk is only closed once it holds MIN_CHUNK_TOKENS (capped at half the budget), so a
+    short section such as the header with the candidate's name is extracted together with
+    the text after it; a short trailing chunk is merged into the previous one.
+    """
+    pages = split_pages(text)
+    numbered = PAGE_BREAK in text
+
+    pieces = []  # (page_number, text, tokens)
+    for number, page in enumerate(pages, 1):
+        page_number = number if numbered else None
+        for section in ([page] if estimate_tokens([page]) <= token_budget else split_sections(page)):
+            for part in ([section] if estimate_tokens([section]) <= token_budget else split_lines(section, token_budget)):
+                if part.strip():
+                    pieces.append((page_number, part, estimate_tokens([part])))
+
+    min_tokens = min(MIN_CHUNK_TOKENS, token_budget // 2)
+    chunks, current, used = [], [], 0
+    for page_number, part, cost in pieces:
+        if current and used >= min_tokens and used + cost > token_budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append((page_number, part))
+        used += cost
+    if current:
+        if chunks and used < min_tokens:
+            chunks[-1].extend(current)
+        else:
+            chunks.append(current)
+    return chunks or [[(1 if numbered else None, text)]]
+
+def chunk_text(chunk: TextChunk) -> str:
+    return "".join(part for _, part in chunk)
+
+def locate_page(chunk: TextChunk, *needles: Optional[str]) -> Optional[int]:
+    """
+    Page of the first piece of the chunk containing a needle (facts are copied verbatim).
+    Needles are tried in order, most specific first.
+    """
+    if len({page_number for page_number, _ in chunk}) == 1:
+        return chunk[0][0]
+    lowered = [(page_number, part.lower()) for page_number, part in chunk]
+    for needle in (n.lower() for n in needles if n):
+        for page_number, part in lowered:
+            if needle in part:
+                return page_number
+    return chunk[0][0]
+
+def build_candidate_facts(result_dict: dict, text: str, source_id: str, chunk: Optional[TextChunk] = None) -> CandidateFacts:
+    """Converts the raw LLM JSON into CandidateFacts, tagging every fact with source metadata."""
+    chunk = chunk or [(None, text)]
+
+    # Construct CandidateFacts and inject metadata
+    def metadata(*needles: Optional[str]) -> FactMetadata:
+        return FactMetadata(source_file_id=source_id, page_number=locate_page(chunk, *needles),
+                            original_text="Extracted via LLM")
     
-    try:
-        logging.info(f"Extracting facts from {filename}...")
-        result_dict = invoke_with_retry(chain, {"text": text, "format_instructions": parser.get_format_instructions()}, max_retries=10)
+    facts = CandidateFacts(
+        full_name=result_dict.get("full_name"),
+        email=result_dict.get("email"),
+        phone=result_dict.get("phone"),
+        linkedin=result_dict.get("linkedin"),
+        location=result_dict.get("location"),
+        professional_summary=result_dict.get("professional_summary"),
+        certifications=result_dict.get("certifications", []),
+        raw_text=text  # Complete text for auditability
+    )
+
+    for exp in result_dict.get("experiences", []):
+        if "metadata" in exp: del exp["metadata"]
+        facts.experiences.append(ExperienceFact(**exp, metadata=metadata(exp.get("company"), exp.get("role"))))
         
-        # Construct CandidateFacts and inject metadata
-        metadata = FactMetadata(source_file_id=source_id, original_text="Extracted via LLM")
+    for skill in result_dict.get("skills", []):
+         if "metadata" in skill: del skill["metadata"]
+         facts.skills.append(SkillFact(**skill, metadata=metadata(skill.get("skill_name"))))
+         
+    for edu in result_dict.get("education", []):
+         if "metadata" in edu: del edu["metadata"]
+         facts.education.append(EducationFact(**edu, metadata=metadata(edu.get("institution"), edu.get("degree"))))
+         
+    for proj in result_dict.get("projects", []):
+         if "metadata" in proj: del proj["metadata"]
+         facts.projects.append(ProjectFact(**proj, metadata=metadata(proj.get("name"))))
+         
+    return facts
+
+def merge_candidate_facts(parts: List[CandidateFacts], text: str) -> CandidateFacts:
+    """Merges per-chunk results in document order; personal details come from the first chunk that has them."""
+    def first(field: str):
+        return next((getattr(part, field) for part in parts if getattr(part, field)), None)
+
+    return CandidateFacts(
+        full_name=first("full_name"),
+        email=first("email"),
+        phone=first("phone"),
+        linkedin=first("linkedin"),
+        location=first("location"),
+        professional_summary=first("professional_summary"),
+        experiences=[fact for part in parts for fact in part.experiences],
+        skills=[fact for part in parts for fact in part.skills],
+        education=[fact for part in parts for fact in part.education],
+        projects=[fact for part in parts for fact in part.projects],
+        certifications=list(dict.fromkeys(cert for part in parts for cert in part.certifications)),
+        raw_text=text
+    )
+
+def chunk_concurrency() -> int:
+    return max(1, int(os.getenv("FACT_CHUNK_CONCURRENCY", "4")))
+
+def extract_facts_from_text(text: str, source_id: str, filename: str,
+                            slots: Optional[threading.Semaphore] = None) -> CandidateFacts:
+    """
+    Uses an LLM and JsonOutputParser to extract structured data from resume text.
+    Long texts are split by chunk_resume_text and the chunks are extracted concurrently,
+    so latency is bounded by the largest chunk rather than the whole document.
+    
+    Args:
+        text: The raw text extracted from the PDF.
+        source_id: A unique hash identifier for the source file.
+        filename: The original filename for logging purposes.
+        slots: Limits extraction calls in flight; shared by every file of a run so the
+            total stays at FACT_CHUNK_CONCURRENCY. Defaults to a limit for this text alone.
         
-        facts = CandidateFacts(
-            full_name=result_dict.get("full_name"),
-            email=result_dict.get("email"),
-            phone=result_dict.get("phone"),
-            linkedin=result_dict.get("linkedin"),
-            location=result_dict.get("location"),
-            professional_summary=result_dict.get("professional_summary"),
-            certifications=result_dict.get("certifications", []),
-            raw_text=text[:5000]  # Store first 5000 chars of raw text for auditability
-        )
-
-        for exp in result_dict.get("experiences", []):
-            if "metadata" in exp: del exp["metadata"]
-            facts.experiences.append(ExperienceFact(**exp, metadata=metadata))
-            
-        for skill in result_dict.get("skills", []):
-             if "metadata" in skill: del skill["metadata"]
-             facts.skills.append(SkillFact(**skill, metadata=metadata))
-             
-        for edu in result_dict.get("education", []):
-             if "metadata" in edu: del edu["metadata"]
-             facts.education.append(EducationFact(**edu, metadata=metadata))
-             
-        for proj in result_dict.get("projects", []):
-             if "metadata" in proj: del proj["metadata"]
-             facts.projects.append(ProjectFact(**proj, metadata=metadata))
-             
-        return facts
+    Returns:
+        candidate_facts: A Pydantic model containing atomized experiences, skills, etc.
+    """
+    chain, parser = build_extraction_chain()
+    chunks = chunk_resume_text(text, chunk_token_budget())
+    inputs = [{"text": chunk_text(chunk), "format_instructions": parser.get_format_instructions()} for chunk in chunks]
+    slots = slots or threading.BoundedSemaphore(chunk_concurrency())
+
+    def extract_chunk(data: dict) -> dict:
+        with slots:
+            return invoke_with_retry(chain, data, max_retries=10)
+    
+    try:
+        if len(chunks) == 1:
+            logging.info(f"Extracting facts from {filename}...")
+            results = [extract_chunk(inputs[0])]
+        else:
+            logging.info(f"Extracting facts from {filename} in {len(chunks)} chunks...")
+            with ThreadPoolExecutor(max_workers=min(len(chunks), chunk_concurrency())) as pool:
+                results = list(pool.map(extract_chunk, inputs))
+        with span("parse"):
+            return merge_candidate_facts(
+                [build_candidate_facts(result, text, source_id, chunk) for result, chunk in zip(results, chunks)], text)
         
     except Exception as e:
         logging.error(f"LLM Extraction failed for {filename}: {e}")
         return CandidateFacts()
 
-def save_markdown_profile(facts_list: List[CandidateFacts], output_path: str):
-    """
-    Aggregates facts from multiple sources and writes a Normalized Markdown profile.
-    """
+async def aextract_facts_from_text(text: str, source_id: str, filename: str) -> CandidateFacts:
+    """Async twin of extract_facts_from_text."""
+    chain, parser = build_extraction_chain()
+    chunks = chunk_resume_text(text, chunk_token_budget())
+    inputs = [{"text": chunk_text(chunk), "format_instructions": parser.get_format_instructions()} for chunk in chunks]
+    
+    try:
+        logging.info(f"Extracting facts from {filename}" + (f" in {len(chunks)} chunks..." if len(chunks) > 1 else "..."))
+        results = await gather_with_limit((ainvoke_with_retry(chain, data, max_retries=10) for data in inputs),
+                                          max_concurrency=chunk_concurrency())
+        with span("parse"):
+            return merge_candidate_facts(
+                [build_candidate_facts(result, text, source_id, chunk) for result, chunk in zip(results, chunks)], text)
+        
+    except Exception as e:
+        logging.error(f"LLM Extraction failed for {filename}: {e}")
+        return CandidateFacts()
+
+def source_tag(metadata: FactMetadata) -> str:
+    """`<!-- source_id: ... -->` listing every source that contained the fact."""
+    return f"<!-- source_id: {', '.join(metadata.source_file_ids or [metadata.source_file_id])} -->"
+
+def render_markdown_profile(facts_list: List[CandidateFacts]) -> str:
+    """Renders facts from one or more sources as the Normalized Markdown profile."""
     # Peak for personal info (use the first one found or first non-empty)
     main_facts = next((f for f in facts_list if f.full_name), facts_list[0] if facts_list else None)
 
-    with open(output_path, "w") as f:
+    with io.StringIO() as f:
         f.write("# Candidate Profile\n\n")
         
         if main_facts:
@@ -156,7 +323,7 @@ def save_markdown_profile(facts_list: List[CandidateFacts], output_path: str):
                     else:
                         date_str += " - Present"
                 
-                f.write(f"- **{exp.role}** at **{exp.company}** ({date_str}) <!-- source_id: {exp.metadata.source_file_id} -->\n")
+                f.write(f"- **{exp.role}** at **{exp.company}** ({date_str}) {source_tag(exp.metadata)}\n")
                 f.write(f"  - {exp.description}\n")
         f.write("\n")
 
@@ -164,7 +331,7 @@ def save_markdown_profile(facts_list: List[CandidateFacts], output_path: str):
         all_skills = []
         for facts in facts_list:
             for skill in facts.skills:
-                all_skills.append(f"{skill.skill_name} <!-- source_id: {skill.metadata.source_file_id} -->")
+                all_skills.append(f"{skill.skill_name} {source_tag(skill.metadata)}")
         
         for skill_str in all_skills:
             f.write(f"- {skill_str}\n")
@@ -173,7 +340,7 @@ def save_markdown_profile(facts_list: List[CandidateFacts], output_path: str):
         f.write("## Education\n")
         for facts in facts_list:
             for edu in facts.education:
-                 f.write(f"- **{edu.degree}**, {edu.institution} <!-- source_id: {edu.metadata.source_file_id} -->\n")
+                 f.write(f"- **{edu.degree}**, {edu.institution} {source_tag(edu.metadata)}\n")
         f.write("\n")
         
         # Add certifications section
@@ -194,19 +361,207 @@ def save_markdown_profile(facts_list: List[CandidateFacts], output_path: str):
         f.write("## Projects\n")
         for facts in facts_list:
             for proj in facts.projects:
-                f.write(f"- **{proj.name}**: {proj.description} <!-- source_id: {proj.metadata.source_file_id} -->\n")
+                f.write(f"- **{proj.name}**: {proj.description} {source_tag(proj.metadata)}\n")
+
+        return f.getvalue()
+
+def save_markdown_profile(facts_list: List[CandidateFacts], output_path: str):
+    """
+    Aggregates facts from multiple sources, drops duplicates (see fact_merge.py)
+    and writes a Normalized Markdown profile.
+    """
+    with span("render"):
+        merged, removed = merge_sources(facts_list)
+        profile = render_markdown_profile([merged])
+
+    duplicates = sum(removed.values())
+    if duplicates:
+        saved_tokens = estimate_tokens([render_markdown_profile(facts_list)]) - estimate_tokens([profile])
+        details = ", ".join(f"{count} {kind}" for kind, count in removed.items() if count)
+        logging.info(f"Deduplicated {duplicates} repeated facts ({details}), saving ~{saved_tokens} tokens per prompt")
+
+    with open(output_path, "w") as f:
+        f.write(profile)
+
+def count_facts(facts: CandidateFacts) -> int:
+    """Total number of atomized facts (experiences, skills, education, projects)."""
+    return len(facts.experiences) + len(facts.skills) + len(facts.education) + len(facts.projects)
+
+def load_cached_facts(output_dir: str, source_id: str) -> Optional[CandidateFacts]:
+    """Loads a previously written facts_{source_id}.json, or None if missing/unusable."""
+    json_path = os.path.join(output_dir, f"facts_{source_id}.json")
+    if not os.path.exists(json_path):
+        return None
+    try:
+        with open(json_path, "r") as f:
+            facts = CandidateFacts.model_validate_json(f.read())
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable cached facts {json_path}: {e}")
+        return None
+    # Empty results usually mean the LLM call failed last time, so retry them
+    return facts if count_facts(facts) else None
+
+def load_cached_text(output_dir: str, source_id: str) -> Optional[str]:
+    """Returns text_{source_id}.txt from a previous run, if present."""
+    text_path = os.path.join(output_dir, f"text_{source_id}.txt")
+    if not os.path.exists(text_path):
+        return None
+    with open(text_path, "r") as f:
+        return f.read()
+
+def timed_extract_range(filepath: str, start_page: int, stop_page: int) -> Tuple[str, int, float]:
+    """Process-pool worker: extracts one page range of a PDF and reports how long it took."""
+    start = time.perf_counter()
+    text, total_pages = extract_page_range(filepath, start_page, stop_page)
+    return text, total_pages, time.perf_counter() - start
+
+def timed_extract_facts(text: str, source_id: str, filename: str,
+                        slots: threading.Semaphore) -> Tuple[CandidateFacts, float]:
+    """Thread-pool worker: runs the LLM fact extraction and reports how long it took."""
+    start = time.perf_counter()
+    facts = extract_facts_from_text(text, source_id, filename, slots)
+    return facts, time.perf_counter() - start
+
+def is_usable_text(raw_text: str, filename: str) -> bool:
+    """Rejects empty or near-empty extractions (e.g. scanned PDFs) before spending an LLM call."""
+    if not raw_text:
+        logging.error(f"Failed to extract text from {filename} or file is empty.")
+        return False
+    
+    if len(raw_text.strip()) < 50:
+        logging.warning(f"⚠ Very little text extracted from {filename} ({len(raw_text)} chars)")
+        logging.warning("This PDF may be a scanned image. OCR would be required.")
+        return False
+        
+    logging.info(f"✓ Extracted {len(raw_text)} chars from {filename}. Sample: {raw_text[:100]}...")
+    return True
+
+def run_extraction_pipeline(pending: List[Tuple[str, str, str, Optional[str]]], output_dir: str,
+                            workers: int) -> Dict[str, Tuple[CandidateFacts, str]]:
+    """
+    Pipelines text extraction (process pool, CPU-bound) into fact extraction
+    (bounded thread pool, network-bound): each file is sent to the LLM as soon as its
+    text is ready, so total time approaches that of the slowest file. Long PDFs are
+    split into page ranges (PDF_PAGES_PER_TASK) that share the same process pool.
+
+    Args:
+        pending: (filename, filepath, source_id, cached_text) tuples; cached_text skips pdfplumber.
+        output_dir: Where extracted text is cached as text_{source_id}.txt.
+        workers: Maximum concurrent PDF parsers and files in fact extraction; LLM calls
+            in flight are capped at FACT_CHUNK_CONCURRENCY across all files.
 
-def process_candidate_sources(source_dir: str, output_dir: str):
+    Returns:
+        results: {filename: (facts, raw_text)} for every file that produced usable text.
+    """
+    results = {}
+    timings = {filename: [0.0, 0.0] for filename, _, _, _ in pending}
+    to_extract = [item for item in pending if item[3] is None]
+    start = time.perf_counter()
+
+    # Workers start on demand, so a single long PDF can still spread its page ranges across the pool
+    pdf_pool = ProcessPoolExecutor(max_workers=min(workers, os.cpu_count() or 1)) if to_extract else None
+    llm_pool = ThreadPoolExecutor(max_workers=min(workers, len(pending)))
+    llm_futures = {}
+    # One limit for the chunks of every file, so workers x FACT_CHUNK_CONCURRENCY calls never queue at once
+    chunk_slots = threading.BoundedSemaphore(chunk_concurrency())
+
+    def submit_facts(filename: str, source_id: str, raw_text: str):
+        if is_usable_text(raw_text, filename):
+            future = llm_pool.submit(timed_extract_facts, raw_text, source_id, filename, chunk_slots)
+            llm_futures[future] = (filename, raw_text)
+
+    try:
+        size = pages_per_task()
+        pdf_futures = {}
+        page_chunks = {}  # filename -> {start_page: text}; None once the file has failed
+        chunks_expected = {}
+        for filename, filepath, source_id, cached_text in pending:
+            if cached_text is not None:
+                submit_facts(filename, source_id, cached_text)
+            else:
+                # The first range also reports the page count, which schedules the rest
+                page_chunks[filename] = {}
+                future = pdf_pool.submit(timed_extract_range, filepath, 0, size)
+                pdf_futures[future] = (filename, filepath, source_id, 0)
+
+        while pdf_futures:
+            done, _ = wait(pdf_futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                filename, filepath, source_id, start_page = pdf_futures.pop(future)
+                if page_chunks[filename] is None:
+                    continue
+                try:
+                    text, total_pages, elapsed = future.result()
+                except Exception as e:
+                    logging.error(f"Error reading PDF {filename}: {e}")
+                    page_chunks[filename] = None
+                    continue
+                timings[filename][0] += elapsed
+                record_span("extract", elapsed)
+                page_chunks[filename][start_page] = text
+                if start_page == 0:
+                    ranges = page_ranges(total_pages, size, start=size)
+                    chunks_expected[filename] = 1 + len(ranges)
+                    for first, stop in ranges:
+                        future = pdf_pool.submit(timed_extract_range, filepath, first, stop)
+                        pdf_futures[future] = (filename, filepath, source_id, first)
+
+                if len(page_chunks[filename]) == chunks_expected[filename]:
+                    raw_text = "".join(page_chunks[filename][first] for first in sorted(page_chunks[filename]))
+                    page_chunks[filename] = None
+                    if raw_text:
+                        with open(os.path.join(output_dir, f"text_{source_id}.txt"), "w") as f:
+                            f.write(raw_text)
+                    submit_facts(filename, source_id, raw_text)
+
+        for future in as_completed(llm_futures):
+            filename, raw_text = llm_futures[future]
+            facts, elapsed = future.result()
+            timings[filename][1] = elapsed
+            results[filename] = (facts, raw_text)
+    finally:
+        if pdf_pool is not None:
+            pdf_pool.shutdown()
+        llm_pool.shutdown()
+
+    for filename in sorted(timings):
+        extract_s, llm_s = timings[filename]
+        logging.info(f"⏱ {filename}: text {extract_s:.2f}s, facts {llm_s:.2f}s")
+    logging.info(f"⏱ Processed {len(pending)} file(s) in {time.perf_counter() - start:.2f}s with {workers} worker(s)")
+    return results
+
+def prune_stale_artifacts(output_dir: str, active_ids: set):
+    """Removes facts/text artifacts whose source PDF no longer exists."""
+    for name in os.listdir(output_dir):
+        for prefix, suffix in (("facts_", ".json"), ("text_", ".txt")):
+            if name.startswith(prefix) and name.endswith(suffix):
+                source_id = name[len(prefix):-len(suffix)]
+                if source_id not in active_ids:
+                    os.remove(os.path.join(output_dir, name))
+                    logging.info(f"Removed stale {name} (source file deleted or changed)")
+
+def process_candidate_sources(source_dir: str, output_dir: str, incremental: Optional[bool] = None,
+                              workers: Optional[int] = None):
     """
     Main entry point for Stage 1.
+
+    Facts are kept in the SQLite fact store (facts.db in output_dir) and the profile is
+    rendered from it. In incremental mode (default, disable with INGEST_INCREMENTAL=0) PDFs
+    whose hash already has facts in the store (or a facts_{source_id}.json) are not re-parsed
+    or re-sent to the LLM; only new or modified files cost an extraction call.
+
+    Remaining files are parsed and sent to the LLM concurrently, bounded by
+    `workers` (defaults to INGEST_WORKERS, 4).
     """
+    if incremental is None:
+        incremental = os.getenv("INGEST_INCREMENTAL", "1").strip().lower() not in ("0", "false", "no", "off")
+
     ensure_directory(output_dir)
-    source_files = [f for f in os.listdir(source_dir) if f.endswith(".pdf")] # Extend for docx later
-    
+
     # VALIDATION: Check if any files exist
     abs_source_dir = os.path.abspath(source_dir)
     logging.info(f"Searching for PDFs in: {abs_source_dir}")
-    source_files = [f for f in os.listdir(source_dir) if f.endswith(".pdf")]
+    source_files = sorted(f for f in os.listdir(source_dir) if f.endswith(".pdf")) # Extend for docx later
     
     if not source_files:
         logging.error(f"❌ No PDF files found in {abs_source_dir}")
@@ -216,31 +571,55 @@ def process_candidate_sources(source_dir: str, output_dir: str):
     
     logging.info(f"✓ Found {len(source_files)} PDF file(s): {source_files}")
     
-    all_facts = []
+    store = FactStore(os.path.join(output_dir, "facts.db"))
+    stored_ids = store.source_ids()
+    updated = {}  # source_id -> (filename, facts) to (re)write in the fact store
+    filenames = {}  # source_id -> filename for every source that ends up in the profile
+    pending = []
+    active_ids = set()
+    reused = 0
     
     for filename in source_files:
         filepath = os.path.join(source_dir, filename)
         source_id = calculate_file_hash(filepath)[:8] # Use short hash as ID
-        
-        # 1. Extract Text
-        raw_text = extract_text_from_pdf(filepath)
-        if not raw_text:
-            logging.error(f"Failed to extract text from {filename} or file is empty.")
+        if source_id in active_ids:
+            logging.info(f"Skipping {filename}: identical content already ingested (source_id: {source_id})")
             continue
+        active_ids.add(source_id)
+
+        if incremental:
+            stored_count = store.fact_count(source_id) if source_id in stored_ids else 0
+            if stored_count:
+                logging.info(f"↺ Reusing stored facts for {filename} (source_id: {source_id}, {stored_count} facts)")
+                filenames[source_id] = filename
+                reused += 1
+                continue
+            cached = load_cached_facts(output_dir, source_id)
+            if cached is not None:
+                logging.info(f"↺ Reusing cached facts for {filename} (source_id: {source_id}, {count_facts(cached)} facts)")
+                updated[source_id] = (filename, cached)
+                filenames[source_id] = filename
+                reused += 1
+                continue
         
-        if len(raw_text.strip()) < 50:
-            logging.warning(f"⚠ Very little text extracted from {filename} ({len(raw_text)} chars)")
-            logging.warning("This PDF may be a scanned image. OCR would be required.")
-            continue
-            
-        logging.info(f"✓ Extracted {len(raw_text)} chars from {filename}. Sample: {raw_text[:100]}...")
+        cached_text = load_cached_text(output_dir, source_id) if incremental else None
+        pending.append((filename, filepath, source_id, cached_text))
+
+    # 1. Extract Text and 2. Extract Facts (pipelined across files)
+    if pending:
+        if workers is None:
+            workers = int(os.getenv("INGEST_WORKERS", "4"))
+        extracted = run_extraction_pipeline(pending, output_dir, max(1, workers))
+    else:
+        extracted = {}
 
-        # 2. Extract Facts
-        facts = extract_facts_from_text(raw_text, source_id, filename)
+    for filename, filepath, source_id, _ in pending:
+        if filename not in extracted:
+            continue
+        facts, raw_text = extracted[filename]
         
         # VALIDATION: Check if any facts were extracted
-        total_facts = (len(facts.experiences) + len(facts.skills) + 
-                      len(facts.education) + len(facts.projects))
+        total_facts = count_facts(facts)
         
         if total_facts == 0:
             logging.warning(f"⚠ No facts extracted from {filename}!")
@@ -253,12 +632,23 @@ def process_candidate_sources(source_dir: str, output_dir: str):
             logging.info(f"  - {len(facts.education)} education entries")
             logging.info(f"  - {len(facts.projects)} projects")
         
-        all_facts.append(facts)
+        updated[source_id] = (filename, facts)
+        filenames[source_id] = filename
         
         # Save intermediate JSON for debugging/auditability
         json_path = os.path.join(output_dir, f"facts_{source_id}.json")
         with open(json_path, "w") as f:
             f.write(facts.model_dump_json(indent=2))
+
+    # One transaction: changed sources are replaced, deleted ones dropped, unchanged ones untouched.
+    # The store returns sources in filename order, so the merge is deterministic.
+    store.sync_sources(updated, filenames)
+    all_facts = store.load_facts()
+    store.close()
+
+    prune_stale_artifacts(output_dir, active_ids)
+    if incremental:
+        logging.info(f"Incremental ingestion: {reused} reused, {len(active_ids) - reused} processed")
             
     # 3. Merge and Save Markdown
     if not all_facts:
@@ -270,10 +660,7 @@ def process_candidate_sources(source_dir: str, output_dir: str):
         sys.exit(1)
     
     # Check if all facts are empty
-    total_all_facts = sum(
-        len(f.experiences) + len(f.skills) + len(f.education) + len(f.projects)
-        for f in all_facts
-    )
+    total_all_facts = sum(count_facts(f) for f in all_facts)
     
     if total_all_facts == 0:
         logging.error("❌ All extracted facts are empty!")
@@ -284,10 +671,14 @@ def process_candidate_sources(source_dir: str, output_dir: str):
     save_markdown_profile(all_facts, md_path)
     logging.info(f"✅ Generated profile at {md_path} with {total_all_facts} total facts")
 
-if __name__ == "__main__":
+def main(argv: Optional[List[str]] = None):
+    # No options; argv is accepted so the worker and pipeline can call every stage's main() alike
     # Use current working directory (important for packaged Electron app)
     BASE_DIR = os.getcwd()
     SOURCE_DIR = os.path.join(BASE_DIR, "sources", "candidate")
     OUTPUT_DIR = os.path.join(BASE_DIR, "data", "processed")
     
     process_candidate_sources(SOURCE_DIR, OUTPUT_DIR)
+
+if __name__ == "__main__":
+    run_entry_point(main)
@@ -9,10 +9,21 @@ import sys
 # Add project root to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import json
+import time
+import asyncio
 import logging
+import argparse
+from typing import List, Optional
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from execution.utils import get_llm, ensure_directory, invoke_with_retry
+from execution.utils import (
+    get_llm, ensure_directory, invoke_with_retry, ainvoke_with_retry, stream_with_retry, streaming_enabled,
+    gather_with_limit
+)
+from execution.pdf_text import extract_pdf_text
+from execution.web_fetch import fetch_page_text, fetch_pages
+from execution.profiling import run_entry_point, span
 
 # Configure logging to stdout
 logging.basicConfig(
@@ -21,53 +32,37 @@ logging.basicConfig(
     handlers=[logging.StreamHandler(sys.stdout)]
 )
 import re
-import trafilatura
-import requests
 
 # Force flush of stdout
 sys.stdout.reconfigure(line_buffering=True)
 print(">>> Vacancy Ingestion Script Early Heartbeat", flush=True)
 
+VACANCY_EXTENSIONS = (".txt", ".md", ".pdf")
+SKIPPED_DOMAINS = ["linkedin.com/in", "github.com/", "twitter.com", "facebook.com", "instagram.com"]
+URL_PATTERN = r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+(?::\d+)?[/\w\.-]*'
+
+def format_url_content(url: str, content: str) -> str:
+    return f"\n--- Content from {url} ---\n{content}\n" if content else ""
+
 def fetch_url_content(url: str) -> str:
-    """Fetches and extracts clean text from a URL with timeout."""
-    try:
-        logging.info(f"Fetching extra info from: {url}")
-        # Use requests with timeout to prevent hanging
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            content = trafilatura.extract(response.text)
-            if content:
-                return f"\n--- Content from {url} ---\n{content}\n"
-    except Exception as e:
-        logging.warning(f"Failed to fetch {url}: {e}")
-    return ""
+    """Fetches and extracts clean text from a URL (cached, see web_fetch.py)."""
+    return format_url_content(url, fetch_page_text(url, timeout=float(os.getenv("URL_FETCH_TIMEOUT", "5"))))
 
-def distill_vacancy(raw_text: str) -> str:
+def enrich_with_urls(raw_text: str) -> str:
     """
-    Transforms raw job description text into a structured Markdown profile.
-    
-    Args:
-        raw_text: The initial job description text.
-        
-    Returns:
-        markdown_profile: String containing structured Core Requirements and Nice-to-Haves.
+    Appends clean text fetched from (up to 3) URLs found in the job description.
+    The URLs are fetched concurrently within URL_FETCH_BUDGET seconds.
     """
-    # Detect URLs
-    url_pattern = r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+[/\w\.-]*'
-    urls = list(set(re.findall(url_pattern, raw_text)))
-    
-    extra_content = ""
+    # Detect URLs, keeping first-seen order so the enriched prompt is stable across runs
+    urls = list(dict.fromkeys(re.findall(URL_PATTERN, raw_text)))
     # Limit to first 3 URLs to avoid long delays
-    for url in urls[:3]:
-        # Avoid recursion or common social links if needed, but for now fetch all
-        if any(domain in url for domain in ["linkedin.com/in", "github.com/", "twitter.com", "facebook.com", "instagram.com"]):
-            continue
-        content = fetch_url_content(url)
-        if content:
-            extra_content += content
+    urls = [url for url in urls[:3] if not any(domain in url for domain in SKIPPED_DOMAINS)]
 
-    combined_text = raw_text + extra_content
-    
+    with span("extract"):
+        pages = fetch_pages(urls)
+    return raw_text + "".join(format_url_content(url, pages[url]) for url in urls if url in pages)
+
+def build_distill_chain():
     llm = get_llm(temperature=0.1)
     
     prompt = ChatPromptTemplate.from_messages([
@@ -97,11 +92,51 @@ Output Format (Markdown):
         ("human", "{text}")
     ])
     
-    chain = prompt | llm | StrOutputParser()
+    return prompt | llm | StrOutputParser()
+
+def distill_vacancy(raw_text: str) -> str:
+    """
+    Transforms raw job description text into a structured Markdown profile.
+    
+    Args:
+        raw_text: The initial job description text.
+        
+    Returns:
+        markdown_profile: String containing structured Core Requirements and Nice-to-Haves.
+    """
+    combined_text = enrich_with_urls(raw_text)
+    chain = build_distill_chain()
     
     logging.info("Distilling vacancy (expect delay if rate limited)...")
     return invoke_with_retry(chain, {"text": combined_text}, max_retries=10)
 
+def distill_vacancy_stream(raw_text: str, output_path: str) -> str:
+    """Streaming variant of distill_vacancy: the profile is written to output_path as it is generated."""
+    combined_text = enrich_with_urls(raw_text)
+    chain = build_distill_chain()
+    
+    logging.info("Distilling vacancy (streaming)...")
+    markdown_output = stream_with_retry(chain, {"text": combined_text}, output_path, max_retries=10)
+    print("", flush=True)  # Terminate the streamed block so following logs start on a new line
+    return markdown_output
+
+async def adistill_vacancy(raw_text: str) -> str:
+    """Async twin of distill_vacancy. URL enrichment runs in a worker thread."""
+    combined_text = await asyncio.to_thread(enrich_with_urls, raw_text)
+    chain = build_distill_chain()
+    
+    logging.info("Distilling vacancy (expect delay if rate limited)...")
+    return await ainvoke_with_retry(chain, {"text": combined_text}, max_retries=10)
+
+def read_vacancy_file(path: str) -> str:
+    """Reads a vacancy from a .txt/.md file or extracts the text of a .pdf."""
+    with span("extract"):
+        if path.endswith(".pdf"):
+            return extract_pdf_text(path)
+
+        with open(path, "r") as file:
+            return file.read()
+
 def process_vacancy(source_dir: str, output_path: str):
     ensure_directory(os.path.dirname(output_path))
     
@@ -114,18 +149,9 @@ def process_vacancy(source_dir: str, output_path: str):
         source_files.sort(key=lambda x: 0 if x.endswith('.txt') else 1)
 
         for f in source_files:
-            full_path = os.path.join(source_dir, f)
-            if f.endswith(".txt"):
-                with open(full_path, "r") as file:
-                    raw_text = file.read()
-                source_file_path = full_path
-                break
-            elif f.endswith(".pdf"):
-                import pdfplumber
-                with pdfplumber.open(full_path) as pdf:
-                    for page in pdf.pages:
-                        raw_text += (page.extract_text() or "") + "\n"
-                source_file_path = full_path
+            if f.endswith(".txt") or f.endswith(".pdf"):
+                source_file_path = os.path.join(source_dir, f)
+                raw_text = read_vacancy_file(source_file_path)
                 break
             
         if not raw_text.strip():
@@ -133,10 +159,12 @@ def process_vacancy(source_dir: str, output_path: str):
             return
 
         logging.info(f"Processing vacancy from {source_file_path}...")
-        markdown_output = distill_vacancy(raw_text)
-        
-        with open(output_path, "w") as f:
-            f.write(markdown_output)
+        if streaming_enabled():
+            distill_vacancy_stream(raw_text, output_path)
+        else:
+            markdown_output = distill_vacancy(raw_text)
+            with open(output_path, "w") as f:
+                f.write(markdown_output)
             
         logging.info(f"Vacancy processed to {output_path}")
             
@@ -144,10 +172,145 @@ def process_vacancy(source_dir: str, output_path: str):
         logging.error(f"Error processing vacancy: {e}")
         sys.exit(1)
 
-if __name__ == "__main__":
+def slugify(name: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_")
+    return slug or "vacancy"
+
+def load_vacancy_index(index_path: str) -> dict:
+    if not os.path.exists(index_path):
+        return {"vacancies": []}
+    with open(index_path, "r") as f:
+        return json.load(f)
+
+async def distill_vacancy_file(vacancy_id: str, raw_text: str, profile_path: str) -> dict:
+    """Distills one vacancy for bulk mode. Never raises; failures are recorded."""
+    start = time.perf_counter()
+    try:
+        markdown_output = await adistill_vacancy(raw_text)
+        with open(profile_path, "w") as f:
+            f.write(markdown_output)
+        logging.info(f"✓ {vacancy_id} distilled in {time.perf_counter() - start:.1f}s")
+        return {"status": "success", "profile_md": markdown_output}
+    except Exception as e:
+        logging.error(f"❌ {vacancy_id}: {e}")
+        return {"status": "error", "error": str(e)}
+
+def process_vacancies_bulk(source_dir: str, output_dir: str, concurrency: int = 4,
+                           ranking_index_dir: Optional[str] = None) -> dict:
+    """
+    Distills every vacancy file in source_dir concurrently into output_dir/<id>.md and records
+    them in output_dir/index.json. Files whose normalized content was already distilled (in an
+    earlier run, or as another file in this one) are skipped, so only new postings cost LLM calls.
+    New profiles are also added to the local ranking index in ranking_index_dir (see vacancy_index.py).
+    Entries none of whose sources still exist with the same content (deleted or edited files)
+    are dropped from the index, their profiles deleted and removed from the ranking index.
+    """
+    from execution.vacancy_index import VacancyIndex, content_hash, vacancy_title
+
+    ensure_directory(output_dir)
+    index_path = os.path.join(output_dir, "index.json")
+    index = load_vacancy_index(index_path)
+    by_hash = {entry["content_hash"]: entry for entry in index["vacancies"]
+               if os.path.exists(os.path.join(output_dir, entry["profile"]))}
+
+    source_files = sorted(f for f in os.listdir(source_dir) if f.endswith(VACANCY_EXTENSIONS))
+    scanned = []  # (name, raw_text, content_hash)
+    unreadable = set()
+    for name in source_files:
+        path = os.path.join(source_dir, name)
+        try:
+            raw_text = read_vacancy_file(path)
+        except Exception as e:
+            logging.error(f"❌ Could not read {name}: {e}")
+            unreadable.add(name)
+            continue
+        if not raw_text.strip():
+            logging.warning(f"Skipping {name}: empty file")
+            continue
+        scanned.append((name, raw_text, content_hash(raw_text)))
+
+    # Sources are rebuilt from this scan; an entry whose file can't be read this time is kept as is
+    current_sources = {}
+    for name, _, digest in scanned:
+        current_sources.setdefault(digest, []).append(name)
+    for digest, entry in list(by_hash.items()):
+        if digest in current_sources:
+            entry["sources"] = current_sources[digest]
+        elif not unreadable.intersection(entry["sources"]):
+            del by_hash[digest]
+    stale = [entry for entry in index["vacancies"] if by_hash.get(entry["content_hash"]) is not entry]
+    for entry in stale:
+        profile_path = os.path.join(output_dir, entry["profile"])
+        if os.path.exists(profile_path):
+            os.remove(profile_path)
+        logging.info(f"Removed {entry['id']} (source file deleted or changed)")
+    used_ids = {entry["id"] for entry in by_hash.values()}
+
+    pending = {}  # content_hash -> (vacancy_id, raw_text, [sources])
+    for name, raw_text, digest in scanned:
+        if digest in by_hash:
+            logging.info(f"↺ {name}: already distilled as {by_hash[digest]['id']}")
+        elif digest in pending:
+            pending[digest][2].append(name)
+            logging.info(f"↺ {name}: same content as {pending[digest][2][0]}")
+        else:
+            vacancy_id = slugify(os.path.splitext(name)[0])
+            while vacancy_id in used_ids:
+                vacancy_id += "_"
+            used_ids.add(vacancy_id)
+            pending[digest] = (vacancy_id, raw_text, [name])
+
+    logging.info(f"Distilling {len(pending)} new vacancies ({len(by_hash)} already distilled, concurrency={concurrency})...")
+    results = asyncio.run(gather_with_limit(
+        (distill_vacancy_file(vacancy_id, raw_text, os.path.join(output_dir, f"{vacancy_id}.md"))
+         for vacancy_id, raw_text, _ in pending.values()),
+        max_concurrency=concurrency
+    ))
+
+    ranking_index = VacancyIndex(ranking_index_dir) if ranking_index_dir and (pending or stale) else None
+    if ranking_index is not None:
+        for entry in stale:
+            ranking_index.remove(entry["id"], save=False)
+    failed = 0
+    for (digest, (vacancy_id, _, sources)), result in zip(pending.items(), results):
+        if result["status"] != "success":
+            failed += 1
+            continue
+        profile = f"{vacancy_id}.md"
+        by_hash[digest] = {"id": vacancy_id, "title": vacancy_title(result["profile_md"]), "profile": profile,
+                           "sources": sources, "content_hash": digest, "distilled_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        if ranking_index is not None:
+            ranking_index.add(vacancy_id, result["profile_md"], os.path.join(output_dir, profile), save=False)
+    if ranking_index is not None:
+        ranking_index.save()
+
+    index["vacancies"] = sorted(by_hash.values(), key=lambda entry: entry["id"])
+    with open(index_path, "w") as f:
+        json.dump(index, f, indent=2)
+    logging.info(f"✅ {len(pending) - failed} distilled, {failed} failed, {len(index['vacancies'])} total. Index: {index_path}")
+    return index
+
+def main(argv: Optional[List[str]] = None):
     # Use current working directory (important for packaged Electron app)
     BASE_DIR = os.getcwd()
     SOURCE_DIR = os.path.join(BASE_DIR, "sources", "vacancy")
     OUTPUT_FILE = os.path.join(BASE_DIR, "data", "processed", "vacancy_profile.md")
+
+    parser = argparse.ArgumentParser(description="Distill vacancy descriptions into profiles")
+    parser.add_argument("--bulk", action="store_true",
+                        help="Distill every file in the source folder into data/processed/vacancies/")
+    parser.add_argument("--source", default=SOURCE_DIR)
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("BATCH_CONCURRENCY", "4")))
+    args = parser.parse_args(argv)
+
+    if args.bulk:
+        index = process_vacancies_bulk(args.source, os.path.join(BASE_DIR, "data", "processed", "vacancies"),
+                                       max(1, args.concurrency), os.path.join(BASE_DIR, "data", "vacancy_index"))
+        if not index["vacancies"]:
+            sys.exit(1)
+        return
     
-    process_vacancy(SOURCE_DIR, OUTPUT_FILE)
+    process_vacancy(args.source, OUTPUT_FILE)
+
+if __name__ == "__main__":
+    run_entry_point(main)
@@ -0,0 +1,217 @@
+"""
+LLM Response Cache
+------------------
+Content-addressed, on-disk cache for LLM chain results. Entries are keyed by a
+SHA256 of the rendered prompt messages, model name, temperature and output
+parser, so re-running a stage on unchanged inputs skips the network entirely.
+
+Configuration (.env):
+- LLM_CACHE: "on" (default), "off" (no reads or writes) or "refresh"
+  (ignore existing entries but store fresh responses).
+- LLM_CACHE_DIR: cache location (defaults to data/cache/llm under the cwd).
+- LLM_CACHE_MAX_MB: total size budget before LRU eviction (default 200).
+- LLM_CACHE_MAX_AGE_DAYS: entries older than this are discarded (default 30).
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_MODES = ("on", "off", "refresh")
+# Eviction trims the cache to this fraction of its budget, so the next scan is many writes away
+EVICT_TARGET = 0.9
+
+
+def make_cache_key(payload: dict) -> str:
+    """Returns a stable SHA256 hex digest for a JSON-serializable request description."""
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Stores one JSON file per response under a two-level fan-out directory.
+    File mtimes double as LRU timestamps: every hit touches the entry, and
+    eviction removes the least recently used files first.
+
+    The directory is scanned on the first write and then only when a running size
+    estimate goes over budget, so writes don't pay for a walk of the whole cache.
+    Other processes sharing the directory make the estimate drift low; the rescan
+    on each eviction corrects it.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, max_age_seconds: float, mode: str = "on"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.mode = mode if mode in CACHE_MODES else "on"
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._size_estimate: Optional[int] = None  # Bytes on disk; None until the first scan
+        self._lock = threading.Lock()
+
+    @property
+    def readable(self) -> bool:
+        return self.mode == "on"
+
+    @property
+    def writable(self) -> bool:
+        return self.mode in ("on", "refresh")
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Returns (hit, value). Expired or unreadable entries count as misses."""
+        if not self.readable:
+            return False, None
+
+        path = self._path_for(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return False, None
+
+        if time.time() - entry.get("created", 0) > self.max_age_seconds:
+            self._remove(path)
+            with self._lock:
+                self.misses += 1
+            return False, None
+
+        try:
+            os.utime(path, None)  # Mark as recently used
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return True, entry.get("value")
+
+    def put(self, key: str, value: Any, meta: Optional[dict] = None):
+        """Stores a JSON-serializable value. Non-serializable values are skipped."""
+        if not self.writable:
+            return
+
+        try:
+            encoded = json.dumps({"key": key, "created": time.time(), "meta": meta or {}, "value": value},
+                                 ensure_ascii=False)
+        except (TypeError, ValueError):
+            logger.debug("Skipping cache write for non-serializable value")
+            return
+
+        path = self._path_for(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(encoded)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write LLM cache entry: {e}")
+            self._remove(tmp_path)
+            return
+
+        with self._lock:
+            self.writes += 1
+            if self._size_estimate is not None:
+                self._size_estimate += len(encoded.encode("utf-8")) - replaced
+            needs_eviction = self._size_estimate is None or self._size_estimate > self.max_bytes
+        if needs_eviction:
+            self.evict()
+
+    def evict(self):
+        """Drops expired entries, then (when over budget) least recently used ones down to EVICT_TARGET of it."""
+        entries = []
+        total = 0
+        now = time.time()
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if now - st.st_mtime > self.max_age_seconds:
+                    self._remove(path, evicted=True)
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+
+        if total > self.max_bytes:
+            target = self.max_bytes * EVICT_TARGET
+            entries.sort()
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                self._remove(path, evicted=True)
+                total -= size
+        with self._lock:
+            self._size_estimate = total
+
+    def clear(self):
+        """Removes every cached entry."""
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                self._remove(os.path.join(root, name))
+        with self._lock:
+            self._size_estimate = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "mode": self.mode,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+    def _remove(self, path: str, evicted: bool = False):
+        try:
+            os.remove(path)
+        except OSError:
+            return
+        if evicted:
+            with self._lock:
+                self.evictions += 1
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> LLMResponseCache:
+    """Returns the process-wide cache, configured from environment variables on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            directory = os.getenv("LLM_CACHE_DIR") or os.path.join(os.getcwd(), "data", "cache", "llm")
+            max_mb = float(os.getenv("LLM_CACHE_MAX_MB", "200"))
+            max_age_days = float(os.getenv("LLM_CACHE_MAX_AGE_DAYS", "30"))
+            mode = os.getenv("LLM_CACHE", "on").strip().lower()
+            _cache = LLMResponseCache(directory, int(max_mb * 1024 * 1024), max_age_days * 86400, mode)
+        return _cache
+
+
+def reset_response_cache():
+    """Forgets the process-wide cache so the next use re-reads its settings."""
+    global _cache
+    with _cache_lock:
+        _cache = None
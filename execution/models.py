@@ -3,6 +3,7 @@ from pydantic import BaseModel, Field
 
 class FactMetadata(BaseModel):
     source_file_id: str
+    source_file_ids: List[str] = Field(default_factory=list, description="Every source containing this fact, set when duplicates are merged")
     page_number: Optional[int] = None
     original_text: Optional[str] = None # For auditing
 
@@ -0,0 +1,89 @@
+"""
+PDF Text Extraction
+-------------------
+Shared page-streaming text extraction used by candidate and vacancy ingestion.
+
+Pages are extracted one at a time by a generator and each page's layout cache is
+released as soon as its text is read, so memory stays flat regardless of page count.
+The text is joined once at the end instead of growing a string page by page, with
+a form feed after every page so later stages can recover page numbers.
+Large PDFs are split into page ranges that a process pool extracts in parallel.
+
+Configuration (.env):
+- PDF_PAGES_PER_TASK: pages handled by one pool task (default 25). PDFs with no more
+  pages than this are extracted in-process.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+DEFAULT_PAGES_PER_TASK = 25
+# Form feed separates pages in extracted text (as pdftotext does), so page numbers survive joining
+PAGE_BREAK = "\f"
+
+
+def pages_per_task() -> int:
+    return max(1, int(os.getenv("PDF_PAGES_PER_TASK", str(DEFAULT_PAGES_PER_TASK))))
+
+
+def iter_page_text(pdf, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+    """Yields the text of pages [start, stop) of an open pdfplumber PDF, flushing each page's cache."""
+    pages = pdf.pages
+    for page in pages[start:stop]:
+        try:
+            yield page.extract_text() or ""
+        finally:
+            page.close()
+
+
+def join_pages(page_texts: Iterator[str]) -> str:
+    """One newline-terminated block per page, each followed by PAGE_BREAK (empty pages keep just the break)."""
+    return "".join(f"{text}\n{PAGE_BREAK}" if text else PAGE_BREAK for text in page_texts)
+
+
+def split_pages(text: str) -> List[str]:
+    """Inverse of join_pages: the text of each page, in order. Text without page breaks is one page."""
+    pages = text.split(PAGE_BREAK)
+    if len(pages) > 1 and not pages[-1].strip():
+        pages.pop()
+    return pages
+
+
+def extract_page_range(filepath: str, start: int, stop: Optional[int] = None) -> Tuple[str, int]:
+    """
+    Extracts pages [start, stop) of a PDF. Also a process-pool worker.
+
+    Returns:
+        (text, page_count): the joined text of the range and the document's total page count.
+    """
+    import pdfplumber
+
+    with pdfplumber.open(filepath) as pdf:
+        return join_pages(iter_page_text(pdf, start, stop)), len(pdf.pages)
+
+
+def page_ranges(total_pages: int, size: int, start: int = 0) -> List[Tuple[int, int]]:
+    return [(first, min(first + size, total_pages)) for first in range(start, total_pages, size)]
+
+
+def page_count(filepath: str) -> int:
+    import pdfplumber
+
+    with pdfplumber.open(filepath) as pdf:
+        return len(pdf.pages)
+
+
+def extract_pdf_text(filepath: str, workers: Optional[int] = None) -> str:
+    """
+    Extracts the full text of a PDF. Documents longer than one page range are split
+    and the ranges are extracted in parallel by a process pool, then joined in order.
+    """
+    ranges = page_ranges(page_count(filepath), pages_per_task())
+    workers = min(workers or os.cpu_count() or 1, len(ranges))
+    if workers <= 1:
+        return "".join(extract_page_range(filepath, start, stop)[0] for start, stop in ranges)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunks = pool.map(extract_page_range, [filepath] * len(ranges),
+                          [start for start, _ in ranges], [stop for _, stop in ranges])
+        return "".join(text for text, _ in chunks)
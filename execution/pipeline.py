@@ -0,0 +1,223 @@
+"""
+Pipeline Orchestrator
+---------------------
+Runs the four stages as a DAG in one process. Each stage declares the files it reads
+and writes; a stage depends on the stages that produce its inputs, and stages with no
+path between them run concurrently:
+
+    ingest_candidate ─┐                  ┌─ analyze_match
+                      ├─ (both profiles) ┤
+    ingest_vacancy  ──┘                  └─ generate_application
+
+Like make, a stage is skipped when the content hash of its inputs matches the last
+successful run and its outputs still exist. Hashes are recorded in
+data/processed/pipeline_state.json. Because hashes are taken over content rather than
+timestamps, an upstream stage that re-runs but writes an identical profile does not
+trigger its dependents. A failed stage blocks only its dependents. With GENERATION_MODE=combined,
+generation also writes the analysis report and analyze_match is dropped from the graph.
+
+Usage:
+    python execution/pipeline.py
+    python execution/pipeline.py --force                          # ignore recorded hashes
+    python execution/pipeline.py --stages ingest_vacancy analyze_match
+"""
+import os
+import sys
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import time
+import hashlib
+import logging
+import argparse
+import importlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Set
+
+from execution.profiling import profile_stage, run_entry_point
+
+# Configure logging to stdout
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+CANDIDATE_PROFILE = os.path.join("data", "processed", "candidate_profile.md")
+VACANCY_PROFILE = os.path.join("data", "processed", "vacancy_profile.md")
+STATE_FILE = os.path.join("data", "processed", "pipeline_state.json")
+
+class Stage:
+    """A pipeline step: a stage module's main() plus the paths (relative to the cwd) it reads and writes."""
+
+    def __init__(self, name: str, module: str, inputs: List[str], outputs: List[str]):
+        self.name = name
+        self.module = module
+        self.inputs = inputs
+        self.outputs = outputs
+
+STAGES = [
+    Stage("ingest_candidate", "execution.ingest_candidate",
+          inputs=[os.path.join("sources", "candidate")], outputs=[CANDIDATE_PROFILE]),
+    Stage("ingest_vacancy", "execution.ingest_vacancy",
+          inputs=[os.path.join("sources", "vacancy")], outputs=[VACANCY_PROFILE]),
+    Stage("analyze_match", "execution.analyze_match",
+          inputs=[CANDIDATE_PROFILE, VACANCY_PROFILE],
+          outputs=[os.path.join("data", "processed", "analysis_report.md")]),
+    Stage("generate_application", "execution.generate_application",
+          inputs=[CANDIDATE_PROFILE, VACANCY_PROFILE],
+          outputs=[os.path.join("output", "Tailored_Resume.docx"), os.path.join("output", "Tailored_CoverLetter.docx")]),
+]
+
+def pipeline_stages() -> List[Stage]:
+    """STAGES, adjusted for GENERATION_MODE=combined, where generation also writes the analysis report."""
+    from execution.utils import combined_mode_enabled
+
+    if not combined_mode_enabled():
+        return STAGES
+    analysis = next(stage for stage in STAGES if stage.name == "analyze_match")
+    return [Stage(stage.name, stage.module, stage.inputs, stage.outputs + analysis.outputs)
+            if stage.name == "generate_application" else stage
+            for stage in STAGES if stage is not analysis]
+
+def dependencies(stages: List[Stage]) -> Dict[str, Set[str]]:
+    """{stage: stages producing one of its inputs}."""
+    producers = {output: stage.name for stage in stages for output in stage.outputs}
+    return {stage.name: {producers[path] for path in stage.inputs if path in producers} for stage in stages}
+
+def hash_file(path: str, digest):
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+
+def hash_inputs(stage: Stage, base_dir: str) -> str:
+    """Content hash over every input file (directories are walked in sorted order; hidden files are ignored)."""
+    digest = hashlib.sha256(stage.name.encode("utf-8"))
+    for relative in stage.inputs:
+        path = os.path.join(base_dir, relative)
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+                for name in sorted(f for f in files if not f.startswith(".")):
+                    file_path = os.path.join(root, name)
+                    digest.update(f"\0{os.path.relpath(file_path, base_dir)}\0".encode("utf-8"))
+                    hash_file(file_path, digest)
+        elif os.path.exists(path):
+            digest.update(f"\0{relative}\0".encode("utf-8"))
+            hash_file(path, digest)
+        else:
+            digest.update(f"\0{relative}\0missing".encode("utf-8"))
+    return digest.hexdigest()
+
+def outputs_exist(stage: Stage, base_dir: str) -> bool:
+    return all(os.path.exists(os.path.join(base_dir, path)) for path in stage.outputs)
+
+def load_state(base_dir: str) -> dict:
+    try:
+        with open(os.path.join(base_dir, STATE_FILE), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_state(base_dir: str, state: dict):
+    path = os.path.join(base_dir, STATE_FILE)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+def run_stage(stage: Stage, base_dir: str) -> float:
+    """
+    Runs a stage's main() in-process with an empty argv (stages never see the orchestrator's
+    options). sys.exit() or missing outputs are reported as a failure.
+    """
+    module = importlib.import_module(stage.module)
+    start = time.perf_counter()
+    try:
+        with profile_stage(stage.name):
+            module.main([])
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            raise RuntimeError(f"{stage.name} exited with status {e.code}")
+    if not outputs_exist(stage, base_dir):
+        raise RuntimeError(f"{stage.name} did not produce {', '.join(stage.outputs)}")
+    return time.perf_counter() - start
+
+def run_pipeline(base_dir: str, stages: Optional[List[Stage]] = None, force: bool = False,
+                 selected: Optional[Set[str]] = None) -> Dict[str, dict]:
+    """
+    Runs `stages` (default: pipeline_stages()), or only the `selected` names (the others
+    are treated as up to date), each as soon as its dependencies are done. Returns
+    {stage: record} with a status of "ran", "skipped", "failed" or "blocked" and the
+    elapsed seconds.
+    """
+    stages = stages or pipeline_stages()
+    deps = dependencies(stages)
+    by_name = {stage.name: stage for stage in stages}
+    state = load_state(base_dir)
+    records: Dict[str, dict] = {}
+    pending = [stage.name for stage in stages]
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=len(stages)) as pool:
+        while pending or running:
+            for name in list(pending):
+                if any(records.get(dep, {}).get("status") in ("failed", "blocked") for dep in deps[name]):
+                    records[name] = {"status": "blocked", "elapsed": 0.0}
+                    pending.remove(name)
+                    logging.warning(f"⏭ {name}: blocked by a failed dependency")
+                elif all(dep in records for dep in deps[name]):
+                    pending.remove(name)
+                    stage = by_name[name]
+                    input_hash = hash_inputs(stage, base_dir)
+                    up_to_date = (state.get(name, {}).get("inputs") == input_hash
+                                  and outputs_exist(stage, base_dir))
+                    if (selected is not None and name not in selected) or (up_to_date and not force):
+                        records[name] = {"status": "skipped", "elapsed": 0.0}
+                        logging.info(f"⏭ {name}: inputs unchanged, skipping")
+                        continue
+                    logging.info(f"▶ {name}")
+                    running[pool.submit(run_stage, stage, base_dir)] = (name, input_hash)
+
+            if not running:
+                # Only reachable if the graph has a cycle
+                for name in pending:
+                    records[name] = {"status": "blocked", "elapsed": 0.0}
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, input_hash = running.pop(future)
+                try:
+                    elapsed = future.result()
+                except BaseException as e:
+                    records[name] = {"status": "failed", "elapsed": 0.0, "error": str(e)}
+                    logging.error(f"❌ {name} failed: {e}")
+                    continue
+                records[name] = {"status": "ran", "elapsed": round(elapsed, 3)}
+                state[name] = {"inputs": input_hash, "completed_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+                save_state(base_dir, state)
+                logging.info(f"✓ {name} in {elapsed:.1f}s")
+    return {stage.name: records[stage.name] for stage in stages}
+
+def main(argv: Optional[List[str]] = None):
+    BASE_DIR = os.getcwd()
+    parser = argparse.ArgumentParser(description="Run the pipeline stages as a DAG, skipping unchanged ones")
+    parser.add_argument("--force", action="store_true", help="Run every stage even if its inputs are unchanged")
+    parser.add_argument("--stages", nargs="+", choices=[stage.name for stage in STAGES],
+                        help="Run only these stages (the rest are treated as up to date)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    records = run_pipeline(BASE_DIR, force=args.force, selected=set(args.stages) if args.stages else None)
+    wall = time.perf_counter() - start
+
+    summary = ", ".join(f"{name} {record['status']}" + (f" ({record['elapsed']:.1f}s)" if record["status"] == "ran" else "")
+                        for name, record in records.items())
+    logging.info(f"Pipeline finished in {wall:.1f}s: {summary}")
+    if any(record["status"] in ("failed", "blocked") for record in records.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    run_entry_point(main)
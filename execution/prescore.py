@@ -0,0 +1,143 @@
+"""
+Local Match Pre-Score
+---------------------
+Deterministic, millisecond-scale estimate of how well a candidate covers a
+vacancy, computed without any LLM call. Requirements come from the vacancy's
+`## Core Requirements` and `## Preferred Qualifications` sections; evidence comes
+from the candidate's `## Skills` and `## Experience` sections.
+
+Each requirement is matched two ways, both vectorized with NumPy:
+- key-term coverage: share of the requirement's bold key phrase found in the candidate's terms;
+- TF-IDF cosine similarity against the best-matching candidate entry.
+
+The score weights core requirements over preferred ones and is used as an optional
+gate (PRESCORE_MIN in .env) that skips LLM analysis and generation for weak matches.
+"""
+import os
+import re
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from execution.fact_retrieval import parse_markdown_sections, tokenize
+
+if TYPE_CHECKING:
+    import numpy as np  # Imported when scoring, so stage startup doesn't load NumPy
+
+CORE_WEIGHT = 0.8
+PREFERRED_WEIGHT = 0.2
+# Cosine similarity at which a requirement counts as fully evidenced
+SIMILARITY_SATURATION = 0.5
+
+BOLD_PATTERN = re.compile(r"\*\*(.+?)\*\*")
+
+
+class MatchPreScore(BaseModel):
+    score: float
+    core_coverage: float
+    preferred_coverage: Optional[float] = None
+    matched: List[str] = []
+    missing: List[str] = []
+
+
+def section_entries(markdown: str, prefix: str) -> List[str]:
+    return [entry for heading, entries in parse_markdown_sections(markdown)
+            if heading.startswith(prefix) for entry in entries]
+
+
+def requirement_key(requirement: str) -> str:
+    """The bold `**Skill/Tech**` label of a requirement bullet, or the whole bullet."""
+    match = BOLD_PATTERN.search(requirement)
+    return match.group(1) if match else requirement.lstrip("- ")
+
+
+def requirement_matches(requirements: List[str], evidence: List[str]) -> "np.ndarray":
+    """Per-requirement match strength in [0, 1]."""
+    import numpy as np
+
+    if not requirements:
+        return np.zeros(0)
+    if not evidence:
+        return np.zeros(len(requirements))
+
+    req_tokens = [tokenize(r) for r in requirements]
+    key_tokens = [tokenize(requirement_key(r)) for r in requirements]
+    ev_tokens = [tokenize(e) for e in evidence]
+
+    vocab = {term: i for i, term in enumerate(sorted({t for doc in req_tokens + key_tokens + ev_tokens for t in doc}))}
+
+    def term_matrix(docs: List[List[str]]) -> np.ndarray:
+        matrix = np.zeros((len(docs), len(vocab)), dtype=np.float64)
+        for row, doc in enumerate(docs):
+            for term in doc:
+                matrix[row, vocab[term]] += 1
+        return matrix
+
+    R, K, C = term_matrix(req_tokens), term_matrix(key_tokens), term_matrix(ev_tokens)
+
+    # Key-term coverage against everything the candidate mentions
+    present = (C.sum(axis=0) > 0).astype(np.float64)
+    key_terms = (K > 0).astype(np.float64)
+    key_counts = key_terms.sum(axis=1)
+    coverage = np.divide(key_terms @ present, key_counts, out=np.zeros(len(requirements)), where=key_counts > 0)
+
+    # TF-IDF cosine similarity against the closest candidate entry
+    df = np.count_nonzero(np.vstack([R, C]), axis=0)
+    idf = np.log((1 + len(requirements) + len(evidence)) / (1 + df)) + 1
+    R_w = np.log1p(R) * idf
+    C_w = np.log1p(C) * idf
+    R_w /= np.linalg.norm(R_w, axis=1, keepdims=True) + 1e-12
+    C_w /= np.linalg.norm(C_w, axis=1, keepdims=True) + 1e-12
+    similarity = (R_w @ C_w.T).max(axis=1)
+
+    return np.maximum(coverage, np.minimum(1.0, similarity / SIMILARITY_SATURATION))
+
+
+def prescore_match(candidate_md: str, vacancy_md: str) -> MatchPreScore:
+    """Scores a candidate profile against a vacancy profile on a 0-100 scale."""
+    core = section_entries(vacancy_md, "Core Requirements")
+    preferred = section_entries(vacancy_md, "Preferred Qualifications")
+    evidence = section_entries(candidate_md, "Skills") + section_entries(candidate_md, "Experience")
+
+    matches = requirement_matches(core + preferred, evidence)
+    core_matches, preferred_matches = matches[:len(core)], matches[len(core):]
+
+    core_coverage = float(core_matches.mean()) if len(core) else 0.0
+    preferred_coverage = float(preferred_matches.mean()) if len(preferred) else None
+    if preferred_coverage is None:
+        score = core_coverage
+    else:
+        score = CORE_WEIGHT * core_coverage + PREFERRED_WEIGHT * preferred_coverage
+
+    labels = [requirement_key(r) for r in core + preferred]
+    return MatchPreScore(
+        score=round(100 * score, 1),
+        core_coverage=round(core_coverage, 3),
+        preferred_coverage=round(preferred_coverage, 3) if preferred_coverage is not None else None,
+        matched=[label for label, m in zip(labels, matches) if m >= 0.5],
+        missing=[label for label, m in zip(labels, matches) if m < 0.5],
+    )
+
+
+def prescore_gate(candidate_md: str, vacancy_md: str) -> Tuple[Optional[MatchPreScore], bool]:
+    """
+    Returns (prescore, passed). The pre-score is opt-in: without PRESCORE_MIN nothing
+    is scored and this returns (None, True). Otherwise `passed` is False when the
+    local score falls below the threshold.
+    """
+    threshold = os.getenv("PRESCORE_MIN")
+    if not threshold:
+        return None, True
+    result = prescore_match(candidate_md, vacancy_md)
+    return result, result.score >= float(threshold)
+
+
+def render_prescore_report(result: MatchPreScore) -> str:
+    """Markdown report in the analysis_report.md layout, used when the LLM analysis is skipped."""
+    lines = [f"# Match Analysis: {result.score:.0f}/100", "",
+             "_Local pre-score only: below the PRESCORE_MIN threshold, so the LLM analysis was skipped._", "",
+             "## 💎 Strong Matches"]
+    lines += [f"- {label}" for label in result.matched] or ["- None found"]
+    lines += ["", "## ⚠️ Potential Gaps / Weaknesses"]
+    lines += [f"- {label}" for label in result.missing] or ["- None found"]
+    return "\n".join(lines) + "\n"
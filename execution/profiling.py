@@ -0,0 +1,248 @@
+"""
+Stage Profiling
+---------------
+Opt-in profiling for the execution scripts, for finding out where a slow run went
+(pdfplumber, imports, waiting on the LLM, python-docx...). Enabled with
+STAGE_PROFILE=on or by passing --profile to any execution/*.py script. Worker requests
+can also set "profile": true in their params. Each profiled run captures:
+
+- cProfile stats for the stage's thread, plus any threads that run a stage inside it
+  (pipeline stages). Pool workers that are not stages are not profiled, but their
+  phase spans are still counted.
+- tracemalloc peak and the largest allocation sites still alive at the end of the run.
+- Wall-clock spans for named phases, summed per name across threads:
+  extract (PDF/vacancy text), llm (request time, including retries), llm_wait
+  (rate-limit queue and 429 backoff), parse (LLM output to models), render (profile
+  Markdown and DOCX files).
+
+Results are written to data/profiles/<stage>-<timestamp>.prof (load with
+`python -m pstats` or snakeviz) and a .json summary next to it. A compact summary
+is logged, so it shows up in the app's log stream.
+
+Configuration (.env):
+- STAGE_PROFILE: "on" to profile every stage run (default "off").
+- STAGE_PROFILE_DIR: output directory (defaults to data/profiles under the cwd).
+- STAGE_PROFILE_TOP: functions and allocation sites kept in the summary (default 15).
+"""
+import os
+import sys
+import json
+import time
+import logging
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+TRACE_FRAMES = 5
+
+_session_lock = threading.Lock()
+_session = None
+
+
+def profiling_enabled() -> bool:
+    return os.getenv("STAGE_PROFILE", "off").strip().lower() in ("1", "on", "true", "yes")
+
+
+def profile_dir() -> str:
+    return os.getenv("STAGE_PROFILE_DIR") or os.path.join(os.getcwd(), "data", "profiles")
+
+
+def top_count() -> int:
+    try:
+        return max(1, int(os.getenv("STAGE_PROFILE_TOP", "15")))
+    except ValueError:
+        return 15
+
+
+class ProfileSession:
+    """Phase spans and per-thread profilers collected during one profiled run."""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.spans: Dict[str, List[float]] = {}  # name -> [count, total_s, max_s]
+        self.profilers = []
+        self.threads = set()
+        self.stats = None
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            entry = self.spans.setdefault(name, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+
+def record_span(name: str, seconds: float):
+    """Adds an already-measured duration to the active session (no-op when not profiling)."""
+    session = _session
+    if session is not None:
+        session.record(name, seconds)
+
+
+@contextmanager
+def span(name: str):
+    """Times the block as phase `name` when a profiled run is active."""
+    if _session is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - start)
+
+
+@contextmanager
+def profile_stage(stage: str, enabled: Optional[bool] = None):
+    """
+    Profiles the block as `stage` (enabled defaults to STAGE_PROFILE, or on inside an
+    active session). Inside an active session, such as a pipeline stage running on its
+    own thread, the block becomes a "stage:<name>" span and its thread's calls are
+    added to the outer profile.
+    """
+    global _session
+    if enabled is None:
+        enabled = profiling_enabled() or _session is not None
+    if not enabled:
+        yield None
+        return
+
+    import cProfile
+
+    with _session_lock:
+        owner = _session is None
+        if owner:
+            _session = ProfileSession(stage)
+        session = _session
+    thread = threading.get_ident()
+    profiler = None
+    if thread not in session.threads:
+        # One profiler per thread; a nested stage on the same thread is already covered
+        session.threads.add(thread)
+        profiler = cProfile.Profile()
+
+    started_tracing = owner and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(TRACE_FRAMES)
+    elif owner:
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield session
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            session.threads.discard(thread)
+            session.profilers.append(profiler)
+        wall = time.perf_counter() - start
+        if not owner:
+            session.record(f"stage:{stage}", wall)
+        else:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+            with _session_lock:
+                _session = None
+            try:
+                report = build_report(session, wall, peak, snapshot)
+                prof_path = write_report(session, report)
+                # Stage scripts log to stdout (the app's log stream); the benchmarks only print
+                emit = logging.info if logging.getLogger().handlers else print
+                for line in format_report(report, prof_path):
+                    emit(line)
+            except Exception as e:
+                # Profiling must never fail the stage it observes
+                logging.warning(f"Could not write profile for {stage}: {e}")
+
+
+def short_path(filename: str) -> str:
+    return "/".join(filename.replace("\\", "/").split("/")[-2:])
+
+
+def function_label(func: tuple) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name  # Built-in, e.g. <method 'acquire' of '_thread.lock' objects>
+    return f"{short_path(filename)}:{line}({name})"
+
+
+def function_rows(stats, column: int, limit: int) -> List[dict]:
+    """Top `limit` functions by tottime (column 2) or cumtime (column 3)."""
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][column], reverse=True)[:limit]
+    return [{"function": function_label(func), "calls": calls, "tottime_s": round(tottime, 4),
+             "cumtime_s": round(cumtime, 4)} for func, (_, calls, tottime, cumtime, _) in rows]
+
+
+def build_report(session: ProfileSession, wall: float, peak: int, snapshot) -> dict:
+    import pstats
+
+    top = top_count()
+    if session.profilers:
+        session.stats = pstats.Stats(session.profilers[0])
+        for profiler in session.profilers[1:]:
+            session.stats.add(profiler)
+
+    allocations = []
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+    for stat in snapshot.statistics("lineno")[:top]:
+        frame = stat.traceback[0]
+        allocations.append({"site": f"{short_path(frame.filename)}:{frame.lineno}",
+                            "size_kb": round(stat.size / 1024, 1), "count": stat.count})
+
+    return {
+        "stage": session.stage,
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(time.time() - wall)),
+        "wall_s": round(wall, 3),
+        "peak_mb": round(peak / (1024 * 1024), 2),
+        "spans": {name: {"count": count, "total_s": round(total, 3), "max_s": round(longest, 3)}
+                  for name, (count, total, longest) in sorted(session.spans.items())},
+        "cumulative": function_rows(session.stats, 3, top) if session.stats else [],
+        "self_time": function_rows(session.stats, 2, top) if session.stats else [],
+        "allocations": allocations,
+        "pid": os.getpid(),
+    }
+
+
+def write_report(session: ProfileSession, report: dict) -> str:
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, f"{session.stage}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}")
+    if session.stats is not None:
+        session.stats.dump_stats(base + ".prof")
+    with open(base + ".json", "w") as f:
+        json.dump(report, f, indent=2)
+    return base
+
+
+def format_report(report: dict, base: str) -> List[str]:
+    lines = [f"⏱ Profile {report['stage']}: {report['wall_s']:.2f}s wall, peak {report['peak_mb']:.1f} MB traced"]
+    if report["spans"]:
+        lines.append("⏱   phases: " + ", ".join(f"{name} {span['total_s']:.2f}s ×{span['count']}"
+                                                for name, span in report["spans"].items()))
+    if report["self_time"]:
+        lines.append("⏱   most self time: " + ", ".join(f"{entry['function']} {entry['tottime_s']:.2f}s"
+                                                        for entry in report["self_time"][:3]))
+    if report["allocations"]:
+        lines.append("⏱   largest allocations: " + ", ".join(f"{entry['site']} {entry['size_kb']:.0f} KB"
+                                                             for entry in report["allocations"][:3]))
+    lines.append(f"⏱   written to {base}.prof / .json")
+    return lines
+
+
+def run_entry_point(main: Callable, stage: Optional[str] = None):
+    """
+    Runs a script's main(), profiled when STAGE_PROFILE is on or --profile is on the
+    command line (the flag is removed before main() parses its arguments).
+    """
+    enabled = profiling_enabled()
+    if "--profile" in sys.argv[1:]:
+        sys.argv.remove("--profile")
+        enabled = True
+    stage = stage or os.path.splitext(os.path.basename(sys.argv[0]))[0]
+    with profile_stage(stage, enabled):
+        main()
@@ -0,0 +1,204 @@
+"""
+Client-side Rate Limiter
+------------------------
+Token-bucket limiter for LLM calls with per-provider requests-per-minute and
+tokens-per-minute budgets. Bucket state lives in a small JSON file guarded by
+an OS file lock, so threads in one stage and separate stage processes all draw
+from the same budget and wait just long enough instead of colliding on 429s.
+
+Configuration (.env):
+- LLM_RATE_LIMIT: "on" (default) or "off".
+- GEMINI_RPM / GEMINI_TPM, OPENAI_RPM / OPENAI_TPM: per-provider budgets.
+- LLM_EXPECTED_COMPLETION_TOKENS: output allowance added to each estimate (default 1000).
+- LLM_RATE_LIMIT_DIR: where bucket state is shared (defaults to data/cache/ratelimit).
+"""
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Conservative defaults matching entry-level quotas; override via .env for paid tiers.
+DEFAULT_LIMITS = {
+    "gemini": (15, 1_000_000),
+    "openai": (500, 200_000),
+}
+
+_encoding = None
+_encoding_lock = threading.Lock()
+
+
+def estimate_tokens(texts: Iterable[str]) -> int:
+    """Counts tokens with tiktoken (cl100k_base), falling back to ~4 chars per token."""
+    global _encoding
+    texts = [t for t in texts if t]
+    with _encoding_lock:
+        if _encoding is None:
+            try:
+                import tiktoken
+                _encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception:
+                _encoding = False
+    if _encoding:
+        return sum(len(_encoding.encode(t, disallowed_special=())) for t in texts)
+    return sum(len(t) for t in texts) // 4
+
+
+def provider_for_model(model_name: Optional[str]) -> Optional[str]:
+    """Quota bucket for a model; None for the offline fake model (fake, fake:*), which has no quota."""
+    if model_name and (model_name == "fake" or model_name.startswith("fake:")):
+        return None
+    return "gemini" if model_name and "gemini" in model_name.lower() else "openai"
+
+
+@contextmanager
+def _file_lock(path: str):
+    """Exclusive advisory lock on `path`, usable across processes."""
+    with open(path, "a+") as handle:
+        if os.name == "nt":
+            import msvcrt
+            handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.01)
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+class RateLimiter:
+    """
+    Two token buckets (requests and tokens) for one provider. Each bucket refills
+    continuously at its per-minute rate and holds at most one minute of budget.
+    """
+
+    def __init__(self, provider: str, rpm: float, tpm: float, state_dir: str):
+        self.provider = provider
+        self.rpm = rpm
+        self.tpm = tpm
+        self.state_path = os.path.join(state_dir, f"{provider}.json")
+        self.lock_path = os.path.join(state_dir, f"{provider}.lock")
+        self._thread_lock = threading.Lock()
+        os.makedirs(state_dir, exist_ok=True)
+
+    def _load(self, now: float) -> Dict[str, float]:
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {"requests": self.rpm, "tokens": self.tpm, "updated": now}
+
+        elapsed = max(0.0, now - state.get("updated", now))
+        state["requests"] = min(self.rpm, state.get("requests", self.rpm) + elapsed * self.rpm / 60)
+        state["tokens"] = min(self.tpm, state.get("tokens", self.tpm) + elapsed * self.tpm / 60)
+        state["updated"] = now
+        return state
+
+    def _save(self, state: Dict[str, float]):
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def try_acquire(self, tokens: int) -> float:
+        """
+        Reserves one request and `tokens` tokens if available.
+        Returns 0 on success, otherwise the seconds to wait before trying again.
+        """
+        tokens = min(tokens, self.tpm)  # A single oversized call must still be admitted eventually
+        with self._thread_lock, _file_lock(self.lock_path):
+            now = time.time()
+            state = self._load(now)
+            if state["requests"] >= 1 and state["tokens"] >= tokens:
+                state["requests"] -= 1
+                state["tokens"] -= tokens
+                self._save(state)
+                return 0.0
+            self._save(state)
+
+        wait_requests = max(0.0, 1 - state["requests"]) * 60 / self.rpm
+        wait_tokens = max(0.0, tokens - state["tokens"]) * 60 / self.tpm
+        return max(wait_requests, wait_tokens, 0.05)
+
+    def acquire(self, tokens: int) -> float:
+        """Blocks until the call fits the budget. Returns the total time waited."""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(tokens)
+            if not wait:
+                return waited
+            if not waited:
+                print(f"⏳ Pacing {self.provider} request ({tokens} est. tokens), waiting {wait:.1f}s", flush=True)
+            time.sleep(wait)
+            waited += wait
+
+    async def aacquire(self, tokens: int) -> float:
+        """Async twin of acquire."""
+        waited = 0.0
+        while True:
+            wait = await asyncio.to_thread(self.try_acquire, tokens)
+            if not wait:
+                return waited
+            if not waited:
+                print(f"⏳ Pacing {self.provider} request ({tokens} est. tokens), waiting {wait:.1f}s", flush=True)
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def drain(self):
+        """
+        Empties the request bucket after the provider reported a 429, so every
+        worker pauses for a refill instead of retrying into the same quota.
+        """
+        with self._thread_lock, _file_lock(self.lock_path):
+            state = self._load(time.time())
+            state["requests"] = 0.0
+            self._save(state)
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(model_name: Optional[str]) -> Optional[RateLimiter]:
+    """Returns the shared limiter for the model's provider, or None when limiting is off or doesn't apply."""
+    if os.getenv("LLM_RATE_LIMIT", "on").strip().lower() in ("0", "off", "false", "no"):
+        return None
+
+    provider = provider_for_model(model_name)
+    if provider is None:
+        return None
+    with _limiters_lock:
+        if provider not in _limiters:
+            default_rpm, default_tpm = DEFAULT_LIMITS[provider]
+            rpm = float(os.getenv(f"{provider.upper()}_RPM", default_rpm))
+            tpm = float(os.getenv(f"{provider.upper()}_TPM", default_tpm))
+            state_dir = os.getenv("LLM_RATE_LIMIT_DIR") or os.path.join(os.getcwd(), "data", "cache", "ratelimit")
+            _limiters[provider] = RateLimiter(provider, rpm, tpm, state_dir)
+        return _limiters[provider]
+
+
+def reset_rate_limiters():
+    """Forgets the shared limiters so the next call re-reads the RPM/TPM settings (state files are kept)."""
+    with _limiters_lock:
+        _limiters.clear()
+
+
+def expected_completion_tokens() -> int:
+    return int(os.getenv("LLM_EXPECTED_COMPLETION_TOKENS", "1000"))
@@ -0,0 +1,306 @@
+"""
+LLM Call Telemetry
+------------------
+Records one JSON line per LLM chain invocation made through invoke_with_retry,
+ainvoke_with_retry or stream_with_retry:
+
+    {"ts": ..., "stage": "generate_resume_content", "model": "gpt-4o-mini", "status": "ok",
+     "prompt_tokens": 5210, "completion_tokens": 812, "token_source": "provider",
+     "queue_s": 0.0, "backoff_s": 0.0, "latency_s": 6.41, "total_s": 6.44, "retries": 0,
+     "cost_usd": 0.00127}
+
+- stage: the calling function (async twins are folded onto their sync name) unless
+  given explicitly.
+- prompt/completion tokens: provider usage metadata when the response carries it,
+  otherwise counted with tiktoken, otherwise estimated at ~4 characters per token.
+- queue_s: time spent waiting on the rate limiter; backoff_s: time slept after 429s;
+  latency_s: duration of the request that produced the result; total_s: end to end.
+- cost_usd: from the per-1M-token price table below (None for unknown models).
+- status: "ok", "cached" (served from the response cache) or "error".
+
+Summary:
+    python execution/telemetry.py                       # p50/p95 per stage
+    python execution/telemetry.py --by model --since 24
+
+Configuration (.env):
+- LLM_TELEMETRY: "on" (default) or "off".
+- LLM_TELEMETRY_FILE: JSONL path (defaults to data/telemetry/llm_calls.jsonl under the cwd).
+- LLM_PRICES: JSON object overriding/adding prices, e.g. {"gpt-4o-mini": [0.15, 0.60]}
+  (USD per 1M input and output tokens; model names match by prefix).
+"""
+import os
+import sys
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import time
+import argparse
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from execution.profiling import record_span, run_entry_point
+
+# USD per 1M (input, output) tokens; the longest matching prefix wins
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-pro": (1.25, 10.00),
+    "gemini-2.0-flash": (0.10, 0.40),
+    "gemini-1.5-flash": (0.075, 0.30),
+}
+
+_write_lock = threading.Lock()
+
+
+def telemetry_enabled() -> bool:
+    return os.getenv("LLM_TELEMETRY", "on").strip().lower() not in ("0", "off", "false", "no")
+
+
+def telemetry_path() -> str:
+    return os.getenv("LLM_TELEMETRY_FILE") or os.path.join(os.getcwd(), "data", "telemetry", "llm_calls.jsonl")
+
+
+def price_table() -> Dict[str, Tuple[float, float]]:
+    prices = dict(MODEL_PRICES)
+    overrides = os.getenv("LLM_PRICES")
+    if overrides:
+        try:
+            prices.update({model: tuple(value) for model, value in json.loads(overrides).items()})
+        except (ValueError, TypeError):
+            pass
+    return prices
+
+
+def estimate_cost(model: Optional[str], prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    if not model:
+        return None
+    prices = price_table()
+    match = max((name for name in prices if model.startswith(name)), key=len, default=None)
+    if match is None:
+        return None
+    input_price, output_price = prices[match]
+    return round((prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000, 6)
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: Optional[str]):
+    """tiktoken encoding for `model`, or None if tiktoken or its data is unavailable (e.g. offline)."""
+    try:
+        import tiktoken
+        try:
+            return tiktoken.encoding_for_model(model or "")
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(texts: List[str], model: Optional[str]) -> Tuple[int, str]:
+    """(tokens, source) counted with tiktoken, falling back to the ~4 chars/token estimate."""
+    encoding = _encoding(model)
+    if encoding is not None:
+        return sum(len(encoding.encode(text, disallowed_special=())) for text in texts), "tiktoken"
+    return sum(len(text) for text in texts) // 4, "estimate"
+
+
+def caller_stage(depth: int = 2) -> str:
+    """Name of the function `depth` frames up; async twins (aname) report their sync name."""
+    frame = sys._getframe(depth)
+    name = frame.f_code.co_name
+    if name.startswith("a") and callable(frame.f_globals.get(name[1:])):
+        return name[1:]
+    return name
+
+
+def append_record(record: dict, path: Optional[str] = None):
+    """Appends one record as a single line (one write call, so concurrent writers don't interleave)."""
+    path = path or telemetry_path()
+    line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+    with _write_lock:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a") as f:
+            f.write(line)
+
+
+class CallTelemetry:
+    """Timing and usage for one chain invocation, including its retries."""
+
+    def __init__(self, stage: str, request: Optional[dict]):
+        self.stage = stage
+        self.request = request
+        self.model = request["model"] if request else None
+        self.enabled = telemetry_enabled()
+        self.started = time.perf_counter()
+        self.queue_s = 0.0
+        self.backoff_s = 0.0
+        self.latency_s = None
+        self.retries = 0
+        self._attempt_started = None
+        self._queue_started = None
+        self.usage = None
+        if self.enabled:
+            from langchain_core.callbacks import UsageMetadataCallbackHandler
+            self.usage = UsageMetadataCallbackHandler()
+
+    def config(self) -> Optional[dict]:
+        """RunnableConfig that collects provider usage for this call (passed to invoke/ainvoke/stream)."""
+        return {"callbacks": [self.usage]} if self.usage is not None else None
+
+    def queue_start(self):
+        self._queue_started = time.perf_counter()
+
+    def queue_end(self):
+        self.queue_s += time.perf_counter() - self._queue_started
+
+    def attempt_start(self):
+        self._attempt_started = time.perf_counter()
+
+    def attempt_end(self):
+        self.latency_s = time.perf_counter() - self._attempt_started
+
+    def backoff(self, seconds: float):
+        self.retries += 1
+        self.backoff_s += seconds
+
+    def _tokens(self, result) -> Tuple[int, int, str]:
+        usage = self.usage.usage_metadata if self.usage is not None else {}
+        if usage:
+            return (sum(u.get("input_tokens", 0) for u in usage.values()),
+                    sum(u.get("output_tokens", 0) for u in usage.values()), "provider")
+        prompt_texts = [str(content) for _, content in self.request["messages"]] if self.request else []
+        prompt_tokens, source = count_tokens(prompt_texts, self.model)
+        if result is None:
+            return prompt_tokens, 0, source
+        completion = result if isinstance(result, str) else json.dumps(result, ensure_ascii=False, default=str)
+        completion_tokens, _ = count_tokens([completion], self.model)
+        return prompt_tokens, completion_tokens, source
+
+    def finish(self, status: str, result=None, error: Optional[Exception] = None):
+        if status != "cached":
+            record_span("llm", time.perf_counter() - self.started - self.queue_s - self.backoff_s)
+            record_span("llm_wait", self.queue_s + self.backoff_s)
+        if not self.enabled:
+            return
+        try:
+            if status == "cached":
+                prompt_tokens = completion_tokens = 0
+                token_source = None
+            else:
+                prompt_tokens, completion_tokens, token_source = self._tokens(result)
+            record = {
+                "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "stage": self.stage,
+                "model": self.model,
+                "status": status,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "token_source": token_source,
+                "queue_s": round(self.queue_s, 4),
+                "backoff_s": round(self.backoff_s, 4),
+                "latency_s": round(self.latency_s, 4) if self.latency_s is not None else None,
+                "total_s": round(time.perf_counter() - self.started, 4),
+                "retries": self.retries,
+                "cost_usd": estimate_cost(self.model, prompt_tokens, completion_tokens),
+                "pid": os.getpid(),
+            }
+            if error is not None:
+                record["error"] = str(error)[:300]
+            append_record(record)
+        except Exception:
+            # Telemetry must never break an LLM call
+            pass
+
+
+def load_records(path: str, since_hours: Optional[float] = None) -> List[dict]:
+    cutoff = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(time.time() - since_hours * 3600)) if since_hours else None
+    records = []
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # A torn last line from an interrupted write
+            if cutoff is None or record.get("ts", "") >= cutoff:
+                records.append(record)
+    return records
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile."""
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, int(round(q / 100 * len(values) + 0.5)) - 1))]
+
+
+def summarize(records: List[dict], by: str = "stage") -> List[dict]:
+    groups: Dict[str, List[dict]] = {}
+    for record in records:
+        groups.setdefault(record.get(by) or "?", []).append(record)
+
+    rows = []
+    for key, group in sorted(groups.items()):
+        sent = [r for r in group if r["status"] != "cached"]
+        latencies = [r["latency_s"] for r in sent if r.get("latency_s") is not None]
+        totals = [r["total_s"] for r in group]
+        costs = [r["cost_usd"] for r in group if r.get("cost_usd") is not None]
+        rows.append({
+            by: key,
+            "calls": len(group),
+            "cached": len(group) - len(sent),
+            "errors": sum(r["status"] == "error" for r in group),
+            "latency_p50": percentile(latencies, 50),
+            "latency_p95": percentile(latencies, 95),
+            "total_p95": percentile(totals, 95),
+            "prompt_p50": percentile([r["prompt_tokens"] for r in sent], 50),
+            "completion_p50": percentile([r["completion_tokens"] for r in sent], 50),
+            "tokens": sum(r["prompt_tokens"] + r["completion_tokens"] for r in group),
+            "retries": sum(r["retries"] for r in group),
+            "queue_s": sum(r["queue_s"] + r["backoff_s"] for r in group),
+            "cost_usd": sum(costs) if costs else None,
+        })
+    return rows
+
+
+def format_summary(rows: List[dict], by: str = "stage") -> str:
+    def num(value, spec):
+        return "-" if value is None else format(value, spec)
+
+    header = (f"{by:<30}{'calls':>6}{'cache':>6}{'err':>5}{'lat p50':>9}{'lat p95':>9}{'tot p95':>9}"
+              f"{'in p50':>8}{'out p50':>8}{'tokens':>10}{'retry':>6}{'wait s':>8}{'cost $':>9}")
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        lines.append(
+            f"{str(row[by])[:29]:<30}{row['calls']:>6}{row['cached']:>6}{row['errors']:>5}"
+            f"{num(row['latency_p50'], '.2f'):>9}{num(row['latency_p95'], '.2f'):>9}{num(row['total_p95'], '.2f'):>9}"
+            f"{num(row['prompt_p50'], 'd'):>8}{num(row['completion_p50'], 'd'):>8}{row['tokens']:>10}"
+            f"{row['retries']:>6}{row['queue_s']:>8.1f}{num(row['cost_usd'], '.4f'):>9}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize LLM call telemetry")
+    parser.add_argument("--file", default=None, help="Telemetry JSONL (default: LLM_TELEMETRY_FILE or data/telemetry/llm_calls.jsonl)")
+    parser.add_argument("--by", choices=["stage", "model"], default="stage")
+    parser.add_argument("--since", type=float, default=None, help="Only calls from the last N hours")
+    args = parser.parse_args()
+
+    path = args.file or telemetry_path()
+    if not os.path.exists(path):
+        print(f"No telemetry recorded yet ({path})")
+        sys.exit(1)
+    records = load_records(path, args.since)
+    if not records:
+        print("No matching calls.")
+        return
+    print(format_summary(summarize(records, args.by), args.by))
+
+
+if __name__ == "__main__":
+    run_entry_point(main)
@@ -1,107 +1,503 @@
 import os
+import sys
+import json
+import hashlib
+import threading
 from typing import Optional, Union
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.language_models.chat_models import BaseChatModel
 
-# Load environment variables from the current working directory (userData in production)
-env_path = os.path.join(os.getcwd(), '.env')
-if os.path.exists(env_path):
-    load_dotenv(env_path, override=True)
-else:
-    # Fallback to default behavior
-    load_dotenv()
+def load_environment():
+    """
+    Loads environment variables from the current working directory (userData in production).
+    Called at import time, and again by the long-lived worker before every stage (see
+    reload_settings) so settings saved from the UI take effect without a restart.
+    """
+    env_path = os.path.join(os.getcwd(), '.env')
+    if os.path.exists(env_path):
+        load_dotenv(env_path, override=True)
+    else:
+        # Fallback to default behavior
+        load_dotenv()
 
-def get_llm(model_name: str = None, temperature: float = 0.1) -> BaseChatModel:
+load_environment()
+
+_llm_registry = {}
+_llm_registry_lock = threading.Lock()
+_llm_stats = {"created": 0, "reused": 0}
+_http_pool = None
+_settings_fingerprint = None
+
+def settings_fingerprint() -> str:
+    """Hash of the cwd and environment, which together determine every process-wide setting."""
+    state = json.dumps([os.getcwd(), sorted(os.environ.items())])
+    return hashlib.sha256(state.encode("utf-8")).hexdigest()
+
+def reset_process_state():
     """
-    Returns a configured Chat Model instance.
-    Supports OpenAI (gpt-*) and Google (gemini-*).
-    Uses environment variables for API keys.
-    If model_name is None, uses DEFAULT_MODEL from .env (defaults to gemini-2.0-flash).
+    Drops the process-wide LLM clients, HTTP pool, response cache, rate limiters, page
+    cache and DOCX renderers, so each is rebuilt from the current settings on next use.
+    """
+    global _http_pool
+    with _llm_registry_lock:
+        _llm_registry.clear()
+        pool, _http_pool = _http_pool, None
+    if pool is not None:
+        pool.close()
+    reset_response_cache()
+    reset_rate_limiters()
+    # Only modules that are already loaded can hold state
+    for module_name, reset in (("execution.web_fetch", "reset_page_cache"), ("execution.docx_render", "reset_renderers")):
+        module = sys.modules.get(module_name)
+        if module is not None:
+            getattr(module, reset)()
+
+def reload_settings() -> bool:
+    """
+    Re-reads .env for the long-lived worker. When the settings or the cwd changed since
+    the last call, process-wide state is reset so the new values take effect. Returns
+    True if state was reset.
+    """
+    global _settings_fingerprint
+    load_environment()
+    fingerprint = settings_fingerprint()
+    changed = _settings_fingerprint is not None and fingerprint != _settings_fingerprint
+    _settings_fingerprint = fingerprint
+    if changed:
+        reset_process_state()
+    return changed
+
+def http_pool_settings() -> dict:
+    """Connection-pool settings shared by every LLM client (configurable via .env)."""
+    return {
+        "pool_size": int(os.getenv("LLM_POOL_SIZE", "10")),
+        "timeout": float(os.getenv("LLM_TIMEOUT", "120")),
+        "connect_timeout": float(os.getenv("LLM_CONNECT_TIMEOUT", "10")),
+        "keepalive": float(os.getenv("LLM_KEEPALIVE", "60")),
+    }
+
+def get_http_pool():
+    """
+    Returns the process-wide keep-alive httpx.Client used by OpenAI chat models, so every
+    client shares one connection pool and TLS sessions survive between calls.
+    """
+    global _http_pool
+    import httpx
+
+    with _llm_registry_lock:
+        if _http_pool is None:
+            settings = http_pool_settings()
+            _http_pool = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=settings["pool_size"],
+                    max_keepalive_connections=settings["pool_size"],
+                    keepalive_expiry=settings["keepalive"],
+                ),
+                timeout=httpx.Timeout(settings["timeout"], connect=settings["connect_timeout"]),
+            )
+        return _http_pool
+
+def key_fingerprint(api_key: str) -> str:
+    """Short, non-reversible identifier for an API key (so key rotation yields a new client)."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+def resolve_llm_config(model_name: Optional[str] = None):
+    """
+    Resolves the model name, provider and API key from arguments and .env,
+    including the Gemini -> gpt-4o-mini fallback when GOOGLE_API_KEY is missing.
     """
-    
     if model_name is None:
         model_name = os.getenv("DEFAULT_MODEL", "gemini-2.0-flash")
-    
-    print(f"Initializing LLM: {model_name} (temp={temperature})", flush=True)
-    
+
+    if model_name == "fake" or model_name.startswith("fake:"):
+        # Offline deterministic model (execution/fake_llm.py); needs no key
+        return model_name, "fake", ""
+
     if "gemini" in model_name.lower():
         api_key = os.getenv("GOOGLE_API_KEY")
+        if api_key:
+            return model_name, "gemini", api_key
+        print("⚠ GOOGLE_API_KEY not set. Falling back to OpenAI gpt-4o-mini...")
+        model_name = "gpt-4o-mini"
+        api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
-            print("⚠ GOOGLE_API_KEY not set. Falling back to OpenAI gpt-4o-mini...")
-            model_name = "gpt-4o-mini"
-            api_key = os.getenv("OPENAI_API_KEY")
-            if not api_key:
-                raise ValueError("No API keys configured. Set GOOGLE_API_KEY or OPENAI_API_KEY in .env")
-            return ChatOpenAI(
-                model=model_name,
-                temperature=temperature,
-                openai_api_key=api_key
-            )
-        
-        return ChatGoogleGenerativeAI(
+            raise ValueError("No API keys configured. Set GOOGLE_API_KEY or OPENAI_API_KEY in .env")
+        return model_name, "openai", api_key
+
+    # Default to OpenAI for everything else
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY not found in environment variables.")
+    return model_name, "openai", api_key
+
+def get_llm(model_name: str = None, temperature: float = 0.1) -> BaseChatModel:
+    """
+    Returns a configured Chat Model instance.
+    Supports OpenAI (gpt-*), Google (gemini-*) and the offline fake model (fake, fake:*).
+    Uses environment variables for API keys.
+    If model_name is None, uses DEFAULT_MODEL from .env (defaults to gemini-2.0-flash).
+    Provider SDKs are imported on first use, so only the selected one is loaded.
+
+    Clients are memoized per (provider, model, temperature, key fingerprint) and share a
+    keep-alive connection pool, so repeated calls reuse warm connections.
+    """
+    model_name, provider, api_key = resolve_llm_config(model_name)
+    registry_key = (provider, model_name, temperature, key_fingerprint(api_key))
+
+    with _llm_registry_lock:
+        llm = _llm_registry.get(registry_key)
+        if llm is not None:
+            _llm_stats["reused"] += 1
+            return llm
+
+    settings = http_pool_settings()
+    print(f"Initializing LLM: {model_name} (temp={temperature})", flush=True)
+
+    if provider == "fake":
+        from execution.fake_llm import FakeChatModel
+        llm = FakeChatModel(model_name=model_name, temperature=temperature)
+    elif provider == "gemini":
+        import httpx
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        llm = ChatGoogleGenerativeAI(
             model=model_name,
             temperature=temperature,
-            google_api_key=api_key
+            google_api_key=api_key,
+            timeout=settings["timeout"],
+            client_args={"limits": httpx.Limits(
+                max_connections=settings["pool_size"],
+                max_keepalive_connections=settings["pool_size"],
+                keepalive_expiry=settings["keepalive"],
+            )}
         )
-        
     else:
-        # Default to OpenAI for everything else
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY not found in environment variables.")
-
-        return ChatOpenAI(
+        from langchain_openai import ChatOpenAI
+        llm = ChatOpenAI(
             model=model_name,
             temperature=temperature,
-            openai_api_key=api_key
+            openai_api_key=api_key,
+            http_client=get_http_pool()
         )
 
+    with _llm_registry_lock:
+        # Another thread may have built the same client meanwhile; keep the first one
+        existing = _llm_registry.setdefault(registry_key, llm)
+        if existing is llm:
+            _llm_stats["created"] += 1
+        else:
+            _llm_stats["reused"] += 1
+        return existing
+
+def llm_client_stats() -> dict:
+    """Reuse statistics for the client registry."""
+    with _llm_registry_lock:
+        requests_total = _llm_stats["created"] + _llm_stats["reused"]
+        return {
+            "clients": len(_llm_registry),
+            "created": _llm_stats["created"],
+            "reused": _llm_stats["reused"],
+            "reuse_rate": (_llm_stats["reused"] / requests_total) if requests_total else 0.0,
+        }
+
 def ensure_directory(path: str):
     """Ensures a directory exists."""
     if not os.path.exists(path):
         os.makedirs(path)
 
+import re
+import asyncio
 import logging
 import time
 import random
+from typing import Any, Awaitable, Callable, Iterable, List
 from langchain_core.runnables import Runnable
+from execution.llm_cache import get_response_cache, make_cache_key, reset_response_cache
+from execution.rate_limit import get_rate_limiter, estimate_tokens, expected_completion_tokens, reset_rate_limiters
+from execution.telemetry import CallTelemetry, caller_stage
 
 logger = logging.getLogger(__name__)
 
-def invoke_with_retry(chain: Runnable, input_data: dict, max_retries: int = 5, base_delay: int = 10):
+def describe_chain_request(chain: Runnable, input_data: dict) -> Optional[dict]:
+    """
+    Renders the prompt of a `prompt | llm | parser` chain and returns a JSON-serializable
+    description of the request (messages, model, temperature, parsers).
+    Returns None for runnables that don't follow that shape.
+    """
+    from langchain_core.prompts import BasePromptTemplate
+
+    steps = getattr(chain, "steps", None)
+    if not steps:
+        return None
+
+    prompt = next((s for s in steps if isinstance(s, BasePromptTemplate)), None)
+    llm = next((s for s in steps if isinstance(s, BaseChatModel)), None)
+    if prompt is None or llm is None:
+        return None
+
+    try:
+        messages = prompt.invoke(input_data).to_messages()
+    except Exception:
+        return None
+
+    return {
+        "messages": [[m.type, m.content] for m in messages],
+        "model": getattr(llm, "model_name", None) or getattr(llm, "model", None),
+        "temperature": getattr(llm, "temperature", None),
+        "parsers": [type(s).__name__ for s in steps[steps.index(llm) + 1:]],
+    }
+
+def lookup_cached_response(request: Optional[dict], use_cache: bool = True):
+    """
+    Checks the response cache for a request described by describe_chain_request.
+
+    Returns:
+        (hit, value, store): `store(result)` writes a fresh result back to the cache
+        (a no-op when caching is disabled or the chain can't be keyed).
+    """
+    cache = get_response_cache() if use_cache else None
+    if cache is None or request is None or not (cache.readable or cache.writable):
+        return False, None, lambda result: None
+
+    cache_key = make_cache_key(request)
+    hit, cached = cache.get(cache_key)
+    if hit:
+        print(f"LLM cache hit ({request['model']}, key={cache_key[:12]})", flush=True)
+
+    def store(result):
+        cache.put(cache_key, result, meta={"model": request["model"]})
+
+    return hit, cached, store
+
+def request_pacing(request: Optional[dict]):
+    """Returns (limiter, estimated_tokens) for proactive rate limiting, or (None, 0) if unavailable."""
+    if request is None:
+        return None, 0
+    limiter = get_rate_limiter(request["model"])
+    if limiter is None:
+        return None, 0
+    prompt_tokens = estimate_tokens(str(content) for _, content in request["messages"])
+    return limiter, prompt_tokens + expected_completion_tokens()
+
+def rate_limit_delay(error: Exception, retries: int, max_retries: int, base_delay: int) -> Optional[float]:
+    """
+    Classifies an LLM error. Returns the backoff in seconds for a retryable rate-limit error,
+    or None if the error should be raised (not a 429, or retries exhausted).
+    """
+    error_msg = str(error).lower()
+    # Explicitly print the error so it shows up in Electron logs
+    print(f"LLM Error: {error_msg[:200]}...", flush=True)
+
+    if "429" not in error_msg and "resource_exhausted" not in error_msg and "quota" not in error_msg:
+        return None
+
+    if retries > max_retries:
+        print(f"Max retries ({max_retries}) exceeded.", flush=True)
+        return None
+
+    # Check if there is a specific retry delay in the error message
+    # Gemini often says "Please retry in 57.20s"
+    wait_time = base_delay * (2 ** (retries - 1)) + random.uniform(0, 1)
+
+    match = re.search(r"retry in (\d+(\.\d+)?)s", error_msg)
+    if match:
+        wait_time = float(match.group(1)) + 1 # Add buffer
+
+    retry_msg = f"⚠ Rate limited (429). Retrying in {wait_time:.2f}s... (Attempt {retries}/{max_retries})"
+    print(retry_msg, flush=True)
+    logger.warning(retry_msg)
+    return wait_time
+
+def invoke_with_retry(chain: Runnable, input_data: dict, max_retries: int = 5, base_delay: int = 10,
+                      use_cache: bool = True, stage: Optional[str] = None):
     """
     Invokes a LangChain runnable with robust exponential backoff for rate limits.
     Specifically designed for Geminia/OpenAI 429 errors.
+    Results are served from / stored in the on-disk response cache unless use_cache is False.
+    Calls are paced by the shared per-provider rate limiter before they are sent.
+    Each call is recorded to the telemetry log under `stage` (default: the calling function).
+    """
+    request = describe_chain_request(chain, input_data)
+    call = CallTelemetry(stage or caller_stage(), request)
+    hit, cached, store = lookup_cached_response(request, use_cache)
+    if hit:
+        call.finish("cached", cached)
+        return cached
+    limiter, estimated_tokens = request_pacing(request)
+
+    retries = 0
+    while True:
+        if limiter is not None:
+            call.queue_start()
+            limiter.acquire(estimated_tokens)
+            call.queue_end()
+        try:
+            call.attempt_start()
+            result = chain.invoke(input_data, config=call.config())
+            call.attempt_end()
+            store(result)
+            call.finish("ok", result)
+            return result
+        except Exception as e:
+            call.attempt_end()
+            retries += 1
+            wait_time = rate_limit_delay(e, retries, max_retries, base_delay)
+            if wait_time is None:
+                call.finish("error", error=e)
+                raise e
+            if limiter is not None:
+                limiter.drain()
+            call.backoff(wait_time)
+            time.sleep(wait_time)
+
+async def ainvoke_with_retry(chain: Runnable, input_data: dict, max_retries: int = 5, base_delay: int = 10,
+                             use_cache: bool = True, stage: Optional[str] = None):
+    """
+    Async twin of invoke_with_retry: uses chain.ainvoke and asyncio.sleep so a backoff
+    suspends only this call, not the thread running the event loop.
     """
+    request = describe_chain_request(chain, input_data)
+    call = CallTelemetry(stage or caller_stage(), request)
+    hit, cached, store = lookup_cached_response(request, use_cache)
+    if hit:
+        call.finish("cached", cached)
+        return cached
+    limiter, estimated_tokens = request_pacing(request)
+
     retries = 0
     while True:
+        if limiter is not None:
+            call.queue_start()
+            await limiter.aacquire(estimated_tokens)
+            call.queue_end()
         try:
-            return chain.invoke(input_data)
+            call.attempt_start()
+            result = await chain.ainvoke(input_data, config=call.config())
+            call.attempt_end()
+            store(result)
+            call.finish("ok", result)
+            return result
         except Exception as e:
-            error_msg = str(e).lower()
-            # Explicitly print the error so it shows up in Electron logs
-            print(f"LLM Error: {error_msg[:200]}...", flush=True)
-            
-            if "429" in error_msg or "resource_exhausted" in error_msg or "quota" in error_msg:
-                retries += 1
-                if retries > max_retries:
-                    print(f"Max retries ({max_retries}) exceeded.", flush=True)
-                    raise e
-                
-                # Check if there is a specific retry delay in the error message
-                # Gemini often says "Please retry in 57.20s"
-                wait_time = base_delay * (2 ** (retries - 1)) + random.uniform(0, 1)
-                
-                import re
-                match = re.search(r"retry in (\d+(\.\d+)?)s", error_msg)
-                if match:
-                    wait_time = float(match.group(1)) + 1 # Add buffer
-                
-                retry_msg = f"⚠ Rate limited (429). Retrying in {wait_time:.2f}s... (Attempt {retries}/{max_retries})"
-                print(retry_msg, flush=True)
-                logger.warning(retry_msg)
-                time.sleep(wait_time)
-            else:
+            call.attempt_end()
+            retries += 1
+            wait_time = rate_limit_delay(e, retries, max_retries, base_delay)
+            if wait_time is None:
+                call.finish("error", error=e)
                 raise e
+            if limiter is not None:
+                limiter.drain()
+            call.backoff(wait_time)
+            await asyncio.sleep(wait_time)
+
+def streaming_enabled() -> bool:
+    """Markdown stages stream tokens unless LLM_STREAM=0."""
+    return os.getenv("LLM_STREAM", "1").strip().lower() not in ("0", "false", "no", "off")
+
+def combined_mode_enabled() -> bool:
+    """GENERATION_MODE=combined asks for resume, cover letter and analysis in one call."""
+    return os.getenv("GENERATION_MODE", "separate").strip().lower() == "combined"
+
+def write_to_stdout(chunk: str):
+    sys.stdout.write(chunk)
+    sys.stdout.flush()
+
+def stream_with_retry(chain: Runnable, input_data: dict, output_path: Optional[str] = None,
+                      on_token: Optional[Callable[[str], None]] = write_to_stdout,
+                      max_retries: int = 5, base_delay: int = 10, use_cache: bool = True,
+                      stage: Optional[str] = None) -> str:
+    """
+    Streams a text-producing chain, forwarding chunks to `on_token` (stdout by default)
+    and writing them to `output_path + ".tmp"` as they arrive. The tmp file replaces
+    `output_path` only once the stream completes, so a failed request leaves the
+    previous output in place. Returns the full text.
+
+    Rate limits are handled like invoke_with_retry. A 429 in the middle of a stream
+    restarts the response from scratch: the tmp file is reopened empty and a restart
+    notice is emitted so consumers can discard the partial text.
+    """
+    request = describe_chain_request(chain, input_data)
+    call = CallTelemetry(stage or caller_stage(), request)
+    hit, cached, store = lookup_cached_response(request, use_cache)
+    if hit:
+        call.finish("cached", cached)
+        if output_path:
+            with open(output_path, "w") as f:
+                f.write(cached)
+        if on_token:
+            on_token(cached)
+        return cached
+    limiter, estimated_tokens = request_pacing(request)
+    tmp_path = output_path + ".tmp" if output_path else None
+
+    retries = 0
+    while True:
+        if limiter is not None:
+            call.queue_start()
+            limiter.acquire(estimated_tokens)
+            call.queue_end()
+        chunks = []
+        out = open(tmp_path, "w") if tmp_path else None
+        try:
+            call.attempt_start()
+            for chunk in chain.stream(input_data, config=call.config()):
+                chunks.append(chunk)
+                if out:
+                    out.write(chunk)
+                    out.flush()
+                if on_token:
+                    on_token(chunk)
+            call.attempt_end()
+            result = "".join(chunks)
+            if out:
+                out.close()
+                os.replace(tmp_path, output_path)
+            store(result)
+            call.finish("ok", result)
+            return result
+        except Exception as e:
+            call.attempt_end()
+            if chunks and on_token:
+                on_token("\n")
+            retries += 1
+            wait_time = rate_limit_delay(e, retries, max_retries, base_delay)
+            if wait_time is None:
+                call.finish("error", error=e)
+                if out:
+                    out.close()
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                raise e
+            if limiter is not None:
+                limiter.drain()
+            call.backoff(wait_time)
+            if chunks:
+                print(f"↻ Stream interrupted after {len(chunks)} chunks; restarting the response", flush=True)
+            time.sleep(wait_time)
+        finally:
+            if out:
+                out.close()
+
+async def gather_with_limit(calls: Iterable[Awaitable], max_concurrency: Optional[int] = None,
+                            return_exceptions: bool = False) -> List[Any]:
+    """
+    Awaits many independent coroutines on the current event loop, at most
+    `max_concurrency` at a time (unbounded if None). Results keep the input order.
+    """
+    calls = list(calls)
+    if not max_concurrency:
+        return await asyncio.gather(*calls, return_exceptions=return_exceptions)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def bounded(call: Awaitable):
+        async with semaphore:
+            return await call
+
+    return await asyncio.gather(*(bounded(c) for c in calls), return_exceptions=return_exceptions)
+
+def run_async_calls(calls: Iterable[Awaitable], max_concurrency: Optional[int] = None,
+                    return_exceptions: bool = False) -> List[Any]:
+    """
+    Synchronous entry point: runs many independent async stage calls (e.g. aanalyze_match,
+    agenerate_resume_content) on a single event loop and returns their results in order.
+    """
+    return asyncio.run(gather_with_limit(calls, max_concurrency, return_exceptions))
@@ -0,0 +1,260 @@
+"""
+Vacancy Index
+-------------
+Persistent index of vacancy profiles (`vacancy_profile.md`-style Markdown) for
+ranking many postings against one candidate without any network calls.
+
+Each vacancy is stored as a hashed term-frequency vector (feature hashing keeps
+the dimension fixed, so vacancies can be added or removed incrementally) in a
+memory-mapped NumPy matrix. Document frequencies are maintained alongside, and a
+query computes TF-IDF cosine similarity against every stored vacancy in a single
+vectorized pass.
+
+Layout (data/vacancy_index/ by default):
+- vectors.npy: float32 matrix (capacity x dim), rows [0, count) are live
+- df.npy: per-dimension document frequencies
+- meta.json: dimension, row -> {id, path, title, content_hash}
+
+Usage:
+    python execution/vacancy_index.py add postings/*.md
+    python execution/vacancy_index.py remove acme_backend
+    python execution/vacancy_index.py query --candidate data/processed/candidate_profile.md --top 20
+    python execution/vacancy_index.py list
+
+The index assumes a single writer at a time.
+"""
+import os
+import sys
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import time
+import zlib
+import hashlib
+import argparse
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from execution.fact_retrieval import parse_markdown_sections, tokenize
+from execution.profiling import run_entry_point
+
+DEFAULT_DIM = 2048
+MIN_CAPACITY = 64
+
+# Requirement sections dominate a vacancy's vector; boilerplate sections count less
+VACANCY_SECTION_WEIGHTS = {
+    "Core Requirements": 2.0,
+    "Preferred Qualifications": 1.0,
+    "Responsibilities": 1.0,
+}
+DEFAULT_SECTION_WEIGHT = 0.5
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split()).lower()
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def hash_term(term: str, dim: int) -> int:
+    # crc32 is stable across processes, unlike hash()
+    return zlib.crc32(term.encode("utf-8")) % dim
+
+
+def term_vector(weighted_tokens: Iterable[Tuple[str, float]], dim: int) -> np.ndarray:
+    """Sublinear (1 + log tf) hashed term vector."""
+    counts = np.zeros(dim, dtype=np.float64)
+    for token, weight in weighted_tokens:
+        counts[hash_term(token, dim)] += weight
+    vector = np.zeros(dim, dtype=np.float32)
+    nonzero = counts > 0
+    vector[nonzero] = 1 + np.log(counts[nonzero])
+    return vector
+
+
+def vacancy_tokens(markdown: str) -> List[Tuple[str, float]]:
+    weighted = []
+    for heading, entries in parse_markdown_sections(markdown):
+        weight = next((w for prefix, w in VACANCY_SECTION_WEIGHTS.items() if heading.startswith(prefix)),
+                      DEFAULT_SECTION_WEIGHT)
+        weighted.extend((token, weight) for token in tokenize("\n".join(entries)))
+    return weighted
+
+
+def vacancy_title(markdown: str) -> str:
+    for line in markdown.splitlines():
+        if line.startswith("# "):
+            return line[2:].replace("Vacancy:", "").strip()
+    return ""
+
+
+class VacancyIndex:
+    def __init__(self, directory: str, dim: int = DEFAULT_DIM):
+        self.directory = directory
+        self.meta_path = os.path.join(directory, "meta.json")
+        self.vectors_path = os.path.join(directory, "vectors.npy")
+        self.df_path = os.path.join(directory, "df.npy")
+        os.makedirs(directory, exist_ok=True)
+
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, "r") as f:
+                meta = json.load(f)
+            self.dim = meta["dim"]
+            self.entries: List[Dict[str, str]] = meta["entries"]
+            self.vectors = np.load(self.vectors_path, mmap_mode="r+")
+            self.df = np.load(self.df_path)
+        else:
+            self.dim = dim
+            self.entries = []
+            self.vectors = np.lib.format.open_memmap(self.vectors_path, mode="w+", dtype=np.float32,
+                                                     shape=(MIN_CAPACITY, dim))
+            self.df = np.zeros(dim, dtype=np.float64)
+            self.save()
+        self._rows = {entry["id"]: row for row, entry in enumerate(self.entries)}
+
+    @property
+    def count(self) -> int:
+        return len(self.entries)
+
+    def save(self):
+        """Writes vectors, document frequencies and entries to disk (after add/remove with save=False)."""
+        self.vectors.flush()
+        np.save(self.df_path, self.df)
+        tmp_path = f"{self.meta_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"dim": self.dim, "entries": self.entries}, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def _ensure_capacity(self, rows: int):
+        capacity = self.vectors.shape[0]
+        if rows <= capacity:
+            return
+        new_capacity = max(rows, capacity * 2)
+        tmp_path = f"{self.vectors_path}.tmp.npy"
+        grown = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=(new_capacity, self.dim))
+        grown[:self.count] = self.vectors[:self.count]
+        grown.flush()
+        del self.vectors, grown
+        os.replace(tmp_path, self.vectors_path)
+        self.vectors = np.load(self.vectors_path, mmap_mode="r+")
+
+    def add(self, vacancy_id: str, markdown: str, path: str = "", save: bool = True) -> bool:
+        """Adds or updates a vacancy. Returns False if the same content is already indexed."""
+        digest = content_hash(markdown)
+        row = self._rows.get(vacancy_id)
+        if row is not None and self.entries[row]["content_hash"] == digest:
+            return False
+
+        vector = term_vector(vacancy_tokens(markdown), self.dim)
+        entry = {"id": vacancy_id, "path": path, "title": vacancy_title(markdown), "content_hash": digest}
+        if row is None:
+            self._ensure_capacity(self.count + 1)
+            row = self.count
+            self.entries.append(entry)
+            self._rows[vacancy_id] = row
+        else:
+            self.df -= self.vectors[row] > 0
+            self.entries[row] = entry
+
+        self.vectors[row] = vector
+        self.df += vector > 0
+        if save:
+            self.save()
+        return True
+
+    def remove(self, vacancy_id: str, save: bool = True) -> bool:
+        """Removes a vacancy by moving the last row into its slot."""
+        row = self._rows.pop(vacancy_id, None)
+        if row is None:
+            return False
+        self.df -= self.vectors[row] > 0
+        last = self.count - 1
+        if row != last:
+            self.vectors[row] = self.vectors[last]
+            self.entries[row] = self.entries[last]
+            self._rows[self.entries[row]["id"]] = row
+        self.vectors[last] = 0
+        self.entries.pop()
+        if save:
+            self.save()
+        return True
+
+    def query(self, candidate_md: str, top: Optional[int] = None) -> List[Tuple[str, float, Dict[str, str]]]:
+        """Ranks every stored vacancy by TF-IDF cosine similarity to the candidate profile."""
+        if not self.count:
+            return []
+        matrix = self.vectors[:self.count]
+        idf = (np.log((1 + self.count) / (1 + self.df)) + 1).astype(np.float32)
+
+        query = term_vector(((t, 1.0) for t in tokenize(candidate_md)), self.dim) * idf
+        query_norm = np.linalg.norm(query) or 1.0
+        row_norms = np.sqrt((matrix * matrix) @ (idf * idf))
+        scores = (matrix @ (query * idf)) / (row_norms * query_norm + 1e-12)
+
+        k = self.count if top is None else min(top, self.count)
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [(self.entries[i]["id"], float(scores[i]), self.entries[i]) for i in best]
+
+
+def expand_paths(paths: List[str]) -> List[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith((".md", ".txt")))
+        else:
+            files.append(path)
+    return files
+
+
+def main():
+    BASE_DIR = os.getcwd()
+    parser = argparse.ArgumentParser(description="Rank stored vacancy profiles against a candidate")
+    parser.add_argument("--index", default=os.path.join(BASE_DIR, "data", "vacancy_index"))
+    parser.add_argument("--dim", type=int, default=DEFAULT_DIM, help="Hashed vector size (new indexes only)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add_cmd = commands.add_parser("add", help="Add or update vacancy profiles (files or directories)")
+    add_cmd.add_argument("paths", nargs="+")
+    remove_cmd = commands.add_parser("remove", help="Remove vacancies by id")
+    remove_cmd.add_argument("ids", nargs="+")
+    query_cmd = commands.add_parser("query", help="Rank vacancies for a candidate profile")
+    query_cmd.add_argument("--candidate", default=os.path.join(BASE_DIR, "data", "processed", "candidate_profile.md"))
+    query_cmd.add_argument("--top", type=int, default=20)
+    commands.add_parser("list", help="List indexed vacancies")
+    args = parser.parse_args()
+
+    index = VacancyIndex(args.index, dim=args.dim)
+
+    if args.command == "add":
+        added = 0
+        for path in expand_paths(args.paths):
+            with open(path, "r") as f:
+                markdown = f.read()
+            vacancy_id = os.path.splitext(os.path.basename(path))[0]
+            added += index.add(vacancy_id, markdown, os.path.abspath(path), save=False)
+        index.save()
+        print(f"Indexed {added} new/changed vacancies ({index.count} total)")
+    elif args.command == "remove":
+        removed = sum(index.remove(vacancy_id, save=False) for vacancy_id in args.ids)
+        index.save()
+        print(f"Removed {removed} vacancies ({index.count} total)")
+    elif args.command == "query":
+        with open(args.candidate, "r") as f:
+            candidate_md = f.read()
+        start = time.perf_counter()
+        ranking = index.query(candidate_md, top=args.top)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for rank, (vacancy_id, score, entry) in enumerate(ranking, 1):
+            print(f"{rank:>3}. {score:.3f}  {vacancy_id}  {entry.get('title', '')}")
+        print(f"Ranked {index.count} vacancies in {elapsed_ms:.1f}ms")
+    else:
+        for entry in index.entries:
+            print(f"{entry['id']}\t{entry.get('title', '')}\t{entry['path']}")
+
+
+if __name__ == "__main__":
+    run_entry_point(main)
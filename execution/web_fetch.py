@@ -0,0 +1,171 @@
+"""
+Cached Web Fetching
+-------------------
+Fetches pages linked from job descriptions and extracts their readable text with
+trafilatura. Used by vacancy distillation to enrich the posting before the LLM call.
+
+- All requests share one pooled `requests.Session` (keep-alive across URLs and runs
+  in the persistent worker).
+- URLs are fetched concurrently under a single time budget for the whole step;
+  pages that miss the deadline are skipped instead of delaying distillation.
+- The extracted text is cached on disk with the response's ETag/Last-Modified. Fresh
+  entries are served without a request; stale ones are revalidated with a conditional
+  GET, so unchanged pages cost a 304 and no re-extraction. If a fetch fails, a cached
+  copy is used when one exists.
+
+Configuration (.env):
+- URL_FETCH_BUDGET: seconds allowed for the whole enrichment step (default 8).
+- URL_FETCH_TIMEOUT: per-request timeout in seconds (default 5).
+- URL_CACHE: "on" (default) or "off".
+- URL_CACHE_DIR: cache location (defaults to data/cache/web under the cwd).
+- URL_CACHE_TTL_HOURS: how long an entry is used without revalidation (default 24).
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Process-wide pooled HTTP session."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+            _session.headers["User-Agent"] = "Mozilla/5.0 (compatible; ai-resume vacancy fetcher)"
+        return _session
+
+
+class PageCache:
+    """One JSON file per URL holding the extracted text and its validators."""
+
+    def __init__(self, directory: str, ttl_seconds: float, enabled: bool = True):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+
+    def _path_for(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, url: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        try:
+            with open(self._path_for(url), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url: str, text: str, etag: Optional[str], last_modified: Optional[str]):
+        if not self.enabled:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        entry = {"url": url, "text": text, "etag": etag, "last_modified": last_modified, "fetched_at": time.time()}
+        path = self._path_for(url)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry.get("fetched_at", 0) < self.ttl_seconds
+
+
+_page_cache = None
+
+
+def get_page_cache() -> PageCache:
+    global _page_cache
+    with _session_lock:
+        if _page_cache is None:
+            directory = os.getenv("URL_CACHE_DIR") or os.path.join(os.getcwd(), "data", "cache", "web")
+            ttl_hours = float(os.getenv("URL_CACHE_TTL_HOURS", "24"))
+            enabled = os.getenv("URL_CACHE", "on").strip().lower() != "off"
+            _page_cache = PageCache(directory, ttl_hours * 3600, enabled)
+        return _page_cache
+
+
+def reset_page_cache():
+    """Forgets the page cache so the next fetch re-reads the URL_CACHE* settings."""
+    global _page_cache
+    with _session_lock:
+        _page_cache = None
+
+
+def fetch_page_text(url: str, timeout: float, cache: Optional[PageCache] = None) -> str:
+    """Returns the readable text of `url` ("" if unavailable), using and refreshing the cache."""
+    cache = cache or get_page_cache()
+    entry = cache.get(url)
+    if entry is not None and cache.is_fresh(entry):
+        logger.info(f"Using cached content for {url}")
+        return entry["text"]
+
+    headers = {}
+    if entry is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        logger.info(f"Fetching extra info from: {url}")
+        response = get_session().get(url, timeout=timeout, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            cache.put(url, entry["text"], entry.get("etag"), entry.get("last_modified"))
+            return entry["text"]
+        if response.status_code != 200:
+            logger.warning(f"Failed to fetch {url}: HTTP {response.status_code}")
+            return entry["text"] if entry is not None else ""
+
+        import trafilatura
+
+        text = trafilatura.extract(response.text) or ""
+        cache.put(url, text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return text
+    except Exception as e:
+        logger.warning(f"Failed to fetch {url}: {e}")
+        return entry["text"] if entry is not None else ""
+
+
+def fetch_pages(urls: List[str], budget: Optional[float] = None, timeout: Optional[float] = None) -> Dict[str, str]:
+    """
+    Fetches `urls` concurrently and returns {url: text} for those that produced text within
+    `budget` seconds (URL_FETCH_BUDGET). Late fetches fall back to a cached copy if there is
+    one and are otherwise skipped; their results still reach the cache if they complete later.
+    """
+    if not urls:
+        return {}
+    budget = float(os.getenv("URL_FETCH_BUDGET", "8")) if budget is None else budget
+    timeout = float(os.getenv("URL_FETCH_TIMEOUT", "5")) if timeout is None else timeout
+
+    pool = ThreadPoolExecutor(max_workers=len(urls))
+    futures = {pool.submit(fetch_page_text, url, min(timeout, budget)): url for url in urls}
+    done, late = wait(futures, timeout=budget)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    results = {futures[future]: future.result() for future in done}
+    cache = get_page_cache()
+    for future in late:
+        url = futures[future]
+        entry = cache.get(url)
+        if entry is not None:
+            logger.warning(f"Using cached content for {url}: not revalidated within the {budget:.0f}s enrichment budget")
+            results[url] = entry["text"]
+        else:
+            logger.warning(f"Skipping {url}: not fetched within the {budget:.0f}s enrichment budget")
+    return {url: results[url] for url in urls if results.get(url)}
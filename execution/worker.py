@@ -0,0 +1,199 @@
+"""
+Pipeline Worker
+---------------
+Long-lived Python process for the Electron app. Heavy dependencies (LangChain,
+provider SDKs, pdfplumber, trafilatura, python-docx) are imported once at
+startup, then stage requests are served as line-delimited JSON-RPC 2.0 over
+stdin/stdout.
+
+Request:      {"jsonrpc": "2.0", "id": 1, "method": "ingest_candidate", "params": {"cwd": "..."}}
+Response:     {"jsonrpc": "2.0", "id": 1, "result": {"status": "success", "elapsed": 1.23}}
+Notification: {"jsonrpc": "2.0", "method": "log", "params": {"message": "...", "isError": false}}
+
+Methods: ingest_candidate, ingest_vacancy, analyze_match, generate_application,
+pipeline (all four as a DAG, see pipeline.py), ping and shutdown. Everything a stage prints or logs is streamed back as "log"
+notifications on the same channel. Stage requests with "profile": true in their params (or every
+request, with STAGE_PROFILE=on or --profile) are profiled as described in profiling.py.
+"""
+import os
+import sys
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import io
+import json
+import time
+import logging
+import importlib
+import threading
+import traceback
+
+# Keep the real stdout for protocol frames; everything else written to stdout is a log line
+_protocol_out = sys.stdout
+_protocol_lock = threading.Lock()
+
+STAGES = {
+    "ingest_candidate": "execution.ingest_candidate",
+    "ingest_vacancy": "execution.ingest_vacancy",
+    "analyze_match": "execution.analyze_match",
+    "generate_application": "execution.generate_application",
+    "pipeline": "execution.pipeline",
+}
+
+# Imported eagerly so the first stage request doesn't pay for them
+WARM_MODULES = [
+    "langchain_openai",
+    "langchain_google_genai",
+    "pdfplumber",
+    "trafilatura",
+    "requests",
+    "docx",
+]
+
+
+def send_frame(frame: dict):
+    """Writes one JSON-RPC frame to the protocol channel."""
+    line = json.dumps(frame, ensure_ascii=False)
+    with _protocol_lock:
+        _protocol_out.write(line + "\n")
+        _protocol_out.flush()
+
+
+class LogStream(io.TextIOBase):
+    """File-like stdout/stderr replacement that forwards complete lines as log notifications."""
+
+    def __init__(self, is_error: bool = False):
+        self.is_error = is_error
+        self._buffer = ""
+        self._lock = threading.Lock()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        with self._lock:
+            self._buffer += text
+            *lines, self._buffer = self._buffer.split("\n")
+        for line in lines:
+            send_frame({"jsonrpc": "2.0", "method": "log", "params": {"message": line, "isError": self.is_error}})
+        return len(text)
+
+    def flush_partial(self):
+        """Emits any buffered text that did not end with a newline."""
+        with self._lock:
+            pending, self._buffer = self._buffer, ""
+        if pending:
+            send_frame({"jsonrpc": "2.0", "method": "log", "params": {"message": pending, "isError": self.is_error}})
+
+    def reconfigure(self, **kwargs):
+        # Stage scripts call sys.stdout.reconfigure(line_buffering=True); lines are always flushed here
+        pass
+
+
+def install_log_streams():
+    sys.stdout = LogStream()
+    sys.stderr = LogStream(is_error=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler(sys.stdout)],
+        force=True
+    )
+
+
+def warm_up():
+    start = time.perf_counter()
+    for module_name in WARM_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except ImportError as e:
+            logging.warning(f"Worker warm-up skipped {module_name}: {e}")
+    for module_name in STAGES.values():
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            logging.error(f"Worker failed to load {module_name}: {e}")
+    logging.info(f"Worker ready in {time.perf_counter() - start:.2f}s")
+
+
+def run_stage(method: str, params: dict) -> dict:
+    """
+    Runs a stage's main() in-process with an empty argv, so stages never parse the worker's
+    own command line. sys.exit() inside a stage is reported as a failure.
+    The stage is profiled (see profiling.py) when params["profile"] is true or STAGE_PROFILE is on.
+    """
+    from execution.utils import reload_settings
+    from execution.profiling import profile_stage
+
+    cwd = params.get("cwd")
+    if cwd:
+        os.chdir(cwd)
+    if reload_settings():
+        logging.info("Settings changed; LLM clients, caches and rate limiters will be rebuilt")
+
+    module = importlib.import_module(STAGES[method])
+    start = time.perf_counter()
+    try:
+        with profile_stage(method, params.get("profile")):
+            module.main([])
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            raise RuntimeError(f"{method} exited with status {e.code}")
+    finally:
+        sys.stdout.flush_partial()
+        sys.stderr.flush_partial()
+    return {"status": "success", "elapsed": round(time.perf_counter() - start, 3)}
+
+
+def handle(request: dict) -> bool:
+    """Dispatches one request. Returns False when the worker should stop."""
+    request_id = request.get("id")
+    method = request.get("method")
+    params = request.get("params") or {}
+
+    try:
+        if method == "ping":
+            result = {"status": "success", "pid": os.getpid()}
+        elif method == "shutdown":
+            send_frame({"jsonrpc": "2.0", "id": request_id, "result": {"status": "success"}})
+            return False
+        elif method in STAGES:
+            result = run_stage(method, params)
+        else:
+            send_frame({"jsonrpc": "2.0", "id": request_id,
+                        "error": {"code": -32601, "message": f"Unknown method: {method}"}})
+            return True
+    except Exception as e:
+        logging.error(f"Stage {method} failed: {e}")
+        logging.debug(traceback.format_exc())
+        send_frame({"jsonrpc": "2.0", "id": request_id, "error": {"code": -32000, "message": str(e)}})
+        return True
+
+    send_frame({"jsonrpc": "2.0", "id": request_id, "result": result})
+    return True
+
+
+def serve(stdin=None):
+    stdin = stdin or sys.stdin
+    install_log_streams()
+    warm_up()
+    send_frame({"jsonrpc": "2.0", "method": "ready", "params": {"pid": os.getpid()}})
+
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            send_frame({"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": f"Parse error: {e}"}})
+            continue
+        if not handle(request):
+            break
+
+
+if __name__ == "__main__":
+    if "--profile" in sys.argv[1:]:
+        sys.argv.remove("--profile")
+        os.environ["STAGE_PROFILE"] = "on"  # Profile every stage request
+    serve()
@@ -90,6 +90,11 @@ async function runPythonScriptStream(scriptName, options) {
 app.whenReady().then(() => {
     createWindow();
 
+    // Start the Python worker early so its imports overlap with the user filling in Step 1
+    if (process.env.AI_RESUME_DISABLE_WORKER !== '1') {
+        try { getWorker(); } catch (e) { console.error('Failed to start Python worker:', e); }
+    }
+
     ipcMain.handle('select-files', async (event, { multi, type }) => {
         const filters = type === 'candidate'
             ? [{ name: 'PDF Documents', extensions: ['pdf'] }]
@@ -376,42 +381,128 @@ function getScriptPath() {
     return path.join(__dirname, 'execution');
 }
 
-ipcMain.handle('run-ingest-vacancy', async (event, args) => {
-    let options = {
+// --- Persistent Python worker ---
+// One long-lived `execution/worker.py` process serves every stage over line-delimited
+// JSON-RPC, so LangChain/SDK imports are paid once instead of on every button press.
+// Set AI_RESUME_DISABLE_WORKER=1 to fall back to spawning one script per stage.
+let worker = null;
+let workerRequestId = 0;
+const workerPending = new Map();
+
+function getWorker() {
+    if (worker) return worker;
+
+    const shell = new PythonShell('worker.py', {
         mode: 'text',
         pythonPath: getPythonPath(),
         scriptPath: getScriptPath(),
         cwd: getStoragePath()
-    };
-    return runPythonScriptStream('ingest_vacancy.py', options);
-});
+    });
+    worker = shell;
+
+    shell.on('message', (line) => {
+        let frame;
+        try {
+            frame = JSON.parse(line);
+        } catch (e) {
+            // Output from child processes (e.g. PDF pools) isn't framed; treat it as a log line
+            workerLog(line, false);
+            return;
+        }
+
+        if (frame.method === 'log') {
+            workerLog(frame.params.message, frame.params.isError);
+        } else if (frame.method === 'ready') {
+            console.log(`Python worker ready (pid ${frame.params.pid})`);
+        } else if (frame.id !== undefined && workerPending.has(frame.id)) {
+            const request = workerPending.get(frame.id);
+            workerPending.delete(frame.id);
+            if (frame.error) {
+                request.resolve({ status: 'error', error: frame.error.message, output: request.messages });
+            } else {
+                request.resolve({ status: 'success', output: request.messages, result: frame.result });
+            }
+        }
+    });
+    shell.on('stderr', (s) => workerLog("STDERR: " + s, true));
+    shell.end((err) => {
+        if (worker === shell) worker = null;
+        for (const [id, request] of workerPending) {
+            request.reject(err || new Error('Python worker exited'));
+        }
+        workerPending.clear();
+    });
+
+    return shell;
+}
+
+function workerLog(message, isError) {
+    console.log(`[Python ${isError ? 'ERR' : 'OUT'}] ${message}`);
+    for (const request of workerPending.values()) {
+        request.messages.push(message);
+    }
+    if (mainWindow) {
+        mainWindow.webContents.send('python-log', { message, isError });
+    }
+}
+
+function callWorker(method, params = {}) {
+    return new Promise((resolve, reject) => {
+        const id = ++workerRequestId;
+        workerPending.set(id, { resolve, reject, messages: [] });
+        try {
+            getWorker().send(JSON.stringify({ jsonrpc: '2.0', id, method, params }));
+        } catch (e) {
+            workerPending.delete(id);
+            reject(e);
+        }
+    });
+}
+
+// Runs a stage in the warm worker, falling back to a one-off script if the worker is unavailable
+async function runStage(stage, scriptName) {
+    if (process.env.AI_RESUME_DISABLE_WORKER !== '1') {
+        try {
+            return await callWorker(stage, { cwd: getStoragePath() });
+        } catch (e) {
+            console.error(`Python worker unavailable (${e.message}), spawning ${scriptName}`);
+        }
+    }
 
-ipcMain.handle('run-ingest-candidate', async (event, args) => {
     let options = {
         mode: 'text',
         pythonPath: getPythonPath(),
         scriptPath: getScriptPath(),
         cwd: getStoragePath()
     };
-    return runPythonScriptStream('ingest_candidate.py', options);
+    return runPythonScriptStream(scriptName, options);
+}
+
+app.on('will-quit', () => {
+    if (worker) {
+        try {
+            worker.send(JSON.stringify({ jsonrpc: '2.0', id: ++workerRequestId, method: 'shutdown' }));
+            worker.end(() => { });
+        } catch (e) { worker.kill(); }
+    }
+});
+
+ipcMain.handle('run-ingest-vacancy', async (event, args) => {
+    return runStage('ingest_vacancy', 'ingest_vacancy.py');
+});
+
+ipcMain.handle('run-ingest-candidate', async (event, args) => {
+    return runStage('ingest_candidate', 'ingest_candidate.py');
 });
 
 ipcMain.handle('run-generate', async (event, args) => {
-    let options = {
-        mode: 'text',
-        pythonPath: getPythonPath(),
-        scriptPath: getScriptPath(),
-        cwd: getStoragePath()
-    };
-    return runPythonScriptStream('generate_application.py', options);
+    return runStage('generate_application', 'generate_application.py');
 });
 
 ipcMain.handle('run-analyze-match', async (event, args) => {
-    let options = {
-        mode: 'text',
-        pythonPath: getPythonPath(),
-        scriptPath: getScriptPath(),
-        cwd: getStoragePath()
-    };
-    return runPythonScriptStream('analyze_match.py', options);
+    return runStage('analyze_match', 'analyze_match.py');
+});
+
+ipcMain.handle('run-pipeline', async (event, args) => {
+    return runStage('pipeline', 'pipeline.py');
 });
@@ -10,6 +10,7 @@ contextBridge.exposeInMainWorld('electronAPI', {
         return ipcRenderer.invoke('upload-files', { filePaths, type, textContent });
     },
     analyzeMatch: () => ipcRenderer.invoke('run-analyze-match'),
+    runPipeline: () => ipcRenderer.invoke('run-pipeline'),
     readAnalysisReport: () => ipcRenderer.invoke('read-analysis-report'),
     openPath: (path) => ipcRenderer.invoke('open-path', path),
     showInFolder: (path) => ipcRenderer.invoke('show-in-folder', path),
@@ -0,0 +1,144 @@
+"""
+Tests for execution/web_fetch.py against a local http.server: concurrent fetching,
+ETag revalidation (304) and the URL_FETCH_BUDGET cut-off.
+
+Usage:
+    python -m pytest tests/test_web_fetch.py
+"""
+import os
+import sys
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from execution import web_fetch
+
+PAGE_DELAY = 0.5
+SLOW_DELAY = 3.0
+
+
+def page_html(name: str) -> str:
+    paragraphs = "".join(f"<p>The {name} team is hiring an engineer with Python and distributed systems "
+                         f"experience, paragraph {i} of the posting.</p>" for i in range(5))
+    return f"<html><head><title>{name}</title></head><body><article><h1>{name}</h1>{paragraphs}</article></body></html>"
+
+
+class JobPageHandler(BaseHTTPRequestHandler):
+    """/page/<name> waits PAGE_DELAY and supports If-None-Match; /slow/<name> waits SLOW_DELAY."""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.headers.get("If-None-Match")))
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(SLOW_DELAY if self.path.startswith("/slow/") else PAGE_DELAY)
+            etag = f'"{self.path}-v1"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            body = page_html(self.path.rsplit("/", 1)[-1]).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client gave up (budget cut-off)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), JobPageHandler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    httpd.in_flight = 0
+    httpd.max_in_flight = 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.base_url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def page_cache(tmp_path, monkeypatch):
+    """A fresh on-disk page cache per test; entries are always stale so every call revalidates."""
+    monkeypatch.setenv("URL_CACHE", "on")
+    monkeypatch.setenv("URL_CACHE_DIR", str(tmp_path / "web"))
+    monkeypatch.setenv("URL_CACHE_TTL_HOURS", "0")
+    web_fetch.reset_page_cache()
+    yield web_fetch.get_page_cache()
+    web_fetch.reset_page_cache()
+
+
+def test_urls_are_fetched_concurrently(server):
+    urls = [f"{server.base_url}/page/team{i}" for i in range(3)]
+
+    start = time.perf_counter()
+    pages = web_fetch.fetch_pages(urls, budget=10, timeout=5)
+    elapsed = time.perf_counter() - start
+
+    assert list(pages) == urls
+    assert all(f"team{i} team is hiring" in pages[url] for i, url in enumerate(urls))
+    assert server.max_in_flight == len(urls)
+    assert elapsed < PAGE_DELAY * len(urls)
+
+
+def test_stale_entry_is_revalidated_with_etag(server, page_cache):
+    url = f"{server.base_url}/page/platform"
+
+    first = web_fetch.fetch_page_text(url, timeout=5)
+    assert "platform team is hiring" in first
+    assert page_cache.get(url)["etag"] == '"/page/platform-v1"'
+
+    second = web_fetch.fetch_page_text(url, timeout=5)
+    assert second == first
+    assert server.requests == [("/page/platform", None), ("/page/platform", '"/page/platform-v1"')]
+
+
+def test_fresh_entry_is_served_without_a_request(server, page_cache, monkeypatch):
+    url = f"{server.base_url}/page/data"
+    web_fetch.fetch_page_text(url, timeout=5)
+    monkeypatch.setenv("URL_CACHE_TTL_HOURS", "24")
+    web_fetch.reset_page_cache()
+
+    assert "data team is hiring" in web_fetch.fetch_page_text(url, timeout=5)
+    assert len(server.requests) == 1
+
+
+def test_budget_skips_late_pages(server):
+    fast, slow = f"{server.base_url}/page/backend", f"{server.base_url}/slow/frontend"
+
+    start = time.perf_counter()
+    pages = web_fetch.fetch_pages([fast, slow], budget=1.5, timeout=5)
+    elapsed = time.perf_counter() - start
+
+    assert list(pages) == [fast]
+    assert elapsed < SLOW_DELAY
+
+
+def test_budget_falls_back_to_cached_copy(server, page_cache):
+    slow = f"{server.base_url}/slow/frontend"
+    page_cache.put(slow, "cached frontend posting", None, None)
+
+    pages = web_fetch.fetch_pages([slow], budget=1, timeout=5)
+
+    assert pages == {slow: "cached frontend posting"}